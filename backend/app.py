@@ -7,8 +7,11 @@ import os
 from flask import Flask
 from flask_cors import CORS
 
-from .routes import health_bp, items_bp, recipes_bp, calculate_bp
-from .config import PORT, DEBUG
+from .routes import health_bp, items_bp, recipes_bp, calculate_bp, planner_bp, item_costs_bp, alternates_bp
+from .config import PORT, DEBUG, STARTUP_WARMUP
+from .utils.content_negotiation import NegotiatingJSONProvider, ApiRequest
+from .utils.compression import init_compression
+from .services.warmup import start_warmup
 
 def create_app(test_config=None):
     """
@@ -16,6 +19,11 @@ def create_app(test_config=None):
     """
     app = Flask(__name__)
     
+    # Single-pass JSON encoding (NaN/Inf -> null, orjson when installed),
+    # MessagePack/CBOR bodies negotiated by Accept and Content-Type
+    app.json = NegotiatingJSONProvider(app)
+    app.request_class = ApiRequest
+    
     # Configure CORS (allow all for development, restrict in production)
     CORS(app)
     
@@ -28,6 +36,16 @@ def create_app(test_config=None):
     app.register_blueprint(items_bp)
     app.register_blueprint(recipes_bp)
     app.register_blueprint(calculate_bp)
+    app.register_blueprint(planner_bp)
+    app.register_blueprint(item_costs_bp)
+    app.register_blueprint(alternates_bp)
+    
+    # gzip/brotli for large responses
+    init_compression(app)
+    
+    # Solver routes load PuLP and the solvers on first use; warm them up in the background
+    if STARTUP_WARMUP:
+        start_warmup(app)
     
     return app
 
@@ -2,11 +2,56 @@
 # Extracted from app.py for modularization
 
 import os
+import tempfile
 
 # Solver configuration defaults
 DEFAULT_SOLVER_TIME_LIMIT = 20  # seconds total budget for optimization
 DEFAULT_REL_GAP = 0.02          # 2% gap allows faster exit on complex recipes
 
+# Parallel solving of independent sub-problems (process pool size; 1 disables)
+SOLVER_PARALLEL_WORKERS = int(os.environ.get('SOLVER_PARALLEL_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Start method for solver worker processes. gunicorn workers run request threads, and
+# forking a multithreaded process can copy locks other threads hold, so workers start
+# from a fork server ('forkserver') or a fresh interpreter ('spawn') instead
+SOLVER_START_METHOD = os.environ.get('SOLVER_START_METHOD', 'forkserver')
+
+# Solver admission control, per worker process: concurrent CBC solves, queued requests
+# beyond that, and the longest a queued request waits before a 503
+SOLVER_MAX_CONCURRENT = int(os.environ.get('SOLVER_MAX_CONCURRENT', 2))
+SOLVER_QUEUE_SIZE = int(os.environ.get('SOLVER_QUEUE_SIZE', 4))
+SOLVER_QUEUE_TIMEOUT = float(os.environ.get('SOLVER_QUEUE_TIMEOUT', 15))
+
+# Solver engine: 'cbc' starts PuLP's CBC for every pass, 'highs' solves in persistent HiGHS
+# worker processes (needs highspy), 'auto' uses HiGHS when highspy is installed.
+# SOLVER_ENGINE_WORKERS is the HiGHS worker count per worker process.
+SOLVER_ENGINE = os.environ.get('SOLVER_ENGINE', 'cbc')
+SOLVER_ENGINE_WORKERS = int(os.environ.get('SOLVER_ENGINE_WORKERS', SOLVER_MAX_CONCURRENT))
+
+# CBC threads per run: the cores minus SOLVER_RESERVED_CORES, split evenly across the CBC
+# runs in flight on the host and capped at SOLVER_MAX_THREADS (1 disables threading).
+# Runs are counted through lock files in SOLVER_STATE_DIR, shared by all workers.
+SOLVER_MAX_THREADS = int(os.environ.get('SOLVER_MAX_THREADS', min(8, os.cpu_count() or 1)))
+SOLVER_RESERVED_CORES = int(os.environ.get('SOLVER_RESERVED_CORES', 0))
+SOLVER_STATE_DIR = os.environ.get('SOLVER_STATE_DIR', os.path.join(tempfile.gettempdir(), 'sfc_solver'))
+
+# Alternate impact ranking: default and maximum total time budget (seconds)
+ALTERNATE_IMPACT_TIME_BUDGET = 60
+ALTERNATE_IMPACT_MAX_BUDGET = 300
+
+# Response compression (gzip, and brotli when installed)
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', '1') == '1'
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))       # bytes
+COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))        # 1-9
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))  # 0-11
+# Immutable payloads (/api/items, /api/recipes) are compressed once per process
+STATIC_COMPRESSION_GZIP_LEVEL = 9
+STATIC_COMPRESSION_BROTLI_QUALITY = 11
+
+# Background warm-up after startup: game data, static payloads and the solver stack
+# (otherwise each loads on the first request that needs it)
+STARTUP_WARMUP = os.environ.get('STARTUP_WARMUP', '1') == '1'
+
 # Precision settings
 PRECISION_DIGITS = 4
 
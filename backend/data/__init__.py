@@ -7,9 +7,12 @@ from .base_resources import (
     get_extraction_rate,
     get_extraction_machine,
     get_all_base_resources,
+    get_world_limit,
+    node_extraction_rate,
     BASE_RESOURCE_RATES,
     BASE_RESOURCE_MACHINES,
-    BASE_RESOURCES
+    BASE_RESOURCES,
+    WORLD_RESOURCE_LIMITS
 )
 from ..config import SPECIAL_RESOURCE_RECIPES
 from .items import (
@@ -28,6 +31,8 @@ from .recipes import (
     is_alternate_recipe,
     is_special_resource_recipe,
     get_all_recipe_ids,
+    get_recipe_index,
+    get_recipe_index_version,
     get_recipes_for_item,
     get_default_active_recipes,
     get_recipe_ingredients,
@@ -41,14 +46,16 @@ __all__ = [
     'load_game_data', 'get_items', 'get_recipes', 'get_all_items', 'get_all_recipes',
     # Base resources
     'is_base_resource', 'get_extraction_rate', 'get_extraction_machine',
-    'get_all_base_resources', 'BASE_RESOURCE_RATES', 'BASE_RESOURCE_MACHINES', 'BASE_RESOURCES',
+    'get_all_base_resources', 'get_world_limit', 'node_extraction_rate',
+    'BASE_RESOURCE_RATES', 'BASE_RESOURCE_MACHINES', 'BASE_RESOURCES', 'WORLD_RESOURCE_LIMITS',
     'SPECIAL_RESOURCE_RECIPES',
     # Items
     'get_item', 'get_item_name', 'item_exists', 'get_all_item_ids',
     'get_item_description', 'get_item_stack_size', 'get_item_sink_points',
     # Recipes
     'get_recipe', 'get_recipe_name', 'recipe_exists', 'is_alternate_recipe',
-    'is_special_resource_recipe', 'get_all_recipe_ids', 'get_recipes_for_item',
+    'is_special_resource_recipe', 'get_all_recipe_ids', 'get_recipe_index',
+    'get_recipe_index_version', 'get_recipes_for_item',
     'get_default_active_recipes', 'get_recipe_ingredients', 'get_recipe_products',
     'get_recipe_time', 'get_recipe_machines'
 ]
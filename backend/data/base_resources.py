@@ -39,6 +39,43 @@ BASE_RESOURCE_MACHINES = {
     'Desc_CrystalShard_C': 'Desc_MinerMk1_C',
 }
 
+# Total extraction available on the map (items per minute): every node with the best
+# extractor at 250% clock. Resources without an entry (e.g. water) are unlimited.
+WORLD_RESOURCE_LIMITS = {
+    'Desc_OreIron_C': 92100,
+    'Desc_OreCopper_C': 36900,
+    'Desc_Stone_C': 69300,
+    'Desc_Coal_C': 42300,
+    'Desc_OreBauxite_C': 12300,
+    'Desc_OreGold_C': 15000,
+    'Desc_RawQuartz_C': 13500,
+    'Desc_Sulfur_C': 10800,
+    'Desc_OreUranium_C': 2100,
+    'Desc_SAM_C': 10200,
+    'Desc_LiquidOil_C': 12600,
+    'Desc_NitrogenGas_C': 12000,
+}
+
+# Extraction rate of each extractor on a normal node at 100% clock (items per minute)
+EXTRACTOR_RATES = {
+    'Desc_MinerMk1_C': 60,
+    'Desc_MinerMk2_C': 120,
+    'Desc_MinerMk3_C': 240,
+    'Desc_OilPump_C': 120,
+    'Desc_FrackingExtractor_C': 60,
+}
+
+# Node purity multipliers
+PURITY_MULTIPLIERS = {
+    'impure': 0.5,
+    'normal': 1.0,
+    'pure': 2.0,
+}
+
+# Allowed clock speed range for extractors (percent)
+MIN_CLOCK_SPEED = 1.0
+MAX_CLOCK_SPEED = 250.0
+
 # Set of all base resource IDs for quick lookup
 BASE_RESOURCES = set(BASE_RESOURCE_RATES.keys())
 
@@ -68,3 +105,33 @@ def get_extraction_machine(item_id: str) -> str:
 def get_all_base_resources() -> set:
     """Get the set of all base resource IDs."""
     return BASE_RESOURCES.copy()
+
+
+def get_world_limit(item_id: str):
+    """
+    Get the map-wide extraction limit for a base resource (items per minute).
+    Returns None if the resource is unlimited or unknown.
+    """
+    return WORLD_RESOURCE_LIMITS.get(item_id)
+
+
+def node_extraction_rate(purity: str = 'normal', extractor: str = None, clock_speed: float = 100.0) -> float:
+    """
+    Get the output of one resource node.
+
+    Args:
+        purity: 'impure', 'normal' or 'pure'
+        extractor: Extractor machine ID (defaults to the Mk1 miner)
+        clock_speed: Clock speed in percent (1-250)
+
+    Raises:
+        ValueError: On an unknown purity or extractor, or a clock speed out of range.
+    """
+    if purity not in PURITY_MULTIPLIERS:
+        raise ValueError(f"Unknown node purity: {purity}")
+    extractor = extractor or 'Desc_MinerMk1_C'
+    if extractor not in EXTRACTOR_RATES:
+        raise ValueError(f"Unknown extractor: {extractor}")
+    if not MIN_CLOCK_SPEED <= clock_speed <= MAX_CLOCK_SPEED:
+        raise ValueError(f"Clock speed must be between {MIN_CLOCK_SPEED:g} and {MAX_CLOCK_SPEED:g}")
+    return EXTRACTOR_RATES[extractor] * PURITY_MULTIPLIERS[purity] * clock_speed / 100.0
@@ -3,6 +3,7 @@ Recipes accessor module for Satisfactory Factory Calculator.
 Provides functions to access and query recipe data.
 """
 
+import hashlib
 from functools import lru_cache
 from .loader import get_recipes
 from ..config import SPECIAL_RESOURCE_RECIPES
@@ -59,6 +60,23 @@ def get_all_recipe_ids() -> frozenset:
     return frozenset(recipes.keys())
 
 
+@lru_cache(maxsize=1)
+def get_recipe_index() -> tuple:
+    """
+    Stable order of all recipe IDs (sorted), used for bitset encodings.
+    Cached for performance.
+    """
+    return tuple(sorted(get_recipes().keys()))
+
+
+@lru_cache(maxsize=1)
+def get_recipe_index_version() -> str:
+    """
+    Version tag of the recipe index: changes whenever the set of recipe IDs changes.
+    """
+    return hashlib.sha256('\n'.join(get_recipe_index()).encode('utf-8')).hexdigest()[:12]
+
+
 def get_recipes_for_item(item_id: str, active_recipes: dict | None = None) -> list:
     """
     Find all recipes that produce a given item.
@@ -5,10 +5,16 @@ from .health import health_bp
 from .items import items_bp
 from .recipes import recipes_bp
 from .calculate import calculate_bp
+from .planner import planner_bp
+from .item_costs import item_costs_bp
+from .alternates import alternates_bp
 
 __all__ = [
     'health_bp',
     'items_bp',
     'recipes_bp',
-    'calculate_bp'
+    'calculate_bp',
+    'planner_bp',
+    'item_costs_bp',
+    'alternates_bp'
 ]
@@ -0,0 +1,57 @@
+"""
+Alternate impact route for Satisfactory Factory Calculator.
+"""
+
+from flask import Blueprint, request, jsonify
+from ..services.admission import SolverBusyError
+from ..solvers import validate_strategy
+from ..solvers.deadline import SolveAbortedError
+from ..utils.connection import deadline_from_request
+
+alternates_bp = Blueprint('alternates', __name__)
+
+@alternates_bp.route('/api/alternate-impact', methods=['POST'])
+def alternate_impact_route():
+    """
+    Rank disabled alternates by how much enabling each one improves the plan.
+
+    Accepts {"targets", "optimization_strategy", "active_recipes", "weights"} like
+    /api/calculate, plus optional "candidates" and "time_budget" (seconds).
+    X-Request-Timeout and client disconnects end the ranking as they end a calculation.
+    """
+    try:
+        deadline = deadline_from_request(request)
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+
+    data = request.json or {}
+
+    strategy = data.get('optimization_strategy', 'balanced_production')
+    if not validate_strategy(strategy):
+        return jsonify({'error': f'Unknown optimization strategy: {strategy}'}), 400
+    solver_opts = data.get('solver') or {}
+
+    # The solver stack loads on first use unless the startup warm-up got there first
+    from ..services.alternate_impact_service import get_alternate_impact
+    try:
+        result = get_alternate_impact(
+            targets=data.get('targets'),
+            strategy=strategy,
+            active_recipes=data.get('active_recipes'),
+            weights=data.get('weights'),
+            candidates=data.get('candidates'),
+            time_budget=data.get('time_budget'),
+            rel_gap=solver_opts.get('rel_gap'),
+            deadline=deadline
+        )
+        return jsonify(result)
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    except SolverBusyError as busy:
+        response = jsonify({'error': str(busy), 'retry_after': busy.retry_after})
+        response.headers['Retry-After'] = str(busy.retry_after)
+        return response, 503
+    except SolveAbortedError as aborted:
+        return jsonify({'error': str(aborted)}), 504
+    except Exception as e:
+        return jsonify({'error': f"Internal alternate impact error: {str(e)}"}), 500
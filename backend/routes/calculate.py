@@ -3,7 +3,10 @@ Calculate route for Satisfactory Factory Calculator.
 """
 
 from flask import Blueprint, request, jsonify
-from ..services.calculation_service import calculate_production
+from ..services.admission import SolverBusyError
+from ..solvers.deadline import SolveAbortedError
+from ..utils.connection import deadline_from_request
+from ..services.response_format import format_production_response, RESPONSE_FORMATS
 from ..config import DEFAULT_SOLVER_TIME_LIMIT, DEFAULT_REL_GAP
 
 calculate_bp = Blueprint('calculate', __name__)
@@ -16,15 +19,31 @@ def calculate_route():
     Accepts either:
     - New multi-target: {"targets": [{"item": str, "amount": float}, ...]}
     - Legacy single-target: {"item": str, "amount": float}
+    
+    An optional X-Request-Timeout header (seconds) bounds the solve by the client's own
+    timeout; the solve is also abandoned if the client disconnects.
     """
+    try:
+        deadline = deadline_from_request(request)
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    
     data = request.json or {}
     
     # 1. Extraction of parameters
     targets = data.get('targets')
     strategy = data.get('optimization_strategy', 'balanced_production')
-    active_recipes = data.get('active_recipes')  # Map of recipe_id -> bool
+    active_recipes = data.get('active_recipes')  # recipe_id -> bool map, bitset or diff
     weights = data.get('weights')                 # Custom weights
-    solver_opts = data.get('solver') or {}        # time_limit, rel_gap
+    solver_opts = data.get('solver') or {}        # time_limit, rel_gap, sensitivity
+    mode = data.get('mode', 'target')             # 'target' or 'max_throughput'
+    resource_limits = data.get('resource_limits') # Base item -> availability per minute
+    resource_nodes = data.get('resource_nodes')   # Claimed nodes (purity, extractor, clock)
+    world_limits = bool(data.get('world_limits')) # Cap resources at map totals
+    response_format = data.get('response_format') or request.args.get('format', 'full')
+    
+    if response_format not in RESPONSE_FORMATS:
+        return jsonify({'error': f'Unknown response format: {response_format}'}), 400
     
     # Legacy single-target support
     if not targets:
@@ -67,20 +86,37 @@ def calculate_route():
             except (ValueError, TypeError):
                 return jsonify({'error': f'Target at index {i}: amount must be a number'}), 400
         
-    # 2. Execution
+    # 2. Execution (the solver stack loads on first use unless the startup warm-up got there first)
+    from ..services.calculation_service import calculate_production
     try:
         response = calculate_production(
             targets=targets,
             strategy=strategy,
             active_recipes=active_recipes,
             weights=weights,
-            solver_opts=solver_opts
+            solver_opts=solver_opts,
+            mode=mode,
+            resource_limits=resource_limits,
+            resource_nodes=resource_nodes,
+            world_limits=world_limits,
+            deadline=deadline
         )
-        return jsonify(response)
+        return jsonify(format_production_response(response, response_format))
         
     except ValueError as ve:
         # Business logic errors (e.g. infeasible, missing item)
-        return jsonify({'error': str(ve)}), 400
+        body = {'error': str(ve)}
+        if getattr(ve, 'details', None):
+            body['details'] = ve.details
+        return jsonify(body), 400
+    except SolverBusyError as busy:
+        # Every solver slot is taken and the queue is full or too slow
+        response = jsonify({'error': str(busy), 'retry_after': busy.retry_after})
+        response.headers['Retry-After'] = str(busy.retry_after)
+        return response, 503
+    except SolveAbortedError as aborted:
+        # Deadline passed or client gone; nobody is waiting for a plan
+        return jsonify({'error': str(aborted)}), 504
     except Exception as e:
         # Unexpected server errors
         return jsonify({'error': f"Internal calculation error: {str(e)}"}), 500
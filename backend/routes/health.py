@@ -4,6 +4,9 @@ Health check route for Satisfactory Factory Calculator.
 
 from flask import Blueprint, jsonify
 from datetime import datetime
+from ..services.admission import get_admission_stats
+from ..solvers.thread_policy import get_thread_stats
+from ..services.warmup import get_warmup_stats
 
 health_bp = Blueprint('health', __name__)
 
@@ -20,3 +23,17 @@ def health_check():
         'source_path': os.path.abspath(s.__file__),
         'timestamp': datetime.utcnow().isoformat() + 'Z'
     })
+
+
+@health_bp.route('/api/metrics', methods=['GET'])
+def metrics():
+    """
+    Solver queue, engine and warm-up state for this worker process, and the host's CBC thread policy.
+    """
+    from ..solvers.solver_pool import get_engine_stats
+    return jsonify({
+        'solver_admission': get_admission_stats(),
+        'solver_engine': get_engine_stats(),
+        'cbc_threads': get_thread_stats(),
+        'warmup': get_warmup_stats()
+    })
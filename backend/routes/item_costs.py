@@ -0,0 +1,38 @@
+"""
+Item cost route for Satisfactory Factory Calculator.
+"""
+
+from flask import Blueprint, request, jsonify
+from ..services.item_cost_service import get_item_cost_table
+from ..solvers import validate_strategy
+
+item_costs_bp = Blueprint('item_costs', __name__)
+
+@item_costs_bp.route('/api/item-costs', methods=['GET', 'POST'])
+def item_costs_route():
+    """
+    Per-unit raw-resource cost of every item.
+    
+    GET uses the default active recipes (strategy via ?optimization_strategy=).
+    POST accepts {"active_recipes", "optimization_strategy", "weights"} like /api/calculate.
+    """
+    if request.method == 'POST':
+        data = request.json or {}
+    else:
+        data = {'optimization_strategy': request.args.get('optimization_strategy')}
+    
+    strategy = data.get('optimization_strategy') or 'resource_efficiency'
+    if not validate_strategy(strategy):
+        return jsonify({'error': f'Unknown optimization strategy: {strategy}'}), 400
+    
+    try:
+        table = get_item_cost_table(
+            active_recipes=data.get('active_recipes'),
+            strategy=strategy,
+            weights=data.get('weights')
+        )
+        return jsonify(table)
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    except Exception as e:
+        return jsonify({'error': f"Internal item cost error: {str(e)}"}), 500
@@ -2,13 +2,16 @@
 Items route for Satisfactory Factory Calculator.
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint
 from ..data import get_items
+from ..utils.compression import StaticPayload
 
 items_bp = Blueprint('items', __name__)
 
+# Immutable catalog, encoded and compressed once
+items_payload = StaticPayload(get_items)
+
 @items_bp.route('/api/items', methods=['GET'])
 def get_items_route():
     """Retrieve all producible items."""
-    items = get_items()
-    return jsonify(items)
+    return items_payload.response()
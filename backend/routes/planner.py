@@ -0,0 +1,25 @@
+"""
+Planner routes for Satisfactory Factory Calculator.
+"""
+
+from flask import Blueprint, request, jsonify
+from ..services.planner_service import simulate_planner_flows
+
+planner_bp = Blueprint('planner', __name__)
+
+@planner_bp.route('/api/planner/flows', methods=['POST'])
+def planner_flows_route():
+    """
+    Compute steady-state throughput for a hand-built planner graph.
+    
+    Accepts: {"nodes": [...], "edges": [...]} in the planner's own node/edge format.
+    """
+    data = request.json or {}
+    
+    try:
+        result = simulate_planner_flows(data.get('nodes', []), data.get('edges', []))
+        return jsonify(result)
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    except Exception as e:
+        return jsonify({'error': f"Internal simulation error: {str(e)}"}), 500
@@ -3,15 +3,23 @@ Recipes route for Satisfactory Factory Calculator.
 """
 
 from flask import Blueprint, jsonify
-from ..services.recipe_service import get_all_recipes_with_status
+from ..services.recipe_service import get_all_recipes_with_status, get_recipe_index_info
+from ..utils.compression import StaticPayload
 
 recipes_bp = Blueprint('recipes', __name__)
 
+# Immutable catalog, encoded and compressed once
+recipes_payload = StaticPayload(get_all_recipes_with_status)
+
 @recipes_bp.route('/api/recipes', methods=['GET'])
 def get_recipes_route():
     """Retrieve all recipes with their default status and metadata."""
-    recipes = get_all_recipes_with_status()
-    return jsonify(recipes)
+    return recipes_payload.response()
+
+@recipes_bp.route('/api/recipes/index', methods=['GET'])
+def get_recipe_index_route():
+    """Recipe ID order and version for bitset-encoded active_recipes."""
+    return jsonify(get_recipe_index_info())
 
 # Note: POST /api/active-recipes and GET /api/active-recipes were REMOVED 
 # to ensure a stateless API. Clients should pass active_recipes in the 
@@ -0,0 +1,2 @@
+# Backend scripts package
+# Offline build and maintenance entry points (run with python -m)
@@ -0,0 +1,21 @@
+"""
+Offline build step for the precomputed plan table.
+
+Usage:
+    python -m backend.scripts.build_precomputed_plans
+"""
+
+import time
+from ..services.precomputed_plans import (
+    build_precomputed_table, write_precomputed_table, PRECOMPUTED_PLANS_PATH
+)
+
+if __name__ == "__main__":
+    start = time.time()
+    table = build_precomputed_table()
+    write_precomputed_table(table)
+
+    count = sum(len(plans) for plans in table['plans'].values())
+    not_optimal = sum(1 for plans in table['plans'].values() for p in plans.values() if not p['o'])
+    print(f"Wrote {count} plans ({not_optimal} not proven optimal) to {PRECOMPUTED_PLANS_PATH}")
+    print(f"Time Taken: {time.time() - start:.1f} seconds")
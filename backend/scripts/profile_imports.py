@@ -0,0 +1,70 @@
+"""
+Import-time profile of the backend.
+
+Runs a fresh interpreter with ``-X importtime`` and reports the slowest imports, the
+time per top-level package, and whether the solver stack was loaded.
+
+Usage:
+    python -m backend.scripts.profile_imports [--module backend.app] [--create-app] [--top 25]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import List, Tuple
+
+# Packages that should load on first solve (or in the warm-up), not at startup
+SOLVER_STACK = ('pulp', 'numpy', 'highspy', 'backend.solvers.milp_solver', 'backend.services.calculation_service')
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def profile_imports(module: str, create_app: bool = False) -> List[Tuple[str, int, int]]:
+    """
+    Import ``module`` in a fresh interpreter (warm-up disabled) and parse its import times.
+
+    Returns:
+        (module name, self microseconds, cumulative microseconds) in import order.
+    """
+    code = f"import {module}"
+    if create_app:
+        code += f"; {module}.create_app()"
+    env = dict(os.environ, STARTUP_WARMUP='0')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--module', default='backend.app')
+    parser.add_argument('--create-app', action='store_true', help="also call <module>.create_app()")
+    parser.add_argument('--top', type=int, default=25)
+    args = parser.parse_args()
+
+    rows = profile_imports(args.module, args.create_app)
+    total = sum(self_us for _, self_us, _ in rows)
+    print(f"Imported {len(rows)} modules in {total / 1000:.1f} ms")
+
+    print(f"\nSlowest {args.top} imports (cumulative):")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[2])[:args.top]:
+        print(f"{cumulative_us / 1000:9.1f} ms  {self_us / 1000:7.1f} ms self  {name}")
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split('.')[0]] += self_us
+    print("\nTime per top-level package (self):")
+    for package, self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{self_us / 1000:9.1f} ms  {package}")
+
+    loaded = [name for name, _, _ in rows if name in SOLVER_STACK]
+    print("\nSolver stack at import: " + (', '.join(loaded) if loaded else "not loaded"))
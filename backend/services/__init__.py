@@ -1,12 +1,41 @@
 # Backend services package
 # Contains business logic services
 
-from .recipe_service import get_all_recipes_with_status
-from .calculation_service import calculate_production
+import importlib
+
+from .recipe_service import get_all_recipes_with_status, get_recipe_index_info
 from .summary_service import calculate_summary_stats
+from .planner_service import simulate_planner_flows
+from .item_cost_service import get_item_cost_table
+from .admission import get_admission_stats, SolverBusyError
+from .warmup import start_warmup, get_warmup_stats
+
+# Imported on first access: these load the solver stack
+_LAZY_EXPORTS = {
+    'calculate_production': 'calculation_service',
+    'get_alternate_impact': 'alternate_impact_service'
+}
 
 __all__ = [
     'get_all_recipes_with_status',
+    'get_recipe_index_info',
     'calculate_production',
-    'calculate_summary_stats'
+    'calculate_summary_stats',
+    'simulate_planner_flows',
+    'get_item_cost_table',
+    'get_alternate_impact',
+    'get_admission_stats',
+    'SolverBusyError',
+    'start_warmup',
+    'get_warmup_stats'
 ]
+
+
+def __getattr__(name):
+    """Import a lazy export on first access."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
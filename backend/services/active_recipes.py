@@ -0,0 +1,96 @@
+"""
+Active recipe encodings for Satisfactory Factory Calculator.
+Turns the ``active_recipes`` request field into the solver's active map.
+
+Three forms are accepted:
+
+- Map: {"Recipe_X_C": true, ...}. Only listed recipes that exist and are true are enabled.
+- Bitset: {"bitset": str, "version": str}. Bit ``i`` (least significant bit first within
+  each byte) enables recipe ``i`` of the recipe index (see GET /api/recipes/index),
+  base64url-encoded. ``version`` must match the server's index version.
+- Diff: {"enable": [...], "disable": [...]} applied to the default active recipes.
+  Unknown recipe IDs are ignored, as in the map form.
+"""
+
+import base64
+from typing import Dict, Any, Iterable, Optional
+
+from ..data import get_recipes, get_default_active_recipes, get_recipe_index, get_recipe_index_version
+
+# Keys of the compact forms (no recipe ID looks like these)
+BITSET_KEYS = frozenset({'bitset', 'version'})
+DIFF_KEYS = frozenset({'enable', 'disable'})
+
+
+def resolve_active_map(active_recipes: Optional[Any]) -> Dict[str, bool]:
+    """
+    Active map for a request's ``active_recipes`` field (defaults when None).
+
+    Raises:
+        ValueError: On a malformed compact form or a bitset for another index version.
+    """
+    if active_recipes is None:
+        return get_default_active_recipes()
+    if not isinstance(active_recipes, dict):
+        raise ValueError('"active_recipes" must be an object')
+
+    keys = set(active_recipes)
+    if keys and not any(isinstance(v, bool) for v in active_recipes.values()):
+        if keys <= BITSET_KEYS:
+            return decode_active_bitset(active_recipes.get('bitset'), active_recipes.get('version'))
+        if keys <= DIFF_KEYS:
+            return apply_active_diff(active_recipes.get('enable', []), active_recipes.get('disable', []))
+
+    recipes_data = get_recipes()
+    return {rid: bool(v) for rid, v in active_recipes.items() if rid in recipes_data}
+
+
+def encode_active_bitset(active_map: Dict[str, bool]) -> str:
+    """Base64url bitset (no padding) of the enabled recipes over the recipe index."""
+    bits = 0
+    for i, rid in enumerate(get_recipe_index()):
+        if active_map.get(rid, False):
+            bits |= 1 << i
+    raw = bits.to_bytes((len(get_recipe_index()) + 7) // 8, 'little')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_active_bitset(bitset: Any, version: Any) -> Dict[str, bool]:
+    """
+    Active map of a base64url bitset over the recipe index.
+
+    Raises:
+        ValueError: On a missing or stale version, bad base64 or a wrong length.
+    """
+    index = get_recipe_index()
+    current = get_recipe_index_version()
+    if version != current:
+        raise ValueError(f'Recipe index version mismatch: got {version!r}, expected "{current}" '
+                         f'(see GET /api/recipes/index)')
+    if not isinstance(bitset, str):
+        raise ValueError('"active_recipes.bitset" must be a base64url string')
+    try:
+        raw = base64.urlsafe_b64decode(bitset + '=' * (-len(bitset) % 4))
+    except ValueError:
+        raise ValueError('"active_recipes.bitset" is not valid base64url')
+    if len(raw) != (len(index) + 7) // 8:
+        raise ValueError(f'"active_recipes.bitset" must encode {len(index)} bits '
+                         f'({(len(index) + 7) // 8} bytes), got {len(raw)} bytes')
+
+    bits = int.from_bytes(raw, 'little')
+    if bits >> len(index):
+        raise ValueError('"active_recipes.bitset" has bits set past the end of the recipe index')
+    return {rid: True for i, rid in enumerate(index) if bits >> i & 1}
+
+
+def apply_active_diff(enable: Iterable[str], disable: Iterable[str]) -> Dict[str, bool]:
+    """Default active map with the listed recipes switched on or off."""
+    for name, ids in (('enable', enable), ('disable', disable)):
+        if not isinstance(ids, list) or not all(isinstance(rid, str) for rid in ids):
+            raise ValueError(f'"active_recipes.{name}" must be a list of recipe IDs')
+
+    recipes_data = get_recipes()
+    active_map = get_default_active_recipes()
+    active_map.update((rid, True) for rid in enable if rid in recipes_data)
+    active_map.update((rid, False) for rid in disable if rid in recipes_data)
+    return active_map
@@ -0,0 +1,159 @@
+"""
+Solver admission control for Satisfactory Factory Calculator.
+Caps concurrent CBC solves per process and queues the rest with a bounded wait.
+
+Only requests that reach CBC take a slot: precomputed and closed-form plans bypass the
+queue. When every slot is busy a request waits (at most ``SOLVER_QUEUE_SIZE`` of them, for
+at most ``SOLVER_QUEUE_TIMEOUT`` seconds); beyond that it fails fast with SolverBusyError,
+which the calculate route turns into 503 with a Retry-After estimate. Each gunicorn worker
+has its own controller, so the service-wide cap is workers x SOLVER_MAX_CONCURRENT.
+A queued request also leaves the queue, with SolveAbortedError, once its own deadline no
+longer leaves time for a pass or its client disconnects.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+from ..config import SOLVER_MAX_CONCURRENT, SOLVER_QUEUE_SIZE, SOLVER_QUEUE_TIMEOUT
+from ..solvers.deadline import Deadline, SolveAbortedError, MIN_PASS_SECONDS
+
+# Smoothing factor for the running mean of solve durations
+DURATION_EWMA_ALPHA = 0.2
+# Seconds between deadline and disconnect checks while queued
+QUEUE_POLL_INTERVAL = 0.25
+
+
+class SolverBusyError(RuntimeError):
+    """No solver slot became free in time; ``retry_after`` is a suggested wait in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Counting semaphore with a bounded, timed wait queue and counters for monitoring.
+
+    ``admit()`` is reentrant within a thread, so nested solves of one request hold one slot.
+    """
+
+    def __init__(self, max_concurrent: int = SOLVER_MAX_CONCURRENT,
+                 max_queue: int = SOLVER_QUEUE_SIZE, queue_timeout: float = SOLVER_QUEUE_TIMEOUT):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue = max(0, int(max_queue))
+        self.queue_timeout = float(queue_timeout)
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._active = 0
+        self._queued = 0
+        self._admitted = 0
+        self._queued_total = 0
+        self._rejected_full = 0
+        self._rejected_timeout = 0
+        self._abandoned = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._solve_mean = None
+
+    @contextmanager
+    def admit(self, deadline: Optional[Deadline] = None) -> Iterator[None]:
+        """
+        Hold a solver slot for the duration of the block.
+
+        Raises:
+            SolverBusyError: If the queue is full or no slot came free within the queue timeout.
+            SolveAbortedError: If ``deadline`` ran out or its client disconnected while queued.
+        """
+        if getattr(self._local, 'depth', 0):
+            self._local.depth += 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+
+        start = time.monotonic()
+        with self._cond:
+            if self._active >= self.max_concurrent:
+                if self._queued >= self.max_queue:
+                    self._rejected_full += 1
+                    raise SolverBusyError('Solver queue is full, try again later', self._retry_after())
+                self._queued += 1
+                self._queued_total += 1
+                try:
+                    give_up = start + self.queue_timeout
+                    while self._active >= self.max_concurrent:
+                        remaining = give_up - time.monotonic()
+                        if remaining <= 0:
+                            self._rejected_timeout += 1
+                            raise SolverBusyError('Timed out waiting for a free solver, try again later',
+                                                  self._retry_after())
+                        if deadline is not None:
+                            if deadline.cancelled():
+                                self._abandoned += 1
+                                raise SolveAbortedError("Client disconnected; solve abandoned")
+                            if deadline.remaining() < MIN_PASS_SECONDS:
+                                self._abandoned += 1
+                                raise SolveAbortedError("Request deadline reached while waiting for a free solver")
+                            remaining = min(remaining, deadline.remaining() - MIN_PASS_SECONDS,
+                                            QUEUE_POLL_INTERVAL)
+                        self._cond.wait(remaining)
+                finally:
+                    self._queued -= 1
+            self._active += 1
+            self._admitted += 1
+            waited = time.monotonic() - start
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        self._local.depth = 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            duration = time.monotonic() - started
+            with self._cond:
+                self._active -= 1
+                if self._solve_mean is None:
+                    self._solve_mean = duration
+                else:
+                    self._solve_mean += DURATION_EWMA_ALPHA * (duration - self._solve_mean)
+                self._cond.notify()
+
+    def _retry_after(self) -> int:
+        """Seconds until the queue ahead has likely drained (caller holds the lock)."""
+        mean = self._solve_mean if self._solve_mean is not None else self.queue_timeout
+        return max(1, math.ceil(mean * (self._queued + 1) / self.max_concurrent))
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the queue for monitoring."""
+        with self._cond:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'queue_timeout': self.queue_timeout,
+                'active': self._active,
+                'queue_depth': self._queued,
+                'admitted': self._admitted,
+                'queued_total': self._queued_total,
+                'rejected_queue_full': self._rejected_full,
+                'rejected_timeout': self._rejected_timeout,
+                'abandoned': self._abandoned,
+                'wait_seconds_mean': self._wait_total / self._admitted if self._admitted else 0.0,
+                'wait_seconds_max': self._wait_max,
+                'solve_seconds_mean': self._solve_mean
+            }
+
+
+# Controller shared by every request in this process
+solver_admission = AdmissionController()
+
+
+def get_admission_stats() -> Dict[str, Any]:
+    """Queue statistics of this process's solver admission controller."""
+    return solver_admission.stats()
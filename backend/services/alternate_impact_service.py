@@ -0,0 +1,81 @@
+"""
+Alternate impact service for Satisfactory Factory Calculator.
+Ranks disabled alternate recipes by how much each one would improve a plan.
+"""
+
+from functools import partial
+from typing import Dict, Any, List, Optional
+
+from ..config import ALTERNATE_IMPACT_TIME_BUDGET, ALTERNATE_IMPACT_MAX_BUDGET
+from ..data import get_items, get_recipes
+from ..solvers.alternate_ranking import rank_alternates
+from ..solvers.deadline import Deadline
+from .active_recipes import resolve_active_map
+from .admission import solver_admission
+
+
+def get_alternate_impact(targets: List[Dict[str, Any]],
+                         strategy: str = 'balanced_production',
+                         active_recipes: Optional[Dict[str, Any]] = None,
+                         weights: Optional[Dict[str, float]] = None,
+                         candidates: Optional[List[str]] = None,
+                         time_budget: Optional[float] = None,
+                         rel_gap: Optional[float] = None,
+                         deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """
+    Rank alternates for a plan. Used by the POST /api/alternate-impact endpoint.
+
+    Args:
+        targets: List of targets [{"item": str, "amount": float}, ...]
+        strategy: Optimization strategy name
+        active_recipes: Base recipe enable map, bitset or diff (defaults to the default active recipes)
+        weights: Custom weights for 'custom' strategy
+        candidates: Optional recipe IDs to evaluate instead of every touching alternate
+        time_budget: Total seconds to spend (defaults to ALTERNATE_IMPACT_TIME_BUDGET)
+        rel_gap: Relative gap tolerance for each solve
+        deadline: Request deadline (and disconnect check) bounding the whole ranking
+
+    Returns:
+        Ranking result (see ``rank_alternates``).
+
+    The ranking holds one solver admission slot while it runs.
+    """
+    items_data = get_items()
+    recipes_data = get_recipes()
+
+    if not isinstance(targets, list) or not targets:
+        raise ValueError('"targets" must be a non-empty list')
+    clean_targets = []
+    for i, t in enumerate(targets):
+        if not isinstance(t, dict) or 'item' not in t or 'amount' not in t:
+            raise ValueError(f'Target at index {i} must be an object with "item" and "amount"')
+        try:
+            amount = float(t['amount'])
+        except (TypeError, ValueError):
+            raise ValueError(f'Target at index {i}: amount must be a number')
+        if amount <= 0:
+            raise ValueError(f'Target at index {i}: amount must be positive')
+        if t['item'] not in items_data:
+            raise ValueError(f"Unknown target item: {t['item']}")
+        clean_targets.append({'item': t['item'], 'amount': amount})
+
+    if time_budget is None:
+        time_budget = ALTERNATE_IMPACT_TIME_BUDGET
+    try:
+        time_budget = float(time_budget)
+    except (TypeError, ValueError):
+        raise ValueError('"time_budget" must be a number')
+    if not 0 < time_budget <= ALTERNATE_IMPACT_MAX_BUDGET:
+        raise ValueError(f'"time_budget" must be between 0 and {ALTERNATE_IMPACT_MAX_BUDGET} seconds')
+
+    if candidates is not None and not (isinstance(candidates, list) and all(isinstance(c, str) for c in candidates)):
+        raise ValueError('"candidates" must be a list of recipe IDs')
+
+    active_map = resolve_active_map(active_recipes)
+
+    return rank_alternates(
+        items_data, recipes_data, clean_targets, strategy, active_map,
+        custom_weights=weights, candidates=candidates,
+        time_budget=time_budget, rel_gap=rel_gap,
+        admission=partial(solver_admission.admit, deadline), deadline=deadline
+    )
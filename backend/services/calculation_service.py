@@ -3,21 +3,33 @@ Calculation service for Satisfactory Factory Calculator.
 Orchestrates the data, solver, and summary layers to produce a result.
 """
 
+from functools import partial
 from typing import Dict, Any, Optional, List
-from ..data import get_items, get_recipes, get_item_name, get_default_active_recipes
+from ..data import (
+    get_items, get_recipes, get_item_name, get_default_active_recipes,
+    is_base_resource, node_extraction_rate, WORLD_RESOURCE_LIMITS
+)
 from ..solvers import MILPSolver
+from ..solvers.deadline import Deadline, SolveAbortedError
 from .summary_service import calculate_summary_stats
-from ..utils.math_helpers import clean_nan_values
+from .precomputed_plans import get_precomputed_plan
+from .active_recipes import resolve_active_map
+from .admission import solver_admission, SolverBusyError
 
 def calculate_production(
     targets: List[Dict[str, Any]] = None,
     strategy: str = 'balanced_production', 
-    active_recipes: Optional[Dict[str, bool]] = None,
+    active_recipes: Optional[Dict[str, Any]] = None,
     weights: Optional[Dict[str, float]] = None,
     solver_opts: Optional[Dict[str, Any]] = None,
     # Legacy single-target params (deprecated but supported)
     target_item: str = None,
-    amount: float = None
+    amount: float = None,
+    mode: str = 'target',
+    resource_limits: Optional[Dict[str, float]] = None,
+    resource_nodes: Optional[List[Dict[str, Any]]] = None,
+    world_limits: bool = False,
+    deadline: Optional[Deadline] = None
 ) -> Dict[str, Any]:
     """
     High-level entry point for calculating a production plan.
@@ -25,11 +37,18 @@ def calculate_production(
     Args:
         targets: List of targets [{"item": str, "amount": float}, ...]
         strategy: Optimization strategy name
-        active_recipes: Client-provided recipe enable map (stateless)
+        active_recipes: Client-provided recipe enable map, bitset or diff (stateless)
         weights: Custom weights for 'custom' strategy
-        solver_opts: Options like time_limit and rel_gap
+        solver_opts: Options like time_limit, rel_gap and sensitivity
         target_item: (DEPRECATED) Single target item ID
         amount: (DEPRECATED) Single target amount
+        mode: 'target' to meet the target amounts at least cost, or 'max_throughput' to
+              treat them as ratios and produce as much as ``resource_limits`` allow
+        resource_limits: Base item ID -> availability per minute
+        resource_nodes: Claimed nodes [{"resource", "purity", "extractor", "clock_speed",
+                        "count"}]; their output caps each listed resource
+        world_limits: Cap every other limited resource at its map-wide total
+        deadline: Request deadline bounding solver time (and aborting on disconnect)
         
     Returns:
         Complete API response dictionary.
@@ -43,6 +62,8 @@ def calculate_production(
     
     if not targets:
         raise ValueError("Must provide at least one target")
+    if mode not in ('target', 'max_throughput'):
+        raise ValueError(f"Unknown mode: {mode}")
 
     # 1. Load data
     items_data = get_items()
@@ -59,23 +80,65 @@ def calculate_production(
     if active_recipes is None:
         active_map = get_default_active_recipes()
     else:
-        # Filter provided map to ensure we only have valid recipe IDs
-        active_map = {rid: bool(v) for rid, v in active_recipes.items() if rid in recipes_data}
+        # Map filtered to valid recipe IDs, or a compact bitset/diff
+        active_map = resolve_active_map(active_recipes)
         
-    # 4. Run solver
-    solver = MILPSolver(items_data, recipes_data)
+    limits = build_resource_limits(resource_limits, resource_nodes, world_limits)
+    # Queued solves leave the queue when the request's deadline or client is gone
+    admission = partial(solver_admission.admit, deadline)
+
+    # 4. Serve from the precomputed table when possible, otherwise run solver
+    if mode == 'max_throughput':
+        if not limits:
+            raise ValueError('"max_throughput" mode needs "resource_limits", "resource_nodes" or "world_limits"')
+        solver = MILPSolver(items_data, recipes_data, admission=admission, deadline=deadline)
+        graph = solver.maximize_throughput(
+            targets=targets,
+            resource_limits=limits,
+            strategy=strategy,
+            active_map=active_map,
+            custom_weights=weights,
+            time_limit=time_limit,
+            rel_gap=rel_gap
+        )
+        # Report the amounts actually planned
+        if graph is not None:
+            targets = graph['targets']
+    else:
+        graph = get_precomputed_plan(targets, strategy, active_map, limits)
     
-    graph = solver.optimize(
-        targets=targets,
-        strategy=strategy,
-        active_map=active_map,
-        custom_weights=weights,
-        time_limit=time_limit,
-        rel_gap=rel_gap
-    )
+        if graph is None:
+            # CBC solves wait for a free slot; closed-form plans skip the queue
+            solver = MILPSolver(items_data, recipes_data, admission=admission, deadline=deadline)
+            
+            graph = solver.optimize(
+                targets=targets,
+                strategy=strategy,
+                active_map=active_map,
+                custom_weights=weights,
+                time_limit=time_limit,
+                rel_gap=rel_gap,
+                resource_limits=limits
+            )
     
     if graph is None:
         raise ValueError("No feasible solution found for the given parameters.")
+
+    # Optional LP sensitivity pass over the chosen recipes; like any solve it waits for a
+    # slot and fits in the deadline, and a busy server or spent deadline leaves it null
+    if solver_opts.get('sensitivity'):
+        used = {n['recipe_id'] for n in graph['recipe_nodes'].values() if not n.get('is_base_resource')}
+        solver = MILPSolver(items_data, recipes_data, admission=admission, deadline=deadline)
+        try:
+            sensitivity = solver.analyze_sensitivity(
+                targets, strategy, active_map, used, weights,
+                resource_limits=limits, time_limit=time_limit
+            )
+        except (SolverBusyError, SolveAbortedError):
+            if deadline is not None and deadline.cancelled():
+                raise
+            sensitivity = None
+        graph = {**graph, 'sensitivity': sensitivity}
         
     # 5. Build summary
     summary = calculate_summary_stats(graph)
@@ -94,6 +157,56 @@ def calculate_production(
         'lp': True
     }
     
-    # Ensure no NaN/Inf values (important for JSON serialization)
-    return clean_nan_values(response)
+    # NaN/Inf values are written as null by the app's JSON provider
+    return response
+
+
+
+def build_resource_limits(resource_limits: Any = None, resource_nodes: Any = None,
+                          world_limits: bool = False) -> Dict[str, float]:
+    """
+    Combine the request's resource caps into one base resource -> per-minute map.
+
+    Claimed nodes set the cap of their resources, explicit ``resource_limits`` override
+    them, and ``world_limits`` caps the remaining resources at their map-wide totals.
+    """
+    limits: Dict[str, float] = {}
+
+    if resource_nodes is not None:
+        if not isinstance(resource_nodes, list):
+            raise ValueError('"resource_nodes" must be a list')
+        for i, node in enumerate(resource_nodes):
+            if not isinstance(node, dict) or not is_base_resource(node.get('resource')):
+                raise ValueError(f'Resource node at index {i} must name a base resource in "resource"')
+            try:
+                count = int(node.get('count', 1))
+                clock = float(node.get('clock_speed', 100.0))
+            except (TypeError, ValueError):
+                raise ValueError(f'Resource node at index {i}: "count" and "clock_speed" must be numbers')
+            if count < 0:
+                raise ValueError(f'Resource node at index {i}: "count" must be non-negative')
+            try:
+                rate = node_extraction_rate(node.get('purity', 'normal'), node.get('extractor'), clock)
+            except ValueError as e:
+                raise ValueError(f'Resource node at index {i}: {e}')
+            limits[node['resource']] = limits.get(node['resource'], 0.0) + rate * count
+
+    if resource_limits is not None:
+        if not isinstance(resource_limits, dict):
+            raise ValueError('"resource_limits" must be an object of base resource -> amount per minute')
+        for iid, cap in resource_limits.items():
+            if not is_base_resource(iid):
+                raise ValueError(f"Not a base resource: {iid}")
+            try:
+                cap = float(cap)
+            except (TypeError, ValueError):
+                raise ValueError(f"Limit for {iid} must be a number")
+            if cap < 0:
+                raise ValueError(f"Limit for {iid} must be non-negative")
+            limits[iid] = cap
+
+    if world_limits:
+        for iid, cap in WORLD_RESOURCE_LIMITS.items():
+            limits.setdefault(iid, float(cap))
 
+    return limits
@@ -0,0 +1,225 @@
+"""
+Item cost service for Satisfactory Factory Calculator.
+Computes the raw-resource cost of one unit of every item in a single sweep.
+
+Each item takes the cost of its best active recipe: the ingredient costs divided by
+the amount of the item produced, with any byproducts treated as free. Items are visited
+producers-first in topological order of the recipe graph's strongly-connected
+components; cyclic components are re-evaluated until their costs stop changing.
+
+Recipes are ranked like the solver ranks plans, but per item: built-in strategies compare
+``STRATEGY_PRIORITIES`` lexicographically and 'custom' compares the weighted sum. The
+base-type and recipe counts are those of the item's own production chain.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, List, FrozenSet
+
+from ..data import get_recipes, get_all_item_ids, is_base_resource
+from ..solvers import get_strategy_weights, get_strategy_priorities
+from ..solvers.dependency_graph import get_item_graph
+from .active_recipes import resolve_active_map
+
+# Maximum number of cost tables kept in memory
+ITEM_COST_CACHE_SIZE = 16
+
+# Relaxation settings for cyclic components
+COST_TOLERANCE = 1e-9
+MAX_RELAXATION_ROUNDS = 200
+
+# Strategy weight name -> ranked per-unit component
+WEIGHT_COMPONENTS = {
+    'base': 'total_base',
+    'base_types': 'uniq_base_types',
+    'machines': 'machines',
+    'recipes': 'uniq_recipes'
+}
+
+_cost_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_cost_cache_lock = threading.Lock()
+
+
+def active_map_fingerprint(active_map: Dict[str, bool]) -> str:
+    """Stable fingerprint of the enabled recipe set."""
+    enabled = sorted(rid for rid, enabled in active_map.items() if enabled)
+    return hashlib.sha1('\n'.join(enabled).encode('utf-8')).hexdigest()
+
+
+def get_item_cost_table(active_recipes: Optional[Dict[str, Any]] = None,
+                        strategy: str = 'resource_efficiency',
+                        weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Per-unit base-resource cost of every producible item, cached per active map and ranking.
+    Used by the /api/item-costs endpoint.
+
+    Args:
+        active_recipes: Recipe enable map, bitset or diff (defaults to the default active recipes).
+        strategy: Strategy whose priorities (or 'custom' weights) rank competing recipes.
+        weights: Custom weights for the 'custom' strategy.
+
+    Returns:
+        Dict with "fingerprint", "strategy", "priorities" or "weights_used", "items"
+        (item_id -> {"base", "total_base", "base_types", "machines", "recipe_count", "recipe"},
+        or None if unresolved), "unresolved" (items on or behind a loop whose costs did not
+        converge) and "unreachable" (items with no active recipe chain).
+    """
+    recipes_data = get_recipes()
+    active_map = resolve_active_map(active_recipes)
+    fingerprint = active_map_fingerprint(active_map)
+
+    if strategy == 'custom':
+        w = get_strategy_weights(strategy, weights)
+        if any(v < 0 for v in w.values()):
+            raise ValueError("Item costs require non-negative weights")
+        ranking = {'weights_used': w}
+        rank_by = {'weights': w}
+        key = (fingerprint, 'weights', tuple(sorted(w.items())))
+    else:
+        priorities = get_strategy_priorities(strategy)
+        ranking = {'priorities': priorities}
+        rank_by = {'priorities': priorities}
+        key = (fingerprint, 'priorities', tuple(priorities))
+
+    with _cost_cache_lock:
+        table = _cost_cache.get(key)
+        if table is not None:
+            _cost_cache.move_to_end(key)
+    if table is None:
+        table = compute_item_costs(recipes_data, active_map, **rank_by)
+        with _cost_cache_lock:
+            _cost_cache[key] = table
+            while len(_cost_cache) > ITEM_COST_CACHE_SIZE:
+                _cost_cache.popitem(last=False)
+
+    return {
+        'fingerprint': fingerprint,
+        'strategy': strategy,
+        **ranking,
+        **table
+    }
+
+
+def compute_item_costs(recipes_data: Dict[str, Any], active_map: Dict[str, bool],
+                       priorities: Optional[List[str]] = None,
+                       weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Compute the cost table for one active map (uncached).
+
+    Args:
+        priorities: Components compared lexicographically (default: total_base only).
+        weights: Strategy weights compared as one weighted sum; overrides ``priorities``.
+
+    Returns:
+        Dict with "items", "unresolved" and "unreachable" (see ``get_item_cost_table``).
+    """
+    graph = get_item_graph(recipes_data, active_map)
+    costs: Dict[str, Dict[str, Any]] = {}
+    chains: Dict[str, FrozenSet[str]] = {}
+    unresolved = set()
+    if priorities is None:
+        priorities = ['total_base']
+
+    def rank(cost):
+        components = {'total_base': cost['total_base'], 'uniq_base_types': cost['base_types'],
+                      'machines': cost['machines'], 'uniq_recipes': cost['recipe_count']}
+        if weights is not None:
+            return (sum(weights.get(w, 0.0) * components[c] for w, c in WEIGHT_COMPONENTS.items()),)
+        return tuple(components[p] for p in priorities)
+
+    def recipe_cost(rid, item_id):
+        """Cost and recipe chain of one unit of item_id via recipe rid, or None if an ingredient has no cost yet."""
+        rec = recipes_data[rid]
+        produced = sum(p['amount'] for p in rec.get('products', []) if p['item'] == item_id)
+        if produced <= 0:
+            return None
+        cycles = 60.0 / (rec.get('time', 1.0) or 1.0)
+        base = {}
+        machines = 1.0 / (produced * cycles)
+        chain = {rid}
+        for ing in rec.get('ingredients', []):
+            ing_cost = costs.get(ing['item'])
+            if ing_cost is None:
+                return None
+            share = ing['amount'] / produced
+            for bid, units in ing_cost['base'].items():
+                base[bid] = base.get(bid, 0.0) + units * share
+            machines += ing_cost['machines'] * share
+            chain |= chains[ing['item']]
+        cost = {'base': base, 'total_base': sum(base.values()), 'base_types': len(base),
+                'machines': machines, 'recipe_count': len(chain), 'recipe': rid}
+        return cost, frozenset(chain)
+
+    def better(candidate, best):
+        if best is None:
+            return True
+        for c, b in zip(rank(candidate), rank(best)):
+            if abs(c - b) > COST_TOLERANCE:
+                return c < b
+        return candidate['recipe'] != best['recipe'] and _prefer(recipes_data, candidate['recipe'], best['recipe'])
+
+    def same(a, b):
+        if a is None or b is None:
+            return a is b
+        return (a['recipe'] == b['recipe'] and a['base'].keys() == b['base'].keys()
+                and all(abs(a['base'][k] - b['base'][k]) <= COST_TOLERANCE for k in a['base'])
+                and abs(a['machines'] - b['machines']) <= COST_TOLERANCE
+                and a['recipe_count'] == b['recipe_count'])
+
+    def evaluate(item_id):
+        """Best cost of an item from the current ingredient costs; True if it changed."""
+        best = None
+        for rid in graph.producers(item_id):
+            candidate = recipe_cost(rid, item_id)
+            if candidate is not None and (best is None or better(candidate[0], best[0])):
+                best = candidate
+        if same(best and best[0], costs.get(item_id)):
+            return False
+        if best is None:
+            costs.pop(item_id, None)
+            chains.pop(item_id, None)
+        else:
+            costs[item_id], chains[item_id] = best
+        return True
+
+    def blocked(recipe_ids):
+        """True if any of the recipes needs an unresolved ingredient."""
+        return any(ing in unresolved for rid in recipe_ids for ing in graph.ingredients(rid))
+
+    # SCCs come consumers-first; walk them producers-first
+    for items, recipes in reversed(graph.sccs):
+        for item_id in sorted(items):
+            if is_base_resource(item_id):
+                costs[item_id] = {'base': {item_id: 1.0}, 'total_base': 1.0, 'base_types': 1,
+                                  'machines': 0.0, 'recipe_count': 0, 'recipe': None}
+                chains[item_id] = frozenset()
+        pending = sorted(iid for iid in items if not is_base_resource(iid))
+        # A recipe that needs an unresolved item may or may not be the best; so is everything it feeds
+        if blocked(recipes) or any(blocked(graph.producers(iid)) for iid in pending):
+            unresolved.update(pending)
+            continue
+        if not recipes:
+            for item_id in pending:
+                evaluate(item_id)
+            continue
+        for _ in range(MAX_RELAXATION_ROUNDS):
+            if not any([evaluate(item_id) for item_id in pending]):
+                break
+        else:
+            # Costs still moving (e.g. a loop that yields more than it consumes)
+            unresolved.update(pending)
+
+    for item_id in unresolved:
+        costs.pop(item_id, None)
+    all_items = set(get_all_item_ids()) | set(costs) | unresolved
+    unreachable = sorted(iid for iid in all_items if iid not in costs and iid not in unresolved)
+    items = {iid: costs.get(iid) for iid in sorted(set(costs) | unresolved)}
+    return {'items': items, 'unresolved': sorted(unresolved), 'unreachable': unreachable}
+
+
+def _prefer(recipes_data: Dict[str, Any], candidate: str, current: str) -> bool:
+    """Tie-break between equally cheap recipes: standard before alternate, then by ID."""
+    cand_key = (recipes_data[candidate].get('alternate', False), candidate)
+    curr_key = (recipes_data[current].get('alternate', False), current)
+    return cand_key < curr_key
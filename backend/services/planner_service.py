@@ -0,0 +1,51 @@
+"""
+Planner service for Satisfactory Factory Calculator.
+Validates hand-built planner graphs and runs the flow simulation on them.
+"""
+
+from typing import Dict, Any, List
+from ..data import get_recipes
+from ..solvers.flow_simulator import simulate_flows
+
+
+def simulate_planner_flows(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute steady-state flows for a planner graph.
+    Used by the POST /api/planner/flows endpoint.
+
+    Args:
+        nodes: Planner nodes (``id`` plus ``data`` with recipe/machine settings).
+        edges: Planner edges (``id``, ``source``, ``target``, ``sourceHandle``,
+               optional ``data.manualFlow`` for locked rates).
+
+    Returns:
+        Simulation result (see ``simulate_flows``).
+    """
+    if not isinstance(nodes, list) or not isinstance(edges, list):
+        raise ValueError('"nodes" and "edges" must be lists')
+
+    seen = set()
+    for i, node in enumerate(nodes):
+        if not isinstance(node, dict) or not isinstance(node.get('id'), str):
+            raise ValueError(f'Node at index {i} must be an object with a string "id"')
+        if node['id'] in seen:
+            raise ValueError(f'Duplicate node id: {node["id"]}')
+        seen.add(node['id'])
+        if node.get('data') is not None and not isinstance(node['data'], dict):
+            raise ValueError(f'Node "{node["id"]}": "data" must be an object')
+
+    for i, edge in enumerate(edges):
+        if not isinstance(edge, dict):
+            raise ValueError(f'Edge at index {i} must be an object')
+        for key in ('id', 'source', 'target'):
+            if not isinstance(edge.get(key), str):
+                raise ValueError(f'Edge at index {i} missing "{key}"')
+        manual = (edge.get('data') or {}).get('manualFlow')
+        if manual is not None:
+            try:
+                if float(manual) < 0:
+                    raise ValueError
+            except (TypeError, ValueError):
+                raise ValueError(f'Edge "{edge["id"]}": manualFlow must be a non-negative number')
+
+    return simulate_flows(nodes, edges, get_recipes())
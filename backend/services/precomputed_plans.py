@@ -0,0 +1,206 @@
+"""
+Precomputed plan service for Satisfactory Factory Calculator.
+Serves default-recipe, single-target requests from an offline table of unit-rate plans.
+
+Every lexicographic strategy objective is linear in the continuous variables and the
+recipe/base binaries are scale-invariant, so a plan solved for 1 item/min scales linearly
+to any amount (as long as the scaled values stay inside the Big-M bounds).
+
+Build the table with:
+    python -m backend.scripts.build_precomputed_plans
+"""
+
+import os
+import json
+import gzip
+import hashlib
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+from ..config import BIG_M_MACHINE, BIG_M_BASE, DEBUG_CALC
+from ..data import get_items, get_recipes, get_all_item_ids, get_default_active_recipes, is_base_resource
+from ..data.loader import BASE_DIR, DATA_PATH
+from ..solvers import MILPSolver, get_strategy_weights
+from ..solvers.strategy_weights import STRATEGY_PRIORITIES
+from ..solvers.dependency_graph import dependency_closure_multi
+from ..solvers.flow_router import route_flows
+
+PRECOMPUTED_PLANS_PATH = os.path.join(BASE_DIR, 'precomputed_plans.json.gz')
+
+# Bump when the on-disk layout changes
+TABLE_FORMAT_VERSION = 2
+
+# Solver settings used for the offline build (generous, exact)
+BUILD_TIME_LIMIT = 120
+BUILD_REL_GAP = 0.0
+
+
+@lru_cache(maxsize=1)
+def get_default_active_set() -> frozenset:
+    """Frozen set of recipe IDs enabled in the default active map."""
+    return frozenset(rid for rid, enabled in get_default_active_recipes().items() if enabled)
+
+
+def compute_table_fingerprint() -> str:
+    """
+    Fingerprint of everything a precomputed plan depends on.
+    A table whose fingerprint differs from the current one is ignored.
+    """
+    h = hashlib.sha256()
+    with open(DATA_PATH, 'rb') as f:
+        h.update(f.read())
+    h.update(json.dumps(sorted(get_default_active_set())).encode('utf-8'))
+    h.update(json.dumps(STRATEGY_PRIORITIES, sort_keys=True).encode('utf-8'))
+    h.update(str(TABLE_FORMAT_VERSION).encode('utf-8'))
+    return h.hexdigest()
+
+
+def build_precomputed_table(strategies: List[str] = None, time_limit: float = BUILD_TIME_LIMIT) -> Dict[str, Any]:
+    """
+    Solve every producible item at 1/min under each built-in strategy with the default recipes.
+
+    Returns:
+        Table dict: {"version", "fingerprint", "plans": {strategy: {item_id: plan}}}
+        where plan = {"m": {recipe_id: machines}, "b": {base_id: rate}, "o": proven_optimal, "c": components,
+        "f": closed_form, "k": independent blocks, "r": model_reduction}
+    """
+    if strategies is None:
+        strategies = list(STRATEGY_PRIORITIES.keys())
+
+    solver = MILPSolver(get_items(), get_recipes())
+    active_map = get_default_active_recipes()
+    plans = {}
+
+    for strategy in strategies:
+        plans[strategy] = {}
+        for item_id in sorted(get_all_item_ids()):
+            if is_base_resource(item_id):
+                continue
+            try:
+                solution = solver.solve_values(
+                    targets=[{'item': item_id, 'amount': 1.0}],
+                    strategy=strategy,
+                    active_map=active_map,
+                    time_limit=time_limit,
+                    rel_gap=BUILD_REL_GAP
+                )
+            except ValueError:
+                solution = None
+            if solution is None:
+                continue
+            m_values = {rid: v for rid, v in solution['m_values'].items() if v and v > 1e-9}
+            base_values = {iid: v for iid, v in solution['base_values'].items() if v and v > 1e-9}
+            components = {k: float(v) for k, v in solution['objective_components'].items()}
+            # At 1/min CBC may leave binaries on for counts below the cut-off; count what is stored
+            components['uniq_recipes'] = float(len(m_values))
+            components['uniq_base_types'] = float(len(base_values))
+            plans[strategy][item_id] = {
+                'm': m_values,
+                'b': base_values,
+                'o': solution['proven_optimal'],
+                'c': components,
+                'f': solution['closed_form'],
+                'k': solution['blocks'],
+                'r': solution['model_reduction']
+            }
+
+    return {
+        'version': TABLE_FORMAT_VERSION,
+        'fingerprint': compute_table_fingerprint(),
+        'plans': plans
+    }
+
+
+def write_precomputed_table(table: Dict[str, Any], path: str = PRECOMPUTED_PLANS_PATH) -> None:
+    """Write a table as compact gzip-compressed JSON."""
+    payload = json.dumps(table, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    # mtime=0 keeps the file byte-identical across rebuilds of the same data
+    with open(path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=9, mtime=0) as f:
+        f.write(payload)
+
+
+@lru_cache(maxsize=1)
+def load_precomputed_table() -> Optional[Dict[str, Any]]:
+    """
+    Load the precomputed table from disk with caching.
+    Returns None if the table is missing, unreadable or stale.
+    """
+    if not os.path.exists(PRECOMPUTED_PLANS_PATH):
+        return None
+    try:
+        with gzip.open(PRECOMPUTED_PLANS_PATH, 'rt', encoding='utf-8') as f:
+            table = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if table.get('version') != TABLE_FORMAT_VERSION or table.get('fingerprint') != compute_table_fingerprint():
+        if DEBUG_CALC:
+            print("[Precomputed] Table is stale, ignoring it.")
+        return None
+    return table
+
+
+def get_precomputed_plan(targets: List[Dict[str, Any]], strategy: str,
+                         active_map: Dict[str, bool],
+                         resource_limits: Optional[Dict[str, float]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Return a production graph scaled from the precomputed table, or None if the request doesn't match.
+
+    A request matches when it has a single target, uses a built-in strategy and the default
+    active recipe set. With resource limits, the uncapped optimum is only reused when it
+    already respects every cap.
+    """
+    if len(targets) != 1:
+        return None
+    table = load_precomputed_table()
+    if table is None:
+        return None
+    plan = table['plans'].get(strategy, {}).get(targets[0]['item'])
+    if plan is None:
+        return None
+    if frozenset(rid for rid, enabled in active_map.items() if enabled) != get_default_active_set():
+        return None
+
+    amount = targets[0]['amount']
+    m_values = {rid: v * amount for rid, v in plan['m'].items()}
+    base_values = {iid: v * amount for iid, v in plan['b'].items()}
+
+    # Outside the Big-M bounds the solver's answer would differ, so let it handle those
+    if any(v > BIG_M_MACHINE for v in m_values.values()) or any(v > BIG_M_BASE for v in base_values.values()):
+        return None
+    if resource_limits and any(v > resource_limits.get(iid, float('inf')) for iid, v in base_values.items()):
+        return None
+
+    recipes_data = get_recipes()
+    needed_items, _ = dependency_closure_multi([targets[0]['item']], recipes_data, active_map)
+    solver = MILPSolver(get_items(), recipes_data)
+    recipe_nodes = solver.build_recipe_nodes(targets, needed_items, m_values, base_values)
+
+    # Count-type components are scale-invariant, amount-type ones scale linearly
+    components = {
+        k: (v if k in ('uniq_base_types', 'uniq_recipes') else v * amount)
+        for k, v in plan['c'].items()
+    }
+
+    return {
+        'recipe_nodes': recipe_nodes,
+        'edges': route_flows(recipe_nodes, targets),
+        'targets': targets,
+        # Legacy compatibility fields (for single-target requests)
+        'target_item': targets[0]['item'],
+        'target_amount': amount,
+        'weights_used': get_strategy_weights(strategy),
+        'strategy': strategy,
+        'objective_components': components,
+        'solver_time_limit': BUILD_TIME_LIMIT,
+        'solver_gap': BUILD_REL_GAP,
+        'proven_optimal': plan['o'],
+        # As the solver reported them for the offline run
+        'closed_form': plan['f'],
+        'independent_blocks': plan['k'],
+        'model_reduction': plan['r'],
+        'solver_passes': [],
+        'optimality_gap': 0.0 if plan['o'] else None,
+        'precomputed': True
+    }
+
@@ -4,7 +4,11 @@ Handles recipe-related business logic and status information.
 """
 
 from typing import Dict, Any
-from ..data import get_recipes, get_default_active_recipes, SPECIAL_RESOURCE_RECIPES
+from ..data import (
+    get_recipes, get_default_active_recipes, get_recipe_index, get_recipe_index_version,
+    SPECIAL_RESOURCE_RECIPES
+)
+from .active_recipes import encode_active_bitset
 
 def get_all_recipes_with_status() -> Dict[str, Dict[str, Any]]:
     """
@@ -28,3 +32,15 @@ def get_all_recipes_with_status() -> Dict[str, Dict[str, Any]]:
         }
         
     return recipes_with_status
+
+
+def get_recipe_index_info() -> Dict[str, Any]:
+    """
+    Recipe index for compact ``active_recipes`` bitsets.
+    Used by the GET /api/recipes/index endpoint.
+    """
+    return {
+        'version': get_recipe_index_version(),
+        'recipes': list(get_recipe_index()),
+        'default_bitset': encode_active_bitset(get_default_active_recipes())
+    }
@@ -0,0 +1,117 @@
+"""
+Response formats for Satisfactory Factory Calculator.
+Converts a full calculate response into the compact or columnar layouts.
+
+The full format repeats recipe data, display strings and machine details in every node.
+The compact formats keep only IDs and numbers; clients resolve names and machine types
+from /api/items and /api/recipes.
+
+compact:   nodes are {"id", "kind", "recipe", "item", "machines", "in", "out"} and edges
+           are [source, target, item, rate] rows.
+columnar:  parallel arrays for nodes (id, kind, recipe, item, machines), their rates as
+           (node index, item, rate) triples with inputs negative, and edges.
+
+``kind`` is "recipe", "base", "end" or "surplus"; ``recipe`` is null except for recipe nodes.
+"""
+
+from typing import Dict, Any, List
+
+RESPONSE_FORMATS = ('full', 'compact', 'columnar')
+
+# Graph keys replaced by the compact layouts
+_GRAPH_NODE_KEYS = ('recipe_nodes', 'edges')
+
+
+def format_production_response(response: Dict[str, Any], response_format: str = 'full') -> Dict[str, Any]:
+    """
+    Re-shape a calculate response for the requested format.
+
+    Raises:
+        ValueError: On an unknown format.
+    """
+    if response_format not in RESPONSE_FORMATS:
+        raise ValueError(f"Unknown response format: {response_format} (expected one of {', '.join(RESPONSE_FORMATS)})")
+    if response_format == 'full':
+        return response
+
+    graph = response['production_graph']
+    if response_format == 'compact':
+        packed = compact_graph(graph)
+    else:
+        packed = columnar_graph(graph)
+    return {**response, 'production_graph': packed, 'format': response_format}
+
+
+def node_kind(node: Dict[str, Any]) -> str:
+    """Kind of a full-format node: recipe, base, end or surplus."""
+    if node.get('is_base_resource'):
+        return 'base'
+    if node.get('is_end_product_node'):
+        return 'end'
+    if node.get('is_surplus_node'):
+        return 'surplus'
+    return 'recipe'
+
+
+def compact_graph(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """Production graph with ID/number-only nodes and edge rows."""
+    nodes = []
+    for node_id, nd in graph.get('recipe_nodes', {}).items():
+        kind = node_kind(nd)
+        nodes.append({
+            'id': node_id,
+            'kind': kind,
+            'recipe': nd.get('recipe_id') if kind == 'recipe' else None,
+            'item': nd.get('item_id'),
+            'machines': nd.get('machines_needed', 0),
+            'in': nd.get('inputs', {}),
+            'out': nd.get('outputs', {})
+        })
+    edges = [[e['source'], e['target'], e['item'], e['rate']] for e in graph.get('edges', [])]
+    return {**_graph_fields(graph), 'nodes': nodes, 'edges': edges}
+
+
+def columnar_graph(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """Production graph as parallel arrays."""
+    ids: List[str] = []
+    kinds: List[str] = []
+    recipes: List[Any] = []
+    items: List[Any] = []
+    machines: List[float] = []
+    rate_node: List[int] = []
+    rate_item: List[str] = []
+    rate_value: List[float] = []
+
+    for index, (node_id, nd) in enumerate(graph.get('recipe_nodes', {}).items()):
+        kind = node_kind(nd)
+        ids.append(node_id)
+        kinds.append(kind)
+        recipes.append(nd.get('recipe_id') if kind == 'recipe' else None)
+        items.append(nd.get('item_id'))
+        machines.append(nd.get('machines_needed', 0))
+        for item_id, rate in nd.get('inputs', {}).items():
+            rate_node.append(index)
+            rate_item.append(item_id)
+            rate_value.append(-rate)
+        for item_id, rate in nd.get('outputs', {}).items():
+            rate_node.append(index)
+            rate_item.append(item_id)
+            rate_value.append(rate)
+
+    edges = graph.get('edges', [])
+    return {
+        **_graph_fields(graph),
+        'nodes': {'id': ids, 'kind': kinds, 'recipe': recipes, 'item': items, 'machines': machines},
+        'rates': {'node': rate_node, 'item': rate_item, 'rate': rate_value},
+        'edges': {
+            'source': [e['source'] for e in edges],
+            'target': [e['target'] for e in edges],
+            'item': [e['item'] for e in edges],
+            'rate': [e['rate'] for e in edges]
+        }
+    }
+
+
+def _graph_fields(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """Plan-level graph fields (everything except nodes and edges)."""
+    return {k: v for k, v in graph.items() if k not in _GRAPH_NODE_KEYS}
@@ -0,0 +1,106 @@
+"""
+Startup warm-up for Satisfactory Factory Calculator.
+Loads what the first requests would otherwise pay for, in a background thread.
+
+The app serves /api/health, /api/items and /api/recipes without the solver stack;
+routes that solve import it on first use. After startup, a warm-up thread loads the game
+data, compresses the static payloads, imports PuLP and the solvers, and reads the
+precomputed plans and the default item graph. Each gunicorn worker runs its own, once.
+"""
+
+import importlib
+import threading
+import time
+from typing import Dict, Any, Callable, List, Tuple
+
+from flask import Flask
+
+from ..data import get_items, get_recipes, get_default_active_recipes
+from ..utils.compression import STATIC_PAYLOADS
+
+# Modules that load PuLP, the solvers and the services built on them
+SOLVER_MODULES = (
+    'backend.solvers.milp_solver',
+    'backend.services.calculation_service',
+    'backend.services.alternate_impact_service'
+)
+
+_state: Dict[str, Any] = {'state': 'idle', 'steps': {}, 'error': None}
+_state_lock = threading.Lock()
+_started = False
+
+
+def _load_game_data(app: Flask) -> None:
+    get_items()
+    get_recipes()
+    get_default_active_recipes()
+
+
+def _compress_static_payloads(app: Flask) -> None:
+    with app.app_context():
+        for payload in STATIC_PAYLOADS:
+            payload.warm()
+
+
+def _import_solvers(app: Flask) -> None:
+    for module in SOLVER_MODULES:
+        importlib.import_module(module)
+
+
+def _load_solver_caches(app: Flask) -> None:
+    from .precomputed_plans import load_precomputed_table
+    from ..solvers.dependency_graph import get_item_graph
+    load_precomputed_table()
+    get_item_graph(get_recipes(), get_default_active_recipes())
+
+
+# Cheap steps first so the routes that need them are ready soonest
+WARMUP_STEPS: List[Tuple[str, Callable[[Flask], None]]] = [
+    ('game_data', _load_game_data),
+    ('static_payloads', _compress_static_payloads),
+    ('solver_imports', _import_solvers),
+    ('solver_caches', _load_solver_caches)
+]
+
+
+def run_warmup(app: Flask) -> Dict[str, float]:
+    """
+    Run the warm-up steps in order.
+
+    Returns:
+        Step name -> seconds taken. A failing step stops the warm-up; whatever it did not
+        load is loaded on first use instead.
+    """
+    with _state_lock:
+        _state.update(state='running', steps={}, error=None)
+    for name, step in WARMUP_STEPS:
+        start = time.perf_counter()
+        try:
+            step(app)
+        except Exception as e:
+            with _state_lock:
+                _state['state'] = 'failed'
+                _state['error'] = f"{name}: {e}"
+                return dict(_state['steps'])
+        with _state_lock:
+            _state['steps'][name] = round(time.perf_counter() - start, 4)
+    with _state_lock:
+        _state['state'] = 'done'
+        return dict(_state['steps'])
+
+
+def start_warmup(app: Flask) -> bool:
+    """Start the warm-up thread unless this process already has; returns True if it started."""
+    global _started
+    with _state_lock:
+        if _started:
+            return False
+        _started = True
+    threading.Thread(target=run_warmup, args=(app,), name='sfc-warmup', daemon=True).start()
+    return True
+
+
+def get_warmup_stats() -> Dict[str, Any]:
+    """Warm-up state ('idle', 'running', 'done' or 'failed') and seconds per finished step."""
+    with _state_lock:
+        return {'state': _state['state'], 'steps': dict(_state['steps']), 'error': _state['error']}
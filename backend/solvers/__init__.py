@@ -1,19 +1,53 @@
 # Backend solvers package
 # Contains MILP solver and optimization logic
 
-from .milp_solver import MILPSolver
+import importlib
+
+from .deadline import Deadline, SolveAbortedError
+from .thread_policy import threads_for, get_thread_stats
 from .strategy_weights import get_strategy_weights, validate_strategy, get_strategy_priorities
 from .dependency_graph import dependency_closure_recipes
+from .flow_router import route_flows
+from .flow_simulator import simulate_flows
 from .graph_builder import build_recipe_node, build_base_resource_node, build_end_product_node, build_surplus_node
 
+# Imported on first access: these load PuLP (and NumPy/HiGHS for the worker pool)
+_LAZY_EXPORTS = {
+    'MILPSolver': 'milp_solver',
+    'SolverWorkerPool': 'solver_pool',
+    'SolverWorkerError': 'solver_pool',
+    'get_engine_stats': 'solver_pool',
+    'rank_alternates': 'alternate_ranking'
+}
+
 __all__ = [
     'MILPSolver',
+    'Deadline',
+    'SolveAbortedError',
+    'threads_for',
+    'get_thread_stats',
+    'SolverWorkerPool',
+    'SolverWorkerError',
+    'get_engine_stats',
     'get_strategy_weights',
     'validate_strategy',
     'get_strategy_priorities',
     'dependency_closure_recipes',
+    'route_flows',
+    'simulate_flows',
+    'rank_alternates',
     'build_recipe_node',
     'build_base_resource_node',
     'build_end_product_node',
     'build_surplus_node'
 ]
+
+
+def __getattr__(name):
+    """Import a lazy export on first access."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
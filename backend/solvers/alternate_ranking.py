@@ -0,0 +1,332 @@
+"""
+Alternate recipe impact ranking for Satisfactory Factory Calculator.
+Measures how much enabling each disabled alternate would improve a plan.
+
+The plan is solved once with the base active map. Every candidate alternate that produces
+an item of that plan is then solved with only itself added, starting CBC from the base
+solution (still feasible, since the new recipe can run at zero).
+
+A ranking holds one solver admission slot from start to finish. Its candidate solves run
+in a process pool of its own, so they never queue ahead of /api/calculate's block solves.
+When the time budget or the request deadline runs out, or the client disconnects, the
+pool's processes are killed along with their CBC runs; candidates without a result are
+reported as timed out.
+"""
+
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple, Callable, ContextManager
+
+from ..config import DEFAULT_SOLVER_TIME_LIMIT, DEFAULT_REL_GAP, SOLVER_PARALLEL_WORKERS
+from ..data.base_resources import is_base_resource
+from .deadline import Deadline, SolveAbortedError
+from .dependency_graph import ItemGraph, get_item_graph
+from .milp_solver import MILPSolver, CANCEL_POLL_INTERVAL
+from .process_context import get_process_context
+from .strategy_weights import get_strategy_weights, get_strategy_priorities
+
+# Component changes smaller than this (relative) count as no change
+IMPACT_TOLERANCE = 1e-6
+
+
+def candidate_alternates(recipes_data: Dict[str, Any], active_map: Dict[str, bool],
+                         needed_items) -> List[str]:
+    """Disabled alternates producing at least one non-base item of the closure."""
+    wanted = {iid for iid in needed_items if not is_base_resource(iid)}
+    return sorted(
+        rid for rid, rec in recipes_data.items()
+        if rec.get('alternate') and not active_map.get(rid, False)
+        and any(p['item'] in wanted for p in rec.get('products', []))
+    )
+
+
+def rank_alternates(items_data: Dict[str, Any], recipes_data: Dict[str, Any],
+                    targets: List[Dict[str, Any]], strategy: str, active_map: Dict[str, bool],
+                    custom_weights: Dict[str, float] = None, candidates: List[str] = None,
+                    time_budget: float = 60.0, rel_gap: float = None,
+                    admission: Optional[Callable[[], ContextManager]] = None,
+                    deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """
+    Rank disabled alternates by how much each one improves the plan on its own.
+
+    Args:
+        items_data: Item dictionary (from data layer).
+        recipes_data: Recipe dictionary (from data layer).
+        targets: List of targets [{"item": str, "amount": float}, ...]
+        strategy: Optimization strategy name
+        active_map: Base recipe enable map
+        custom_weights: Weights for 'custom' strategy
+        candidates: Recipe IDs to evaluate (defaults to every alternate touching the closure)
+        time_budget: Wall-clock budget in seconds for the whole ranking
+        rel_gap: Relative gap tolerance for each solve
+        admission: Context manager factory held around the whole ranking (see MILPSolver)
+        deadline: Request deadline; the ranking ends at it or at ``time_budget``, whichever
+                  comes first, and is abandoned if the client disconnects
+
+    Returns:
+        Dict with "baseline" (objective components), "ranking" (improving alternates, best
+        first), "no_gain", "infeasible", "timed_out" (recipe ID lists) and "elapsed".
+
+    Raises:
+        SolveAbortedError: If the client disconnected or no time was left for the baseline.
+    """
+    solver = MILPSolver(items_data, recipes_data, admission=admission, deadline=deadline)
+    with solver.admission():
+        return _rank(solver, recipes_data, targets, strategy, active_map, custom_weights,
+                     candidates, time_budget, rel_gap)
+
+
+def _rank(solver: MILPSolver, recipes_data: Dict[str, Any], targets: List[Dict[str, Any]],
+          strategy: str, active_map: Dict[str, bool], custom_weights: Optional[Dict[str, float]],
+          candidates: Optional[List[str]], time_budget: float, rel_gap: Optional[float]) -> Dict[str, Any]:
+    """Body of ``rank_alternates``, run while holding the admission slot."""
+    started = time.monotonic()
+    ends_at = started + time_budget
+    deadline = solver.deadline
+
+    def time_left():
+        return min(ends_at - time.monotonic(), deadline.remaining())
+
+    gap = rel_gap if rel_gap is not None else DEFAULT_REL_GAP
+    weights = get_strategy_weights(strategy, custom_weights)
+
+    # 1. Baseline plan
+    item_graph = get_item_graph(recipes_data, active_map)
+    needed_items, needed_recipes = item_graph.closure([t['item'] for t in targets])
+    if not needed_recipes:
+        missing = [t['item'] for t in targets if not is_base_resource(t['item'])]
+        raise ValueError(f"No active recipes available to produce: {', '.join(missing)}")
+    baseline_limit = max(1, min(DEFAULT_SOLVER_TIME_LIMIT, int(min(time_budget, time_left()) / 4)))
+    baseline = solver._solve_closure(
+        targets, strategy, weights, needed_items, sorted(needed_recipes), baseline_limit, gap, item_graph
+    )
+    if baseline is None:
+        raise ValueError("No feasible solution found for the given parameters.")
+
+    if candidates is None:
+        candidates = candidate_alternates(recipes_data, active_map, needed_items)
+    else:
+        candidates = sorted(rid for rid in set(candidates) if rid in recipes_data and not active_map.get(rid, False))
+
+    # Most promising first, so a tight budget is spent where it matters
+    used = {rid for rid, mv in baseline['m_values'].items() if mv and mv > 1e-9}
+    try:
+        sensitivity = solver.analyze_sensitivity(targets, strategy, {**active_map, **{rid: True for rid in candidates}},
+                                                 used, custom_weights, time_limit=baseline_limit)
+    except SolveAbortedError:
+        if deadline.cancelled():
+            raise
+        # Out of time: the ranking below reports every candidate as timed out
+        sensitivity = None
+    reduced = (sensitivity or {}).get('recipe_reduced_costs', {})
+
+    def promise(rid):
+        d = (reduced.get(rid) or {}).get('reduced_cost_per_unit')
+        return (d is None, d if d is not None else 0.0, rid)
+    candidates.sort(key=promise)
+
+    # 2. One sub-problem per candidate, over the closure with every candidate enabled
+    wide_map = {**active_map, **{rid: True for rid in candidates}}
+    _, wide_recipes = get_item_graph(recipes_data, wide_map).closure([t['item'] for t in targets])
+    base_enabled = {rid for rid in wide_recipes if active_map.get(rid, False)}
+    warm_start = {'m_values': baseline['m_values'], 'base_values': baseline['base_values']}
+
+    remaining = max(0.0, time_left())
+    workers = max(1, SOLVER_PARALLEL_WORKERS)
+    per_candidate = max(1, min(DEFAULT_SOLVER_TIME_LIMIT, int(remaining * workers / max(1, len(candidates)))))
+
+    jobs = {}
+    for rid in candidates:
+        recipe_ids = sorted((base_enabled | {rid}) & wide_recipes)
+        recipes_subset = {r: recipes_data[r] for r in recipe_ids}
+        jobs[rid] = (recipes_subset, targets, strategy, weights, per_candidate, gap, warm_start)
+
+    results = _run_jobs(jobs, time_left, deadline)
+
+    # 3. Compare with the baseline
+    base_components = baseline['objective_components']
+    ranking, no_gain, infeasible, timed_out = [], [], [], []
+    for rid in candidates:
+        if rid not in results:
+            timed_out.append(rid)
+            continue
+        solution = results[rid]
+        if solution is None:
+            infeasible.append(rid)
+            continue
+        deltas = {k: base_components[k] - solution['objective_components'].get(k, 0.0) for k in base_components}
+        key = _improvement_key(strategy, weights, base_components, deltas)
+        if key is None:
+            no_gain.append(rid)
+            continue
+        primary = 'weighted' if strategy == 'custom' else get_strategy_priorities(strategy)[0]
+        savings = key[0]
+        reference = _score(strategy, weights, base_components)[0]
+        ranking.append({
+            'recipe_id': rid,
+            'recipe_name': recipes_data[rid].get('name', rid),
+            'objective': primary,
+            'savings': savings,
+            'relative_savings': savings / reference if reference else None,
+            'objective_deltas': deltas,
+            'objective_components': solution['objective_components'],
+            'recipe_used': (solution['m_values'].get(rid) or 0.0) > 1e-9,
+            'proven_optimal': solution['proven_optimal'],
+            '_key': key
+        })
+
+    ranking.sort(key=lambda r: (tuple(-v for v in r['_key']), r['recipe_id']))
+    for rank, entry in enumerate(ranking, start=1):
+        del entry['_key']
+        entry['rank'] = rank
+
+    return {
+        'strategy': strategy,
+        'weights_used': weights,
+        'baseline': {
+            'objective_components': base_components,
+            'proven_optimal': baseline['proven_optimal']
+        },
+        'candidates': len(candidates),
+        'ranking': ranking,
+        'no_gain': no_gain,
+        'infeasible': infeasible,
+        'timed_out': timed_out,
+        'time_limit_per_candidate': per_candidate,
+        'elapsed': time.monotonic() - started
+    }
+
+
+def _evaluate_candidate(recipes_subset: Dict[str, Any], targets: List[Dict[str, Any]], strategy: str,
+                        weights: Dict[str, float], t_limit: float, gap: float,
+                        warm_start: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+    """Solve the plan with one extra recipe enabled (in a pool process, or in-process with a deadline)."""
+    solver = MILPSolver({}, recipes_subset, deadline=deadline)
+    item_graph = ItemGraph(recipes_subset, {rid: True for rid in recipes_subset})
+    needed_items, needed_recipes = item_graph.closure([t['item'] for t in targets])
+    return solver._solve_closure(
+        targets, strategy, weights, needed_items, sorted(needed_recipes),
+        t_limit, gap, item_graph, decompose=False, warm_start=warm_start
+    )
+
+
+def _own_process_group(groups) -> None:
+    """
+    Pool initializer: lead a new process group, so killing the group also stops its CBC
+    runs, and report the group ID to the ranking before taking any job.
+    """
+    os.setsid()
+    groups.put(os.getpgid(0))
+
+
+def _kill_pool(pool: ProcessPoolExecutor, groups) -> None:
+    """Kill the process groups a ranking pool's processes reported, and the CBC runs in them."""
+    while not groups.empty():
+        pgid = groups.get()
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_in_process(jobs: Dict[str, Tuple], time_left: Callable[[], float], deadline: Deadline,
+                    results: Dict[str, Optional[Dict[str, Any]]]) -> None:
+    """Solve the jobs without results one by one, each bounded by the time left."""
+    for rid, job in jobs.items():
+        if rid in results:
+            continue
+        left = time_left()
+        if left <= 0:
+            return
+        try:
+            results[rid] = _evaluate_candidate(*job, deadline=Deadline(left, deadline.cancelled))
+        except SolveAbortedError:
+            if deadline.cancelled():
+                raise
+            return
+
+
+def _run_jobs(jobs: Dict[str, Tuple], time_left: Callable[[], float],
+              deadline: Deadline) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Run candidate solves until all finish or the time runs out; returns finished ones.
+
+    Raises:
+        SolveAbortedError: If the client disconnected (running solves are killed first).
+    """
+    results = {}
+    if SOLVER_PARALLEL_WORKERS <= 1 or len(jobs) <= 1:
+        _run_in_process(jobs, time_left, deadline, results)
+        return results
+
+    context = get_process_context()
+    # Workers report their process groups here; a worker reports before it takes a job
+    groups = context.SimpleQueue()
+    pool = ProcessPoolExecutor(max_workers=min(SOLVER_PARALLEL_WORKERS, len(jobs)), mp_context=context,
+                               initializer=_own_process_group, initargs=(groups,))
+    pending = set()
+    try:
+        futures = {pool.submit(_evaluate_candidate, *job): rid for rid, job in jobs.items()}
+        pending = set(futures)
+        while pending:
+            if deadline.cancelled():
+                raise SolveAbortedError("Client disconnected; ranking abandoned")
+            left = time_left()
+            if left <= 0:
+                break
+            done, pending = wait(pending, timeout=min(left, CANCEL_POLL_INTERVAL), return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+    except BrokenProcessPool:
+        pending = set()
+        _kill_pool(pool, groups)
+        _run_in_process(jobs, time_left, deadline, results)
+    finally:
+        if pending:
+            # Nobody waits for these: stop the running CBC processes now
+            _kill_pool(pool, groups)
+        else:
+            pool.shutdown(wait=False, cancel_futures=True)
+        groups.close()
+    return results
+
+
+def _score(strategy: str, weights: Dict[str, float], components: Dict[str, float]) -> Tuple[float, ...]:
+    """Objective as a tuple: the weighted sum for custom, priority order otherwise."""
+    if strategy == 'custom':
+        return (_weighted(weights, components),)
+    return tuple(components.get(k, 0.0) for k in get_strategy_priorities(strategy))
+
+
+def _weighted(weights: Dict[str, float], components: Dict[str, float]) -> float:
+    """Weighted objective of the custom strategy."""
+    return (weights['base'] * components.get('total_base', 0.0)
+            + weights['base_types'] * components.get('uniq_base_types', 0.0)
+            + weights['machines'] * components.get('machines', 0.0)
+            + weights['recipes'] * components.get('uniq_recipes', 0.0))
+
+
+def _improvement_key(strategy: str, weights: Dict[str, float], base_components: Dict[str, float],
+                     deltas: Dict[str, float]) -> Optional[Tuple[float, ...]]:
+    """
+    Savings per objective level if the candidate improves the plan lexicographically,
+    otherwise None. Changes within IMPACT_TOLERANCE are treated as ties.
+    """
+    base_score = _score(strategy, weights, base_components)
+    cand_score = _score(strategy, weights, {k: base_components[k] - d for k, d in deltas.items()})
+    key = []
+    for base_v, cand_v in zip(base_score, cand_score):
+        diff = base_v - cand_v
+        if abs(diff) <= IMPACT_TOLERANCE * max(1.0, abs(base_v)):
+            diff = 0.0
+        key.append(diff)
+    for diff in key:
+        if diff > 0:
+            return tuple(key)
+        if diff < 0:
+            return None
+    return None
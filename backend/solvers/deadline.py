@@ -0,0 +1,62 @@
+"""
+Request deadlines for Satisfactory Factory Calculator.
+Bounds solver time by what is left of the client's budget and stops work nobody awaits.
+
+A Deadline is created when a request arrives. Solver passes take their time limits from
+``remaining()`` measured at the moment CBC starts, so closure, pruning, queueing and model
+building all count against the budget. ``cancelled()`` reports that the client has gone
+away; running CBC processes are killed when it turns true.
+"""
+
+import time
+from typing import Callable, Optional
+
+# Seconds kept back for building and sending the response
+DEADLINE_MARGIN = 0.5
+# CBC time limits are whole seconds; less than this is not worth starting a pass
+MIN_PASS_SECONDS = 1.0
+
+
+class SolveAbortedError(RuntimeError):
+    """The request's deadline passed or its client disconnected before the solve finished."""
+
+
+class Deadline:
+    """
+    Wall-clock budget of one request, with an optional cancellation check.
+
+    Args:
+        seconds: Budget from now, or None for no deadline
+        is_cancelled: Returns True once the client is gone (polled while CBC runs)
+    """
+
+    def __init__(self, seconds: Optional[float] = None, is_cancelled: Optional[Callable[[], bool]] = None):
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+        self._is_cancelled = is_cancelled
+
+    @property
+    def cancellable(self) -> bool:
+        return self._is_cancelled is not None
+
+    def remaining(self) -> float:
+        """Seconds left for solving (after the response margin); infinite without a deadline."""
+        if self.expires_at is None:
+            return float('inf')
+        return self.expires_at - time.monotonic() - DEADLINE_MARGIN
+
+    def cancelled(self) -> bool:
+        return self._is_cancelled is not None and self._is_cancelled()
+
+    def budget(self, time_limit: float) -> float:
+        """
+        ``time_limit`` cut down to the time left.
+
+        Raises:
+            SolveAbortedError: If the client is gone or less than a pass's worth of time is left.
+        """
+        if self.cancelled():
+            raise SolveAbortedError("Client disconnected; solve abandoned")
+        left = self.remaining()
+        if left < MIN_PASS_SECONDS:
+            raise SolveAbortedError("Request deadline reached before the solve could run")
+        return min(time_limit, left)
@@ -1,87 +1,375 @@
 """
 Dependency graph functionality for the MILP solver.
 Computes the closure of items and recipes needed for a given target item.
+
+The recipe/item relationships are held in an ItemGraph: a bipartite graph with
+edges item -> producing recipe -> ingredient item, built once per active map.
+It provides strongly-connected components, a topological order and cached
+reachability, so closures are plain lookups.
 """
 
-from typing import Set, Tuple, Dict, Any
-from functools import lru_cache
-from ..data import is_base_resource, get_recipes
+import threading
+from collections import OrderedDict
+from typing import Set, Tuple, Dict, Any, List, Iterable, FrozenSet, Callable, Hashable
+from ..data import is_base_resource
+
+# Maximum number of (recipes_data, active_map) graphs kept in memory
+ITEM_GRAPH_CACHE_SIZE = 32
+
+# Maximum number of target-set closures kept per graph (single-item closures included)
+CLOSURE_CACHE_SIZE = 512
+
+# Maximum number of restricted (pruned) graphs kept per graph
+SUBGRAPH_CACHE_SIZE = 32
+
+
+def strongly_connected_components(nodes: Iterable[Hashable],
+                                  successors: Callable[[Hashable], Iterable[Hashable]]) -> List[List[Hashable]]:
+    """
+    Strongly-connected components of a directed graph (iterative Tarjan).
+
+    Args:
+        nodes: All graph nodes, in the order roots should be visited.
+        successors: Function returning the successors of a node.
+
+    Returns:
+        Components in reverse topological order: a component is emitted after every
+        component reachable from it.
+    """
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(successors(root)))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, succ_iter = work[-1]
+            advanced = False
+            for succ in succ_iter:
+                if succ not in index:
+                    index[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(successors(succ))))
+                    advanced = True
+                    break
+                elif succ in on_stack:
+                    lowlink[node] = min(lowlink[node], index[succ])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+class ItemGraph:
+    """
+    Bipartite recipe/item dependency graph for one active recipe map.
+
+    Edges run in the demand direction: an item points to every active recipe that
+    produces it, and a recipe points to each of its ingredients. Base resources
+    are never expanded.
+    """
+
+    def __init__(self, recipes_data: Dict[str, Any], active_map: Dict[str, bool] = None):
+        if active_map is None:
+            active_map = {}
+
+        self.recipes = recipes_data
+        self.active_recipe_ids = frozenset(rid for rid in recipes_data if active_map.get(rid, False))
+
+        # item -> producing recipes, recipe -> ingredient items
+        producers: Dict[str, List[str]] = {}
+        ingredients: Dict[str, Tuple[str, ...]] = {}
+        items = set()
+
+        for rid, rec in recipes_data.items():
+            if rid not in self.active_recipe_ids:
+                continue
+            ingredients[rid] = tuple(dict.fromkeys(ing['item'] for ing in rec.get('ingredients', [])))
+            items.update(ingredients[rid])
+            for p in rec.get('products', []):
+                items.add(p['item'])
+                if not is_base_resource(p['item']):
+                    producers.setdefault(p['item'], [])
+                    if rid not in producers[p['item']]:
+                        producers[p['item']].append(rid)
+
+        self._producers = {iid: tuple(rids) for iid, rids in producers.items()}
+        self._ingredients = ingredients
+        self._items = items
+        self._closure_cache: "OrderedDict[FrozenSet[str], Tuple[FrozenSet[str], FrozenSet[str]]]" = OrderedDict()
+        self._subgraph_cache: "OrderedDict[FrozenSet[str], ItemGraph]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._compute_sccs()
+
+    # ------------------------------------------------------------------
+    # Adjacency
+    # ------------------------------------------------------------------
+
+    def producers(self, item_id: str) -> Tuple[str, ...]:
+        """Active recipes that produce an item (empty for base resources)."""
+        return self._producers.get(item_id, ())
+
+    def ingredients(self, recipe_id: str) -> Tuple[str, ...]:
+        """Distinct ingredient items of an active recipe."""
+        return self._ingredients.get(recipe_id, ())
+
+    def _successors(self, node: Tuple[str, str]) -> Iterable[Tuple[str, str]]:
+        kind, key = node
+        if kind == 'i':
+            return (('r', rid) for rid in self._producers.get(key, ()))
+        return (('i', iid) for iid in self._ingredients.get(key, ()))
+
+    # ------------------------------------------------------------------
+    # Strongly-connected components
+    # ------------------------------------------------------------------
+
+    def _compute_sccs(self) -> None:
+        nodes = [('i', iid) for iid in sorted(self._items)] + [('r', rid) for rid in sorted(self._ingredients)]
+        components = strongly_connected_components(nodes, self._successors)
+
+        # Tarjan emits components producers-first; reverse for demand (consumer-first) order
+        components.reverse()
+
+        self._component_of: Dict[Tuple[str, str], int] = {}
+        self.sccs: List[Tuple[FrozenSet[str], FrozenSet[str]]] = []
+        self._cyclic_components = set()
+
+        for idx, component in enumerate(components):
+            comp_items = frozenset(key for kind, key in component if kind == 'i')
+            comp_recipes = frozenset(key for kind, key in component if kind == 'r')
+            self.sccs.append((comp_items, comp_recipes))
+            for node in component:
+                self._component_of[node] = idx
+
+            # Any cycle spans at least one item and one recipe, so singletons are acyclic
+            if len(component) > 1:
+                self._cyclic_components.add(idx)
+
+    def topological_order(self) -> List[int]:
+        """SCC indices in demand order: every component comes before the components it depends on."""
+        return list(range(len(self.sccs)))
+
+    def item_component(self, item_id: str) -> int:
+        """SCC index of an item, or -1 if the item is not in the graph."""
+        return self._component_of.get(('i', item_id), -1)
+
+    def recipe_component(self, recipe_id: str) -> int:
+        """SCC index of an active recipe, or -1 if the recipe is not in the graph."""
+        return self._component_of.get(('r', recipe_id), -1)
+
+    def cyclic_components(self, recipe_ids: Iterable[str]) -> List[Tuple[FrozenSet[str], FrozenSet[str]]]:
+        """Cyclic SCCs (as (items, recipes) pairs) that contain any of the given recipes."""
+        indices = sorted({self.recipe_component(rid) for rid in recipe_ids} & self._cyclic_components)
+        return [self.sccs[idx] for idx in indices]
+
+    def has_cycles(self, recipe_ids: Iterable[str]) -> bool:
+        """Check if any of the given recipes sits on a dependency cycle."""
+        return any(self.recipe_component(rid) in self._cyclic_components for rid in recipe_ids)
+
+    def topological_items(self, item_ids: Iterable[str]) -> List[str]:
+        """Order items so that each item comes before every item it (transitively) depends on."""
+        return sorted(item_ids, key=lambda iid: (self.item_component(iid), iid))
+
+    def independent_blocks(self, recipe_ids: Iterable[str], couple_base: bool = False) -> List[Tuple[FrozenSet[str], FrozenSet[str]]]:
+        """
+        Partition recipes into blocks that share no non-base item (as ingredient or product).
+
+        Args:
+            recipe_ids: Recipes to partition (usually a closure).
+            couple_base: Also join blocks that consume a common base resource.
+
+        Returns:
+            List of (items, recipes) pairs, largest block first.
+        """
+        recipe_ids = sorted(recipe_ids)
+        parent = {rid: rid for rid in recipe_ids}
+
+        def find(rid):
+            while parent[rid] != rid:
+                parent[rid] = parent[parent[rid]]
+                rid = parent[rid]
+            return rid
+
+        owner = {}
+        recipe_items = {}
+        for rid in recipe_ids:
+            rec = self.recipes[rid]
+            touched = {ing['item'] for ing in rec.get('ingredients', [])} | {p['item'] for p in rec.get('products', [])}
+            recipe_items[rid] = touched
+            for iid in touched:
+                if is_base_resource(iid) and not couple_base:
+                    continue
+                if iid in owner:
+                    root_a, root_b = find(owner[iid]), find(rid)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+                else:
+                    owner[iid] = rid
+
+        grouped: Dict[str, Tuple[set, set]] = {}
+        for rid in recipe_ids:
+            items, recipes = grouped.setdefault(find(rid), (set(), set()))
+            recipes.add(rid)
+            items |= recipe_items[rid]
+
+        blocks = [(frozenset(items), frozenset(recipes)) for items, recipes in grouped.values()]
+        blocks.sort(key=lambda block: (-len(block[1]), min(block[1])))
+        return blocks
+
+    # ------------------------------------------------------------------
+    # Reachability
+    # ------------------------------------------------------------------
+
+    def closure(self, target_items: Iterable[str]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Items and active recipes reachable from the target items.
+        Results are cached per target set, least recently used first out.
+        """
+        key = frozenset(target_items)
+        with self._lock:
+            cached = self._closure_cache.get(key)
+            if cached is not None:
+                self._closure_cache.move_to_end(key)
+                return cached
+
+        if len(key) > 1:
+            # Union of the (cached) single-target closures
+            items = set()
+            recipes = set()
+            for target in key:
+                t_items, t_recipes = self.closure([target])
+                items |= t_items
+                recipes |= t_recipes
+        else:
+            items = set(key)
+            recipes = set()
+            stack = list(key)
+            while stack:
+                itm = stack.pop()
+                for rid in self._producers.get(itm, ()):
+                    if rid in recipes:
+                        continue
+                    recipes.add(rid)
+                    for ing in self._ingredients[rid]:
+                        if ing not in items:
+                            items.add(ing)
+                            stack.append(ing)
+
+        result = (frozenset(items), frozenset(recipes))
+        with self._lock:
+            self._closure_cache[key] = result
+            while len(self._closure_cache) > CLOSURE_CACHE_SIZE:
+                self._closure_cache.popitem(last=False)
+        return result
+
+
+    def restricted(self, recipe_ids: Iterable[str]) -> "ItemGraph":
+        """
+        Graph over a subset of this graph's active recipes (e.g. a pruned closure).
+        Cached per recipe set on this graph, least recently used first out, so the
+        subgraph keeps its own closure and SCC caches between requests.
+        """
+        key = frozenset(recipe_ids)
+        if key == self.active_recipe_ids:
+            return self
+        with self._lock:
+            graph = self._subgraph_cache.get(key)
+            if graph is not None:
+                self._subgraph_cache.move_to_end(key)
+                return graph
+
+        graph = ItemGraph(self.recipes, {rid: True for rid in key})
+        with self._lock:
+            self._subgraph_cache[key] = graph
+            while len(self._subgraph_cache) > SUBGRAPH_CACHE_SIZE:
+                self._subgraph_cache.popitem(last=False)
+        return graph
+
+
+_graph_cache: "OrderedDict[Tuple[int, FrozenSet[str]], ItemGraph]" = OrderedDict()
+_graph_cache_lock = threading.Lock()
+
+
+def get_item_graph(recipes_data: Dict[str, Any], active_map: Dict[str, bool] = None) -> ItemGraph:
+    """
+    Get the ItemGraph for a recipe dictionary and active map, building it on first use.
+    Graphs are cached per (recipes_data, enabled recipe set).
+    """
+    if active_map is None:
+        active_map = {}
+    key = (id(recipes_data), frozenset(rid for rid, enabled in active_map.items() if enabled and rid in recipes_data))
+
+    with _graph_cache_lock:
+        graph = _graph_cache.get(key)
+        # Guard against id() reuse by a different recipe dictionary
+        if graph is not None and graph.recipes is recipes_data:
+            _graph_cache.move_to_end(key)
+            return graph
+
+    graph = ItemGraph(recipes_data, active_map)
+    with _graph_cache_lock:
+        _graph_cache[key] = graph
+        while len(_graph_cache) > ITEM_GRAPH_CACHE_SIZE:
+            _graph_cache.popitem(last=False)
+    return graph
+
 
 def dependency_closure_recipes(target_item: str, recipes_data: Dict[str, Any], active_map: Dict[str, bool] = None) -> Tuple[Set[str], Set[str]]:
     """
     Compute dependency closure of items and recipes for a target item.
     Prunes based on active recipes provided in active_map.
-    
+
     Args:
         target_item: The ID of the item to produce.
         recipes_data: Total recipe dictionary (from data layer).
         active_map: Map of recipe_id -> boolean indicating if recipe is enabled.
-        
+
     Returns:
         Tuple of (needed_items_set, needed_recipes_set).
     """
-    if active_map is None:
-        # If no map provided, we assume we might want to consider all recipes 
-        # but usually the solver will provide a map from its state.
-        active_map = {}
-
-    needed_items = set()
-    needed_recipes = set()
-    stack = [target_item]
-    
-    # Safeguard against circular dependencies or extremely deep trees
-    depth_guard = 0
-    max_depth = 10000
-    
-    while stack and depth_guard < max_depth:
-        depth_guard += 1
-        itm = stack.pop()
-        
-        if itm in needed_items:
-            continue
-            
-        needed_items.add(itm)
-        
-        if is_base_resource(itm):
-            continue
-            
-        for r_id, r in recipes_data.items():
-            # Only consider recipes that are active
-            if not active_map.get(r_id, False):
-                continue
-                
-            # Check if this recipe produces the item
-            produces = any(p['item'] == itm for p in r.get('products', []))
-            if not produces:
-                continue
-                
-            needed_recipes.add(r_id)
-            
-            # Add all ingredients to stack to explore their dependencies
-            for ing in r.get('ingredients', []):
-                stack.append(ing['item'])
-                
-    return needed_items, needed_recipes
+    items, recipes = get_item_graph(recipes_data, active_map).closure([target_item])
+    return set(items), set(recipes)
 
 
 def dependency_closure_multi(target_items: list, recipes_data: Dict[str, Any], active_map: Dict[str, bool] = None) -> Tuple[Set[str], Set[str]]:
     """
     Compute union of dependency closures for multiple target items.
-    
+
     Args:
         target_items: List of item IDs to produce.
         recipes_data: Total recipe dictionary.
         active_map: Map of recipe_id -> boolean indicating if recipe is enabled.
-        
+
     Returns:
         Tuple of (needed_items_set, needed_recipes_set).
     """
-    all_items = set()
-    all_recipes = set()
-    
-    for item in target_items:
-        items, recipes = dependency_closure_recipes(item, recipes_data, active_map)
-        all_items |= items
-        all_recipes |= recipes
-        
-    return all_items, all_recipes
+    items, recipes = get_item_graph(recipes_data, active_map).closure(target_items)
+    return set(items), set(recipes)
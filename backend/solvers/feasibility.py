@@ -0,0 +1,226 @@
+"""
+Feasibility pre-checks for Satisfactory Factory Calculator.
+Cheap graph-based tests that reject impossible requests before a model is built.
+
+Missing producers are found on the closure: an item with no active recipe (other than a
+base resource) is blocked, a recipe with a blocked ingredient is blocked, and an item whose
+every producer is blocked is blocked too. Only chains that end at a missing producer are
+flagged; items that are merely part of a loop are left to the solver.
+
+Resource caps are checked against lower bounds on base-resource use. For each capped
+resource, every item gets a price ``L(i)`` with ``sum(out * L) <= sum(in * L)`` for every
+active recipe (base resources priced 1 for the resource itself, 0 otherwise). By weak
+duality, any plan then uses at least ``sum(demand * L)`` of that resource. Prices are
+propagated producers-first over the recipe graph's strongly-connected components; a
+recipe's input cost is shared evenly across all units it outputs, which keeps the bound
+valid when byproducts are used elsewhere.
+"""
+
+from typing import Dict, Any, List, Iterable, Optional, Set, Tuple
+
+from ..data.base_resources import is_base_resource
+from .dependency_graph import ItemGraph
+
+# Relaxation rounds for cyclic components before falling back to a zero bound
+MAX_BOUND_ROUNDS = 100
+BOUND_TOLERANCE = 1e-9
+
+
+class InfeasibleRequestError(ValueError):
+    """A request that cannot be satisfied, with structured ``details`` for the client."""
+
+    def __init__(self, message: str, details: Optional[List[Dict[str, Any]]] = None):
+        super().__init__(message)
+        self.details = details or []
+
+
+def blocked_closure(item_graph: ItemGraph, recipes_data: Dict[str, Any],
+                    needed_items: Iterable[str]) -> Tuple[Set[str], Set[str], Set[str]]:
+    """
+    Items and recipes of a closure that depend on an item nothing produces.
+
+    Returns:
+        Tuple of (missing items, blocked items, blocked recipes). Missing items are the
+        non-base items with no active producer; blocked recipes can never run.
+    """
+    needed_items = set(needed_items)
+    missing = {iid for iid in needed_items if not is_base_resource(iid) and not item_graph.producers(iid)}
+    if not missing:
+        return missing, set(), set()
+
+    # Reverse edges inside the closure: ingredient -> recipes using it, recipe -> products
+    consumers: Dict[str, List[str]] = {}
+    live_producers: Dict[str, int] = {}
+    for iid in needed_items:
+        rids = item_graph.producers(iid)
+        live_producers[iid] = len(rids)
+        for rid in rids:
+            for ing in item_graph.ingredients(rid):
+                consumers.setdefault(ing, []).append(rid)
+
+    blocked_items = set(missing)
+    blocked_recipes = set()
+    stack = list(missing)
+    while stack:
+        iid = stack.pop()
+        for rid in consumers.get(iid, ()):
+            if rid in blocked_recipes:
+                continue
+            blocked_recipes.add(rid)
+            for p in recipes_data[rid].get('products', []):
+                out = p['item']
+                if out not in live_producers or out in blocked_items or is_base_resource(out):
+                    continue
+                live_producers[out] -= 1
+                if live_producers[out] == 0:
+                    blocked_items.add(out)
+                    stack.append(out)
+    return missing, blocked_items, blocked_recipes
+
+
+def check_producible(targets: List[Dict[str, Any]], item_graph: ItemGraph,
+                     recipes_data: Dict[str, Any], needed_items: Iterable[str]) -> None:
+    """
+    Raise InfeasibleRequestError if a target can only be made through an item nothing produces.
+
+    Details list {"item", "needed_for", "disabled_producers"} for each missing item, where
+    ``disabled_producers`` are recipes in the data that would produce it if enabled.
+    """
+    missing, blocked_items, _ = blocked_closure(item_graph, recipes_data, needed_items)
+    if not missing:
+        return
+
+    blocked_targets = [t['item'] for t in targets if t['item'] in blocked_items]
+    if not blocked_targets:
+        return
+
+    # Missing items each blocked target depends on, following blocked recipes only
+    needed_for: Dict[str, List[str]] = {}
+    for target in blocked_targets:
+        seen = {target}
+        stack = [target]
+        while stack:
+            iid = stack.pop()
+            if iid in missing:
+                needed_for.setdefault(iid, []).append(target)
+                continue
+            for rid in item_graph.producers(iid):
+                for ing in item_graph.ingredients(rid):
+                    if ing in blocked_items and ing not in seen:
+                        seen.add(ing)
+                        stack.append(ing)
+
+    details = []
+    for iid in sorted(needed_for):
+        disabled = sorted(
+            rid for rid, rec in recipes_data.items()
+            if rid not in item_graph.active_recipe_ids
+            and any(p['item'] == iid for p in rec.get('products', []))
+        )
+        details.append({'item': iid, 'needed_for': needed_for[iid], 'disabled_producers': disabled})
+    raise InfeasibleRequestError(
+        f"No active recipes available to produce: {', '.join(sorted(needed_for))} "
+        f"(needed for {', '.join(blocked_targets)})",
+        details
+    )
+
+
+def base_lower_bounds(targets: List[Dict[str, Any]], recipes_data: Dict[str, Any],
+                      item_graph: ItemGraph, resources: Iterable[str]) -> Dict[str, float]:
+    """
+    Lower bound on the use of each given base resource by any plan meeting the targets.
+
+    Items with no active production chain get no price; if a target is one of them the
+    bound for that target is skipped (the solver reports it as infeasible).
+
+    Returns:
+        Base item ID -> minimum use per minute.
+    """
+    resources = sorted(set(resources))
+    if not resources:
+        return {}
+    zero = [0.0] * len(resources)
+    prices: Dict[str, List[float]] = {}
+
+    def price(item_id):
+        if is_base_resource(item_id):
+            return [1.0 if item_id == b else 0.0 for b in resources]
+        return prices.get(item_id)
+
+    def recipe_price(rid):
+        """Input cost of a recipe per unit of output, or None if an input has no price yet."""
+        rec = recipes_data[rid]
+        total_out = sum(p['amount'] for p in rec.get('products', []))
+        if total_out <= 0:
+            return None
+        cost = list(zero)
+        for ing in rec.get('ingredients', []):
+            ing_price = price(ing['item'])
+            if ing_price is None:
+                return None
+            for k, v in enumerate(ing_price):
+                cost[k] += ing['amount'] * v
+        return [c / total_out for c in cost]
+
+    def relax(item_id):
+        """Lower an item's price to its cheapest producer; returns True on change."""
+        changed = False
+        for rid in item_graph.producers(item_id):
+            candidate = recipe_price(rid)
+            if candidate is None:
+                continue
+            current = prices.get(item_id)
+            if current is None:
+                prices[item_id] = candidate
+                changed = True
+                continue
+            lowered = [min(c, n) for c, n in zip(current, candidate)]
+            if any(c - n > BOUND_TOLERANCE for c, n in zip(current, lowered)):
+                prices[item_id] = lowered
+                changed = True
+        return changed
+
+    # SCCs come consumers-first; walk them producers-first
+    for items, recipes in reversed(item_graph.sccs):
+        pending = sorted(iid for iid in items if not is_base_resource(iid))
+        if not recipes:
+            for item_id in pending:
+                relax(item_id)
+            continue
+        for _ in range(MAX_BOUND_ROUNDS):
+            if not any([relax(item_id) for item_id in pending]):
+                break
+        else:
+            # Prices still falling around a loop: zero is always a valid price
+            for item_id in pending:
+                prices[item_id] = list(zero)
+
+    bounds = dict.fromkeys(resources, 0.0)
+    for t in targets:
+        target_price = price(t['item'])
+        if target_price is None:
+            continue
+        for k, b in enumerate(resources):
+            bounds[b] += t['amount'] * target_price[k]
+    return bounds
+
+
+def check_resource_limits(targets: List[Dict[str, Any]], recipes_data: Dict[str, Any],
+                          item_graph: ItemGraph, resource_limits: Dict[str, float]) -> None:
+    """
+    Raise InfeasibleRequestError if some capped resource is certainly overdrawn.
+
+    Details list {"resource", "required_at_least", "limit"} for each such resource.
+    """
+    if not resource_limits:
+        return
+    bounds = base_lower_bounds(targets, recipes_data, item_graph, resource_limits)
+    over = [
+        {'resource': iid, 'required_at_least': bounds[iid], 'limit': resource_limits[iid]}
+        for iid in sorted(bounds)
+        if bounds[iid] > resource_limits[iid] * (1 + 1e-7) + BOUND_TOLERANCE
+    ]
+    if over:
+        names = ', '.join(f"{d['resource']} (needs at least {d['required_at_least']:.4g}/min, "
+                          f"limit {d['limit']:.4g}/min)" for d in over)
+        raise InfeasibleRequestError(f"Resource limits cannot be met: {names}", over)
@@ -0,0 +1,98 @@
+"""
+Flow routing for Satisfactory Factory Calculator.
+Turns the solved per-node input/output rates into explicit producer -> consumer edges.
+
+For each item, consumer demands (recipe inputs plus the requested target amount) are
+matched against producer outputs with a greedy pass: a demand is served by the single
+producer with the least remaining output that still covers it (best fit), and only
+split across producers, largest first, when none can. Every step exhausts a demand or a
+producer, so an item with P producers and C consumers yields at most P + C - 1 edges.
+"""
+
+from collections import defaultdict
+from typing import Dict, Any, List, Tuple
+from ..utils.math_helpers import round_to_precision
+
+# Node IDs used for the sinks of target and surplus flows
+TARGET_SINK_PREFIX = 'target_'
+SURPLUS_SINK_PREFIX = 'surplus_'
+
+# Rates below this are treated as rounding noise
+FLOW_EPSILON = 1e-4
+
+
+def route_flows(recipe_nodes: Dict[str, Dict[str, Any]],
+                targets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Assign each consumer's inputs to producers of the same item.
+
+    Args:
+        recipe_nodes: Graph nodes with ``inputs``/``outputs`` rate maps.
+        targets: List of targets [{"item": str, "amount": float}, ...]
+
+    Returns:
+        List of edges {"source", "target", "item", "rate"}. Target amounts flow into
+        ``target_<item>`` sinks and leftover production into ``surplus_<item>`` sinks.
+    """
+    supplies: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
+    demands: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
+
+    for node_id, node in recipe_nodes.items():
+        if node.get('is_end_product_node') or node.get('is_surplus_node'):
+            continue
+        for item_id, rate in node.get('outputs', {}).items():
+            if rate and rate > FLOW_EPSILON:
+                supplies[item_id].append((node_id, rate))
+        for item_id, rate in node.get('inputs', {}).items():
+            if rate and rate > FLOW_EPSILON:
+                demands[item_id].append((node_id, rate))
+
+    target_amounts = defaultdict(float)
+    for t in targets:
+        target_amounts[t['item']] += t['amount']
+    for item_id, amount in target_amounts.items():
+        if amount > FLOW_EPSILON:
+            demands[item_id].append((f"{TARGET_SINK_PREFIX}{item_id}", amount))
+
+    edges = []
+    for item_id in sorted(supplies):
+        edges.extend(_route_item(item_id, supplies[item_id], demands.get(item_id, [])))
+    return edges
+
+
+def _route_item(item_id: str, supplies: List[Tuple[str, float]],
+                demands: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
+    """Greedy best-fit assignment of one item's producers to its consumers."""
+    remaining = {node_id: rate for node_id, rate in supplies}
+    flows = defaultdict(float)
+
+    # Largest demands first: they are the hardest to serve from a single producer
+    for consumer, need in sorted(demands, key=lambda d: (-d[1], d[0])):
+        while need > FLOW_EPSILON:
+            open_producers = [(rate, node_id) for node_id, rate in remaining.items()
+                              if rate > FLOW_EPSILON and node_id != consumer]
+            if not open_producers:
+                break
+            covering = [p for p in open_producers if p[0] >= need - FLOW_EPSILON]
+            if covering:
+                rate, producer = min(covering)
+            else:
+                rate, producer = max(open_producers)
+            taken = min(rate, need)
+            flows[(producer, consumer)] += taken
+            remaining[producer] = rate - taken
+            need -= taken
+
+    edges = [
+        {'source': producer, 'target': consumer, 'item': item_id, 'rate': round_to_precision(rate)}
+        for (producer, consumer), rate in flows.items()
+    ]
+    for producer, rate in remaining.items():
+        if rate > FLOW_EPSILON:
+            edges.append({
+                'source': producer,
+                'target': f"{SURPLUS_SINK_PREFIX}{item_id}",
+                'item': item_id,
+                'rate': round_to_precision(rate)
+            })
+    return edges
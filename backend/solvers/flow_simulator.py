@@ -0,0 +1,383 @@
+"""
+Planner flow simulation for Satisfactory Factory Calculator.
+Computes the steady-state throughput of a hand-built planner graph.
+
+The model matches the planner UI: resource nodes emit their configured rate, each output
+port serves locked (manual) edges first and water-fills the rest up to each consumer's
+intake, and a recipe node runs at the fraction of capacity its scarcest ingredient allows.
+
+Nodes are visited once in topological order of their strongly-connected components, so
+acyclic parts are settled in a single sweep. Within a loop every rate is linear in the
+members' throughputs once it is known which ingredient binds each node and which edges
+are capped, so a loop is solved as (I - A)t = b, starting from zero throughput and
+re-solving whenever the solution lands in a different regime. Loops whose system is
+singular, or whose regime does not settle, are iterated from zero until their flows stop
+changing (the least fixpoint) and counted in ``iterated_loops``.
+"""
+
+from collections import defaultdict
+from typing import Dict, Any, List, Tuple, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .dependency_graph import strongly_connected_components
+
+# Convergence tolerance and iteration cap for loops
+FLOW_TOLERANCE = 1e-9
+MAX_LOOP_ITERATIONS = 10000
+# Regime changes tried per loop, and the condition number above which (I - A) is singular
+MAX_LINEAR_ROUNDS = 50
+MAX_CONDITION = 1e12
+
+# Default output of a resource node without an explicit rate (items/min)
+DEFAULT_RESOURCE_RATE = 60.0
+
+
+def simulate_flows(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]],
+                   recipes_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute edge flows and node rates for a planner graph.
+
+    Args:
+        nodes: Planner nodes {"id", "data": {"recipeId", "efficiency", "machineCount",
+               "isResource", "resourceId", "outputRate"}}.
+        edges: Planner edges {"id", "source", "target", "sourceHandle", "data": {"manualFlow"}}.
+               ``sourceHandle`` is the item ID carried by the edge.
+        recipes_data: Recipe dictionary (from data layer).
+
+    Returns:
+        Dict with "nodes" (node_id -> inputs, outputs, theoretical_outputs, throughput,
+        bottlenecks), "edges" (edge_id -> flow), "converged", "loop_iterations" and
+        "iterated_loops" (loops that fell back to iteration).
+    """
+    node_data = {n['id']: (n.get('data') or {}) for n in nodes}
+    node_ids = list(node_data)
+
+    # Output ports: (source, item) -> edges in request order
+    ports: Dict[str, Dict[str, List[Dict[str, Any]]]] = defaultdict(lambda: defaultdict(list))
+    successors: Dict[str, List[str]] = defaultdict(list)
+    for edge in edges:
+        source, target, item_id = edge.get('source'), edge.get('target'), edge.get('sourceHandle')
+        if source not in node_data or not item_id:
+            continue
+        ports[source][item_id].append(edge)
+        if target in node_data:
+            successors[source].append(target)
+
+    capacities = {nid: _node_capacity(data, recipes_data) for nid, data in node_data.items()}
+
+    # Tarjan emits downstream components first; reverse for a source-first sweep
+    components = strongly_connected_components(node_ids, lambda nid: successors.get(nid, ()))
+    components.reverse()
+
+    received: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    results: Dict[str, Dict[str, Any]] = {}
+    flows: Dict[str, float] = {}
+    converged = True
+    loop_iterations = 0
+    iterated_loops = 0
+
+    for component in components:
+        is_loop = len(component) > 1 or component[0] in successors.get(component[0], ())
+        if not is_loop:
+            nid = component[0]
+            results[nid] = _run_node(capacities[nid], received[nid])
+            flows.update(_distribute(ports.get(nid, {}), results[nid]['outputs'], capacities, received))
+            continue
+
+        members = set(component)
+        # Targets fed by this loop; their intake is re-evaluated on every pass
+        touched = {e['target'] for nid in component for port in ports.get(nid, {}).values() for e in port}
+        baseline = {t: dict(received[t]) for t in touched | members}
+
+        throughputs, rounds = _solve_loop(component, ports, capacities, baseline)
+        loop_iterations += rounds
+        if throughputs is not None:
+            loop_iterations += 1
+            outputs = {nid: {item_id: rate * throughputs[nid] for item_id, rate in capacities[nid]['output'].items()}
+                       for nid in component}
+            pass_received, pass_flows, pass_results = _loop_pass(component, ports, capacities, baseline, outputs)
+        else:
+            iterated_loops += 1
+            outputs = {nid: {} for nid in component}
+            for iteration in range(MAX_LOOP_ITERATIONS):
+                loop_iterations += 1
+                pass_received, pass_flows, pass_results = _loop_pass(
+                    component, ports, capacities, baseline, outputs
+                )
+                delta = _output_delta(component, pass_results, outputs)
+                outputs = {nid: pass_results[nid]['outputs'] for nid in component}
+                if delta <= FLOW_TOLERANCE:
+                    break
+            else:
+                converged = False
+
+        results.update(pass_results)
+        flows.update(pass_flows)
+        for t in touched | members:
+            received[t] = pass_received[t]
+
+    for nid in node_ids:
+        results[nid]['inputs'] = {k: v for k, v in received[nid].items() if v > 0}
+
+    return {
+        'nodes': results,
+        'edges': {e['id']: flows.get(e['id'], 0.0) for e in edges if 'id' in e},
+        'converged': converged,
+        'loop_iterations': loop_iterations,
+        'iterated_loops': iterated_loops
+    }
+
+
+def _loop_pass(component: List[str], ports: Dict[str, Dict[str, List[Dict[str, Any]]]],
+               capacities: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, float]],
+               outputs: Dict[str, Dict[str, Any]]) -> Tuple[Dict, Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """Distribute the loop members' outputs once and re-run the members on what they receive."""
+    pass_received = defaultdict(lambda: defaultdict(float))
+    for t, items in baseline.items():
+        pass_received[t].update(items)
+
+    pass_flows = {}
+    for nid in component:
+        pass_flows.update(_distribute(ports.get(nid, {}), outputs[nid], capacities, pass_received))
+
+    pass_results = {nid: _run_node(capacities[nid], pass_received[nid]) for nid in component}
+    return pass_received, pass_flows, pass_results
+
+
+def _output_delta(component: List[str], pass_results: Dict[str, Dict[str, Any]],
+                  outputs: Dict[str, Dict[str, Any]]) -> float:
+    """Largest change of any member output between two passes."""
+    return max(
+        (abs(float(rate) - float(outputs[nid].get(item_id, 0.0)))
+         for nid in component for item_id, rate in pass_results[nid]['outputs'].items()),
+        default=0.0
+    )
+
+
+def _solve_loop(component: List[str], ports: Dict[str, Dict[str, List[Dict[str, Any]]]],
+                capacities: Dict[str, Dict[str, Any]],
+                baseline: Dict[str, Dict[str, float]]) -> Tuple[Optional[Dict[str, float]], int]:
+    """
+    Solve a loop's throughputs directly.
+
+    Each round runs one pass with the throughputs as affine unknowns; the pass picks the
+    binding ingredients and capped edges at the current point and yields t = A t + b for
+    that regime. The solution is accepted once a pass at it reproduces it; a solution
+    outside 0-1 is replaced by the pass's own throughputs.
+
+    Returns:
+        (node_id -> throughput, or None if the loop must be iterated; rounds spent)
+    """
+    if not NUMPY_AVAILABLE:
+        return None, 0
+
+    index = {nid: i for i, nid in enumerate(component)}
+    size = len(component)
+    point = np.zeros(size)
+
+    for rounds in range(1, MAX_LINEAR_ROUNDS + 1):
+        unknowns = {nid: _Affine.unknown(point, index[nid]) for nid in component}
+        outputs = {nid: {item_id: rate * unknowns[nid] for item_id, rate in capacities[nid]['output'].items()}
+                   for nid in component}
+        _, _, pass_results = _loop_pass(component, ports, capacities, baseline, outputs)
+        if _output_delta(component, pass_results, outputs) <= FLOW_TOLERANCE:
+            return {nid: float(point[index[nid]]) for nid in component}, rounds
+
+        a = np.zeros((size, size))
+        b = np.zeros(size)
+        for nid in component:
+            throughput = pass_results[nid]['throughput']
+            if isinstance(throughput, _Affine):
+                a[index[nid]] = throughput.coeffs[:-1]
+                b[index[nid]] = throughput.coeffs[-1]
+            else:
+                b[index[nid]] = throughput
+
+        system = np.eye(size) - a
+        if np.linalg.cond(system) > MAX_CONDITION:
+            return None, rounds
+        solution = np.linalg.solve(system, b)
+        if np.all((solution >= -FLOW_TOLERANCE) & (solution <= 1.0 + FLOW_TOLERANCE)):
+            point = np.clip(solution, 0.0, 1.0)
+        else:
+            # Out of range (e.g. an amplifying loop): take one ordinary pass towards saturation
+            point = np.array([float(pass_results[nid]['throughput']) for nid in component])
+
+    return None, MAX_LINEAR_ROUNDS
+
+
+class _Affine:
+    """
+    A rate that is affine in a loop's throughputs, with its value at the current point.
+    Comparisons use the value, so min/max and the water-fill pick the regime there.
+    ``coeffs`` holds one coefficient per loop member followed by the constant term.
+    """
+
+    __slots__ = ('value', 'coeffs')
+
+    def __init__(self, value: float, coeffs: Any):
+        self.value = value
+        self.coeffs = coeffs
+
+    @classmethod
+    def unknown(cls, point: Any, i: int) -> '_Affine':
+        coeffs = np.zeros(len(point) + 1)
+        coeffs[i] = 1.0
+        return cls(float(point[i]), coeffs)
+
+    def _coerce(self, other: Any) -> '_Affine':
+        if isinstance(other, _Affine):
+            return other
+        coeffs = np.zeros(len(self.coeffs))
+        coeffs[-1] = other
+        return _Affine(float(other), coeffs)
+
+    def __add__(self, other: Any) -> '_Affine':
+        other = self._coerce(other)
+        return _Affine(self.value + other.value, self.coeffs + other.coeffs)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> '_Affine':
+        other = self._coerce(other)
+        return _Affine(self.value - other.value, self.coeffs - other.coeffs)
+
+    def __rsub__(self, other: Any) -> '_Affine':
+        return self._coerce(other) - self
+
+    def __mul__(self, factor: float) -> '_Affine':
+        return _Affine(self.value * factor, self.coeffs * factor)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor: float) -> '_Affine':
+        return _Affine(self.value / divisor, self.coeffs / divisor)
+
+    def __float__(self) -> float:
+        return self.value
+
+    def __lt__(self, other: Any) -> bool:
+        return self.value < float(other)
+
+    def __le__(self, other: Any) -> bool:
+        return self.value <= float(other)
+
+    def __gt__(self, other: Any) -> bool:
+        return self.value > float(other)
+
+    def __ge__(self, other: Any) -> bool:
+        return self.value >= float(other)
+
+
+def _node_capacity(data: Dict[str, Any], recipes_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-minute ingredient intake and product output of a node running at 100%."""
+    if data.get('isResource') and data.get('resourceId'):
+        rate = data.get('outputRate') or DEFAULT_RESOURCE_RATE
+        return {'resource': True, 'intake': {}, 'output': {data['resourceId']: float(rate)}}
+
+    recipe = recipes_data.get(data.get('recipeId') or '')
+    if recipe is None:
+        return {'resource': False, 'recipe': False, 'intake': {}, 'output': {}}
+
+    scale = (60.0 / (recipe.get('time', 1.0) or 1.0)
+             * (data.get('efficiency') or 100) / 100.0
+             * (data.get('machineCount') or 1))
+    intake = defaultdict(float)
+    for ing in recipe.get('ingredients', []):
+        intake[ing['item']] += ing['amount'] * scale
+    output = defaultdict(float)
+    for p in recipe.get('products', []):
+        output[p['item']] += p['amount'] * scale
+    return {'resource': False, 'recipe': True, 'intake': dict(intake), 'output': dict(output)}
+
+
+def _run_node(capacity: Dict[str, Any], inputs: Dict[str, float]) -> Dict[str, Any]:
+    """Throughput, outputs and under-supplied ingredients of a node for the given inputs."""
+    if capacity['resource']:
+        throughput = 1.0
+        bottlenecks = []
+    elif not capacity.get('recipe'):
+        return {'outputs': {}, 'theoretical_outputs': {}, 'throughput': 0.0, 'bottlenecks': []}
+    else:
+        factors = {
+            item_id: inputs.get(item_id, 0.0) / required
+            for item_id, required in capacity['intake'].items() if required > 0
+        }
+        throughput = min(1.0, min(factors.values(), default=1.0))
+        bottlenecks = sorted(item_id for item_id, f in factors.items() if f < 1.0 - FLOW_TOLERANCE)
+
+    return {
+        'outputs': {item_id: rate * throughput for item_id, rate in capacity['output'].items()},
+        'theoretical_outputs': dict(capacity['output']),
+        'throughput': throughput,
+        'bottlenecks': bottlenecks
+    }
+
+
+def _distribute(node_ports: Dict[str, List[Dict[str, Any]]], outputs: Dict[str, float],
+                capacities: Dict[str, Dict[str, Any]],
+                received: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    """
+    Split each output port over its edges and add the flows to ``received``.
+    Locked edges take their manual rate first; the rest is water-filled up to each
+    consumer's remaining intake (consumers without a recipe take anything).
+    """
+    flows = {}
+    for item_id, port_edges in node_ports.items():
+        available = outputs.get(item_id, 0.0)
+
+        auto = []
+        for edge in port_edges:
+            manual = (edge.get('data') or {}).get('manualFlow')
+            if manual is None:
+                auto.append(edge)
+                continue
+            # Ties keep the port's rate, so loop rates stay linear at zero (see _solve_loop)
+            allocated = max(min(available, float(manual)), 0.0)
+            available -= allocated
+            flows[edge['id']] = allocated
+            received[edge['target']][item_id] += allocated
+
+        requests: List[Tuple[Dict[str, Any], float]] = []
+        for edge in auto:
+            capacity = capacities.get(edge['target'])
+            cap = _remaining_intake(capacity, item_id, received[edge['target']].get(item_id, 0.0))
+            requests.append((edge, cap))
+
+        for edge, amount in zip(auto, _water_fill([cap for _, cap in requests], available)):
+            flows[edge['id']] = amount
+            received[edge['target']][item_id] += amount
+    return flows
+
+
+def _remaining_intake(capacity: Optional[Dict[str, Any]], item_id: str, already: float) -> float:
+    """How much more of an item a consumer can take (unbounded if it has no recipe for it)."""
+    if capacity is None or not capacity.get('recipe') or item_id not in capacity['intake']:
+        return float('inf')
+    return max(0.0, capacity['intake'][item_id] - already)
+
+
+def _water_fill(caps: List[float], available: float) -> List[float]:
+    """Share ``available`` equally among requests, never giving one more than its cap."""
+    assigned = [0.0] * len(caps)
+    open_idx = sorted(range(len(caps)), key=lambda i: caps[i])
+    remaining = max(available, 0.0)
+    while open_idx:
+        share = remaining / len(open_idx)
+        smallest = open_idx[0]
+        if caps[smallest] < share:
+            # Capped requests take what they can; the rest is shared again
+            assigned[smallest] = caps[smallest]
+            remaining -= caps[smallest]
+            open_idx.pop(0)
+        else:
+            for i in open_idx:
+                assigned[i] = share
+            remaining = 0.0
+            open_idx = []
+    return assigned
@@ -3,29 +3,118 @@ Core MILP solver for Satisfactory Factory Calculator.
 Uses PuLP to find the optimal production chain based on a target item and amount.
 """
 
+import os
+import re
+import subprocess
 import time
+import tempfile
+import threading
 from collections import defaultdict
-from typing import Dict, Any, List, Set, Tuple, Optional
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Set, Tuple, Optional, Callable, ContextManager
 from ..utils.math_helpers import clean_nan_values, round_to_precision
 
 try:
     from pulp import (
-        LpProblem, LpVariable, LpMinimize, lpSum, 
-        LpStatusOptimal, value, PULP_CBC_CMD, LpStatus
+        LpProblem, LpVariable, LpMinimize, LpMaximize, lpSum, 
+        LpStatusOptimal, value, PULP_CBC_CMD, LpStatus, PulpSolverError
     )
+    from pulp.apis import coin_api
     PULP_AVAILABLE = True
 except ImportError:
     PULP_AVAILABLE = False
 
 from ..config import (
     DEFAULT_SOLVER_TIME_LIMIT, DEFAULT_REL_GAP, 
-    BIG_M_MACHINE, BIG_M_BASE, DEBUG_CALC
+    BIG_M_MACHINE, BIG_M_BASE, DEBUG_CALC, SOLVER_PARALLEL_WORKERS
 )
 from .strategy_weights import get_strategy_weights, get_strategy_priorities
-from .dependency_graph import dependency_closure_recipes
+from .dependency_graph import get_item_graph, ItemGraph
 from .graph_builder import build_recipe_node, build_base_resource_node
+from .flow_router import route_flows
+from .feasibility import check_producible, check_resource_limits
+from .pruning import prune_closure
+from .deadline import Deadline, SolveAbortedError, MIN_PASS_SECONDS
+from .thread_policy import active_cbc_runs, threads_for
+from .process_context import get_process_context
+from .solver_pool import engine_enabled, compile_model, apply_solution, apply_duals, run_compiled, SolverWorkerError
 from ..data.base_resources import is_base_resource, BASE_RESOURCE_RATES
 
+# Seconds between client-disconnect checks while CBC runs
+CANCEL_POLL_INTERVAL = 0.25
+
+# CBC processes started by each thread's current solve, so a cancelled solve can kill them
+_cbc_processes = threading.local()
+
+
+class _TrackedSubprocess:
+    """Stands in for ``subprocess`` inside PuLP's CBC wrapper and records the processes it starts."""
+
+    def __getattr__(self, name):
+        return getattr(subprocess, name)
+
+    def Popen(self, *args, **kwargs):
+        proc = subprocess.Popen(*args, **kwargs)
+        started = getattr(_cbc_processes, 'started', None)
+        if started is not None:
+            started.append(proc)
+        return proc
+
+
+if PULP_AVAILABLE:
+    coin_api.subprocess = _TrackedSubprocess()
+
+# Process pool for independent sub-problems, created on first use in each worker process
+_block_pool = None
+_block_pool_lock = threading.Lock()
+
+
+def _get_block_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool for block solves."""
+    global _block_pool
+    with _block_pool_lock:
+        if _block_pool is None:
+            _block_pool = ProcessPoolExecutor(max_workers=SOLVER_PARALLEL_WORKERS,
+                                              mp_context=get_process_context())
+        return _block_pool
+
+
+def _reset_block_pool() -> None:
+    """Drop a broken process pool so the next call creates a fresh one."""
+    global _block_pool
+    with _block_pool_lock:
+        if _block_pool is not None:
+            _block_pool.shutdown(wait=False)
+        _block_pool = None
+
+
+def _solve_block(recipes_subset: Dict[str, Any], block_targets: List[Dict[str, Any]], strategy: str,
+                 weights: Dict[str, float], block_items: List[str], priorities: Optional[List[str]],
+                 t_limit: float, gap: float) -> Optional[Dict[str, Any]]:
+    """Solve one independent block (runs in a pool process)."""
+    solver = MILPSolver({}, recipes_subset)
+    item_graph = ItemGraph(recipes_subset, {rid: True for rid in recipes_subset})
+    return solver._solve_closure(
+        block_targets, strategy, weights, set(block_items), sorted(recipes_subset),
+        t_limit, gap, item_graph, decompose=False, priorities=priorities
+    )
+
+
+def _set_initial_values(m_vars, y_recipe, base_use, base_used_bin, warm_start: Dict[str, Any]) -> None:
+    """Load a known solution into the model variables as CBC's starting point."""
+    m_values = warm_start.get('m_values', {})
+    base_values = warm_start.get('base_values', {})
+    for rid, var in m_vars.items():
+        mv = m_values.get(rid) or 0.0
+        var.setInitialValue(mv)
+        y_recipe[rid].setInitialValue(1 if mv > 1e-9 else 0)
+    for iid, var in base_use.items():
+        bv = base_values.get(iid) or 0.0
+        var.setInitialValue(bv)
+        base_used_bin[iid].setInitialValue(1 if bv > 1e-9 else 0)
+
 
 class MILPSolver:
     """
@@ -33,9 +122,19 @@ class MILPSolver:
     Stateless implementation that takes item and recipe data as input.
     """
 
-    def __init__(self, items_data: Dict[str, Any], recipes_data: Dict[str, Any]):
+    def __init__(self, items_data: Dict[str, Any], recipes_data: Dict[str, Any],
+                 admission: Optional[Callable[[], ContextManager]] = None,
+                 deadline: Optional[Deadline] = None):
+        """
+        ``admission`` returns a context manager entered around every CBC solve (but not
+        around closed-form plans); the service layer uses it to cap concurrent solves.
+        ``deadline`` bounds CBC time limits by the request's remaining time and aborts
+        solves whose client has disconnected.
+        """
         self.items = items_data
         self.recipes = recipes_data
+        self.admission = admission or nullcontext
+        self.deadline = deadline or Deadline()
         
         if not PULP_AVAILABLE:
             raise RuntimeError("PuLP library is not installed in the environment.")
@@ -49,7 +148,8 @@ class MILPSolver:
                  rel_gap: float = None,
                  # Legacy single-target params (deprecated but supported)
                  target_item: str = None,
-                 amount_per_min: float = None) -> Optional[Dict[str, Any]]:
+                 amount_per_min: float = None,
+                 resource_limits: Dict[str, float] = None) -> Optional[Dict[str, Any]]:
         """
         Find the optimal production chain for given target(s).
         
@@ -62,6 +162,7 @@ class MILPSolver:
             rel_gap: Relative gap tolerance
             target_item: (DEPRECATED) Single target item ID
             amount_per_min: (DEPRECATED) Single target amount
+            resource_limits: Optional cap (per minute) on each base resource
         
         Returns:
             Graph dictionary or None if infeasible.
@@ -107,9 +208,27 @@ class MILPSolver:
         target_item_ids = [t['item'] for t in targets]
 
         # 1. Dependency closure prune (multi-target version)
-        from .dependency_graph import dependency_closure_multi
-        needed_items, needed_recipes = dependency_closure_multi(target_item_ids, self.recipes, active_map)
-        active_recipe_ids = list(needed_recipes)
+        item_graph = get_item_graph(self.recipes, active_map)
+        needed_items, needed_recipes = item_graph.closure(target_item_ids)
+
+        # Targets that need an unproducible item, and caps that no plan can respect,
+        # fail here before any model is built
+        check_producible(targets, item_graph, self.recipes, needed_items)
+        base_limits = {iid: cap for iid, cap in (resource_limits or {}).items() if iid in needed_items}
+        check_resource_limits(targets, self.recipes, item_graph, base_limits)
+
+        # Drop recipes that can never run or never beat another active recipe
+        needed_items, needed_recipes, reduction = prune_closure(
+            targets, needed_items, needed_recipes, item_graph, self.recipes, weights
+        )
+        if reduction['unreachable_recipes'] or reduction['dominated_recipes']:
+            item_graph = item_graph.restricted(needed_recipes)
+        active_recipe_ids = sorted(needed_recipes)
+
+        if DEBUG_CALC:
+            cyclic = item_graph.cyclic_components(needed_recipes)
+            print(f"[MILP] Closure: {len(needed_items)} items, {len(needed_recipes)} recipes, "
+                  f"{len(cyclic)} cyclic component(s)")
 
         if not active_recipe_ids:
             # Check if ALL targets are base resources (no recipes needed)
@@ -121,6 +240,7 @@ class MILPSolver:
                     recipe_nodes[node_id] = build_base_resource_node(node_id, t['item'], t['amount'])
                 return {
                     'recipe_nodes': recipe_nodes,
+                    'edges': route_flows(recipe_nodes, targets),
                     'targets': targets,
                     # Legacy compatibility fields
                     'target_item': targets[0]['item'] if len(targets) == 1 else None,
@@ -133,43 +253,501 @@ class MILPSolver:
             missing = [t['item'] for t in targets if not is_base_resource(t['item'])]
             raise ValueError(f"No active recipes available to produce: {', '.join(missing)}")
 
-        # Base items involved in this closure
+        # 2. Main solve logic
+        solution = self._solve_closure(
+            targets, strategy, weights, needed_items, active_recipe_ids, t_limit, gap, item_graph,
+            base_limits=base_limits
+        )
+        if solution is None:
+            return None
+
+        # 3. Build graph
+        graph = self._build_graph(targets, strategy, weights, needed_items, solution, t_limit, gap)
+        graph['model_reduction'] = reduction
+        return graph
+
+    def _build_graph(self, targets: List[Dict[str, Any]], strategy: str, weights: Dict[str, float],
+                     needed_items: Set[str], solution: Dict[str, Any],
+                     t_limit: float, gap: float) -> Dict[str, Any]:
+        """Assemble the production graph response from a closure solution."""
+        recipe_nodes = self.build_recipe_nodes(
+            targets, needed_items, solution['m_values'], solution['base_values']
+        )
+
+        return {
+            'recipe_nodes': recipe_nodes,
+            'edges': route_flows(recipe_nodes, targets),
+            'targets': targets,
+            # Legacy compatibility fields (for single-target requests)
+            'target_item': targets[0]['item'] if len(targets) == 1 else None,
+            'target_amount': targets[0]['amount'] if len(targets) == 1 else None,
+            'weights_used': weights,
+            'strategy': strategy,
+            'objective_components': solution['objective_components'],
+            'solver_time_limit': t_limit,
+            'solver_gap': gap,
+            'proven_optimal': solution['proven_optimal'],
+            'closed_form': solution.get('closed_form', False),
+            'independent_blocks': solution.get('blocks', 1),
+            'solver_passes': solution['solver_passes'],
+            'optimality_gap': max_relative_gap(solution['solver_passes'])
+        }
+
+    def maximize_throughput(self,
+                            targets: List[Dict[str, Any]],
+                            resource_limits: Dict[str, float],
+                            strategy: str = 'balanced_production',
+                            active_map: Dict[str, bool] = None,
+                            custom_weights: Dict[str, float] = None,
+                            time_limit: float = None,
+                            rel_gap: float = None) -> Optional[Dict[str, Any]]:
+        """
+        Find the largest output the resource limits allow, then the best plan at that rate.
+
+        Target amounts are ratios: a single variable scales all of them in the balance rows
+        and is maximized with every base resource capped by ``resource_limits``. The plan at
+        the resulting rate is then solved with the normal strategy passes under the same caps.
+
+        Args:
+            targets: List of targets [{"item": str, "amount": float}, ...] (amounts as ratios)
+            resource_limits: Base item ID -> availability per minute
+            strategy: Optimization strategy name
+            active_map: Recipe enable/disable map
+            custom_weights: Weights for 'custom' strategy
+            time_limit: Solver time limit in seconds
+            rel_gap: Relative gap tolerance
+
+        Returns:
+            Graph dictionary with a "throughput" entry, or None if infeasible.
+        """
+        if not targets:
+            raise ValueError("Must provide at least one target")
+        for t in targets:
+            if t.get('item') not in self.items:
+                raise ValueError(f"Unknown target item: {t.get('item')}")
+        if active_map is None:
+            active_map = {}
+
+        t_limit = time_limit if time_limit is not None else DEFAULT_SOLVER_TIME_LIMIT
+        gap = rel_gap if rel_gap is not None else DEFAULT_REL_GAP
+        weights = get_strategy_weights(strategy, custom_weights)
+
+        item_graph = get_item_graph(self.recipes, active_map)
+        needed_items, needed_recipes = item_graph.closure([t['item'] for t in targets])
+        check_producible(targets, item_graph, self.recipes, needed_items)
+        needed_items, needed_recipes, reduction = prune_closure(
+            targets, needed_items, needed_recipes, item_graph, self.recipes, weights
+        )
+        if reduction['unreachable_recipes'] or reduction['dominated_recipes']:
+            item_graph = item_graph.restricted(needed_recipes)
+        active_recipe_ids = sorted(needed_recipes)
         base_items = [iid for iid in needed_items if is_base_resource(iid)]
 
-        # 2. Main solve logic
-        if strategy == 'custom':
-            # Weighted single pass for custom strategy
-            result = self._solve_weighted(
-                targets, active_recipe_ids, base_items,
-                weights, t_limit, gap
+        # Both steps run CBC: hold one solver slot for the whole request
+        with self.admission():
+            # 1. Largest common scale of the target ratios
+            scale_var = LpVariable('demand_scale', lowBound=0)
+            model, m_vars, y_recipe, base_use, base_used_bin, comps = self._build_base_model(
+                targets, active_recipe_ids, base_items, resource_limits, demand_scale=scale_var
             )
-        else:
-            # Lexicographical solve for standard strategies
+            for t in targets:
+                # Targets that are base resources are drawn directly from their cap
+                if is_base_resource(t['item']) and t['item'] in base_use:
+                    model += base_use[t['item']] >= t['amount'] * scale_var
+                elif is_base_resource(t['item']):
+                    if t['item'] not in resource_limits:
+                        raise ValueError(f"Throughput is unbounded: no limit on {t['item']}")
+                    model += t['amount'] * scale_var <= resource_limits[t['item']]
+            model.sense = LpMaximize
+            model += scale_var
+
+            st_str, stats = self._run_solver(model, int(self.deadline.budget(max(1, t_limit / 4))), 0.0)
+            if st_str in ('Infeasible', 'Undefined'):
+                return None
+            if st_str == 'Unbounded':
+                raise ValueError("Throughput is unbounded: add limits for the base resources the targets use")
+            scale = value(scale_var) or 0.0
+
+            # Only the Big-M constants stopped the scale from growing: some path needs no capped resource
+            unbounded = [iid for iid in base_items if iid not in resource_limits
+                         and (value(base_use[iid]) or 0.0) >= BIG_M_BASE * (1 - 1e-6)]
+            if unbounded or any((value(m_vars[rid]) or 0.0) >= BIG_M_MACHINE * (1 - 1e-6) for rid in active_recipe_ids):
+                names = ', '.join(unbounded) if unbounded else 'the resources the targets use'
+                raise ValueError(f"Throughput is unbounded: add limits for {names}")
+            if scale <= 1e-9:
+                raise ValueError("The resource limits allow no production of the targets")
+
+            # 2. Best plan at that rate (shaved slightly so rounding can't make it infeasible)
+            achieved = [{'item': t['item'], 'amount': t['amount'] * scale * (1 - 1e-6)} for t in targets]
+            base_targets = [t for t in achieved if is_base_resource(t['item'])]
+            if active_recipe_ids:
+                solution = self._solve_closure(
+                    achieved, strategy, weights, needed_items, active_recipe_ids, t_limit, gap, item_graph,
+                    decompose=False, base_limits=resource_limits
+                )
+                if solution is None:
+                    return None
+                graph = self._build_graph(achieved, strategy, weights, needed_items, solution, t_limit, gap)
+                base_values = solution['base_values']
+            else:
+                graph = {'recipe_nodes': {}, 'targets': achieved, 'strategy': strategy, 'proven_optimal': True,
+                         'is_base_only': True, 'solver_passes': [], 'optimality_gap': 0.0}
+                base_values = {}
+        for i, t in enumerate(base_targets):
+            node_id = f"extract_{t['item']}_target_{i}"
+            graph['recipe_nodes'][node_id] = build_base_resource_node(node_id, t['item'], t['amount'])
+        if base_targets:
+            graph['edges'] = route_flows(graph['recipe_nodes'], achieved)
+
+        graph['model_reduction'] = reduction
+        usage = defaultdict(float, base_values)
+        for t in base_targets:
+            usage[t['item']] += t['amount']
+        graph['throughput'] = {
+            'scale': scale,
+            'resource_limits': dict(resource_limits),
+            'resource_usage': {iid: usage[iid] for iid in sorted(usage) if usage[iid] > 1e-9},
+            'limiting_resources': sorted(
+                iid for iid, cap in resource_limits.items() if usage.get(iid, 0.0) >= cap * (1 - 1e-4) - 1e-9
+            )
+        }
+        return graph
+
+    def solve_values(self,
+                     targets: List[Dict[str, Any]],
+                     strategy: str = 'balanced_production',
+                     active_map: Dict[str, bool] = None,
+                     custom_weights: Dict[str, float] = None,
+                     time_limit: float = None,
+                     rel_gap: float = None) -> Optional[Dict[str, Any]]:
+        """
+        Solve for raw (unrounded) machine counts and base usage without building a graph.
+        The closure is pruned as in ``optimize``.
+        
+        Returns:
+            Dict with m_values, base_values, proven_optimal, objective_components,
+            closed_form, blocks and model_reduction, or None if infeasible.
+        """
+        if active_map is None:
+            active_map = {}
+        t_limit = time_limit if time_limit is not None else DEFAULT_SOLVER_TIME_LIMIT
+        gap = rel_gap if rel_gap is not None else DEFAULT_REL_GAP
+        weights = get_strategy_weights(strategy, custom_weights)
+
+        item_graph = get_item_graph(self.recipes, active_map)
+        needed_items, needed_recipes = item_graph.closure([t['item'] for t in targets])
+        check_producible(targets, item_graph, self.recipes, needed_items)
+        if not needed_recipes:
+            missing = [t['item'] for t in targets if not is_base_resource(t['item'])]
+            raise ValueError(f"No active recipes available to produce: {', '.join(missing)}")
+
+        needed_items, needed_recipes, reduction = prune_closure(
+            targets, needed_items, needed_recipes, item_graph, self.recipes, weights
+        )
+        if reduction['unreachable_recipes'] or reduction['dominated_recipes']:
+            item_graph = item_graph.restricted(needed_recipes)
+
+        solution = self._solve_closure(
+            targets, strategy, weights, needed_items, sorted(needed_recipes), t_limit, gap, item_graph
+        )
+        if solution is None:
+            return None
+        solution.setdefault('closed_form', False)
+        solution.setdefault('blocks', 1)
+        solution['model_reduction'] = reduction
+        return solution
+
+    def _solve_closure(self, targets: List[Dict[str, Any]], strategy: str, weights: Dict[str, float],
+                       needed_items: Set[str], active_recipe_ids: List[str],
+                       t_limit: float, gap: float, item_graph: ItemGraph,
+                       decompose: bool = True,
+                       warm_start: Optional[Dict[str, Any]] = None,
+                       base_limits: Optional[Dict[str, float]] = None,
+                       priorities: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Run the MILP passes for a dependency closure and extract variable values.
+
+        ``warm_start`` is a known feasible solution ({"m_values", "base_values"}) handed to
+        CBC as its first incumbent; recipes it doesn't mention start switched off.
+        ``base_limits`` caps the use of base resources (per minute).
+        ``priorities`` replaces the strategy's lexicographic passes (built-in strategies only).
+        """
+        if priorities is None and strategy != 'custom':
             priorities = get_strategy_priorities(strategy)
-            
-            # Special case for balanced: pre-pass to avoid degenerate solutions
-            if strategy == 'balanced_production':
+        # Base items involved in this closure
+        base_items = [iid for iid in needed_items if is_base_resource(iid)]
+
+        # Acyclic closures with one recipe per item are fully determined; skip CBC
+        if strategy != 'custom' or all(w >= 0 for w in weights.values()):
+            solution = self._solve_closed_form(targets, strategy, needed_items, active_recipe_ids, item_graph,
+                                               priorities)
+            if solution is not None and base_limits and any(
+                    v > base_limits.get(iid, float('inf')) for iid, v in solution['base_values'].items()):
+                # The only possible plan breaks a cap
+                return None
+            if solution is not None:
                 if DEBUG_CALC:
-                    print("[MILP] Running balanced pre-pass...")
+                    print("[MILP] Closed-form solution, skipping CBC")
+                return solution
+
+        # Everything below runs CBC: wait for a solver slot
+        with self.admission():
+            # Time spent on the closure, pruning and queueing counts against the deadline
+            t_limit = self.deadline.budget(t_limit)
+
+            # Blocks sharing no intermediate item are independent sub-problems. Base types are a
+            # count over the whole plan, so blocks sharing a base resource stay coupled when counted.
+            # Caps couple every block that draws on a capped resource, so they are solved as one
+            split = None
+            if decompose and SOLVER_PARALLEL_WORKERS > 1 and not base_limits:
+                counts_base_types = (weights.get('base_types', 0) != 0 if strategy == 'custom'
+                                     else 'uniq_base_types' in priorities)
+                blocks = item_graph.independent_blocks(active_recipe_ids, couple_base=counts_base_types)
+                if len(blocks) > 1:
+                    return self._solve_blocks(targets, strategy, weights, needed_items, blocks, t_limit, gap,
+                                              priorities)
+                if strategy != 'custom' and counts_base_types:
+                    # Blocks sharing only base resources: the passes ranked above base types are
+                    # sums over blocks, so those passes run per block and the rest on the whole plan
+                    leading = priorities[:priorities.index('uniq_base_types')]
+                    blocks = item_graph.independent_blocks(active_recipe_ids)
+                    if leading and len(blocks) > 1:
+                        started = time.monotonic()
+                        split = self._solve_blocks(
+                            targets, strategy, weights, needed_items, blocks,
+                            t_limit * len(leading) / len(priorities), gap, leading
+                        )
+                        if split is None:
+                            return None
+                        t_limit = max(MIN_PASS_SECONDS, t_limit - (time.monotonic() - started))
+                        priorities = priorities[len(leading):]
+                        warm_start = {'m_values': split['m_values'], 'base_values': split['base_values']}
+
+            if strategy == 'custom':
+                # Weighted single pass for custom strategy
+                result = self._solve_weighted(
+                    targets, active_recipe_ids, base_items,
+                    weights, t_limit, gap, warm_start, base_limits
+                )
+            else:
+                # Lexicographical solve for standard strategies
+                # Special case for balanced: pre-pass to avoid degenerate solutions
+                if strategy == 'balanced_production':
+                    if DEBUG_CALC:
+                        print("[MILP] Running balanced pre-pass...")
             
-            result = self._solve_lexicographic(
-                targets, active_recipe_ids, base_items,
-                priorities, t_limit, gap
-            )
+                result = self._solve_lexicographic(
+                    targets, active_recipe_ids, base_items,
+                    priorities, t_limit, gap, warm_start, base_limits,
+                    fixed=split['objective_components'] if split is not None else None
+                )
+                if result is None and split is not None:
+                    # The block optima proved too tight for the whole-plan model (rounding);
+                    # solve every pass on the whole plan instead
+                    split = None
+                    result = self._solve_lexicographic(
+                        targets, active_recipe_ids, base_items,
+                        get_strategy_priorities(strategy), t_limit, gap, None, base_limits
+                    )
+
+            if result is None:
+                return None
+
+            model, m_vars, y_recipe, base_use, base_used_bin, comps, proven_optimal, comp_values, pass_stats = result
+            solution = {
+                'm_values': {rid: value(m_vars[rid]) for rid in active_recipe_ids},
+                'base_values': {iid: value(base_use[iid]) for iid in base_items},
+                'proven_optimal': proven_optimal,
+                'objective_components': {k: float(v) for k, v in comp_values.items()},
+                'solver_passes': pass_stats
+            }
+            if split is not None:
+                solution['proven_optimal'] = proven_optimal and split['proven_optimal']
+                solution['solver_passes'] = split['solver_passes'] + pass_stats
+                solution['blocks'] = split['blocks']
+            return solution
+
+    def _solve_blocks(self, targets: List[Dict[str, Any]], strategy: str, weights: Dict[str, float],
+                      needed_items: Set[str], blocks: List[Tuple[frozenset, frozenset]],
+                      t_limit: float, gap: float,
+                      priorities: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Solve independent blocks in the process pool and merge them into one solution.
+        
+        Every objective component is a sum over blocks (base types too, when blocks don't
+        share counted base resources), so per-block optima combine into the global optimum.
+        ``priorities`` limits built-in strategies to those passes.
+        """
+        jobs = []
+        for block_items, block_recipes in blocks:
+            block_targets = [t for t in targets if t['item'] in block_items and not is_base_resource(t['item'])]
+            recipes_subset = {rid: self.recipes[rid] for rid in sorted(block_recipes)}
+            block_needed = sorted(block_items & needed_items)
+            jobs.append((recipes_subset, block_targets, strategy, weights, block_needed, priorities, t_limit, gap))
+
+        if DEBUG_CALC:
+            print(f"[MILP] Solving {len(jobs)} independent blocks in parallel")
 
-        if result is None:
+        try:
+            pool = _get_block_pool()
+            futures = [pool.submit(_solve_block, *job) for job in jobs]
+            self._wait_blocks(futures)
+            results = [f.result() for f in futures]
+        except BrokenProcessPool:
+            _reset_block_pool()
+            # Run the blocks here, each on what is left of the request's budget
+            results = [_solve_block(*job[:-2], self.deadline.budget(t_limit), gap) for job in jobs]
+
+        if any(r is None for r in results):
             return None
 
-        # 3. Extract results and build graph
-        model, m_vars, y_recipe, base_use, base_used_bin, comps, proven_optimal, comp_values = result
+        m_values = {}
+        base_values = defaultdict(float)
+        for r in results:
+            m_values.update(r['m_values'])
+            for iid, v in r['base_values'].items():
+                base_values[iid] += v or 0.0
 
+        all_components = {
+            'total_base': sum(base_values.values()),
+            'uniq_base_types': float(sum(1 for v in base_values.values() if v > 1e-9)),
+            'machines': sum(r['objective_components'].get('machines', 0.0) for r in results),
+            'uniq_recipes': sum(r['objective_components'].get('uniq_recipes', 0.0) for r in results)
+        }
+        if strategy == 'custom':
+            components = all_components
+        else:
+            components = {k: all_components[k] for k in priorities or get_strategy_priorities(strategy)}
+
+        pass_stats = []
+        for block_idx, r in enumerate(results):
+            for stats in r.get('solver_passes', []):
+                pass_stats.append({**stats, 'block': block_idx})
+
+        return {
+            'm_values': {rid: m_values.get(rid, 0.0) for rid in sorted(m_values)},
+            'base_values': dict(base_values),
+            'proven_optimal': all(r['proven_optimal'] for r in results),
+            'objective_components': components,
+            'closed_form': all(r.get('closed_form', False) for r in results),
+            'solver_passes': pass_stats,
+            'blocks': len(results)
+        }
+
+    def _wait_blocks(self, futures: List[Future]) -> None:
+        """
+        Wait for block solves, checking the deadline and the client between waits.
+
+        Raises:
+            SolveAbortedError: If the deadline passed or the client disconnected; blocks
+                not yet started are cancelled.
+        """
+        pending = set(futures)
+        while pending:
+            cancelled = self.deadline.cancelled()
+            left = self.deadline.remaining()
+            if cancelled or left <= 0:
+                for f in pending:
+                    f.cancel()
+                if cancelled:
+                    raise SolveAbortedError("Client disconnected; solve abandoned")
+                raise SolveAbortedError("Request deadline reached before the blocks were solved")
+            _, pending = wait(pending, timeout=min(left, CANCEL_POLL_INTERVAL), return_when=FIRST_COMPLETED)
+    def _solve_closed_form(self, targets: List[Dict[str, Any]], strategy: str,
+                           needed_items: Set[str], active_recipe_ids: List[str],
+                           item_graph: ItemGraph, priorities: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Backwards rate propagation for acyclic closures where every item has exactly one recipe.
+        
+        Each recipe runs at the smallest rate that covers the demand for all of its products,
+        which is optimal for every strategy with non-negative weights.
+        Returns None when the closure doesn't qualify, so the caller falls back to the MILP.
+        """
+        # Every non-base item needs exactly one producer
+        for iid in needed_items:
+            if not is_base_resource(iid) and len(item_graph.producers(iid)) != 1:
+                return None
+        if item_graph.has_cycles(active_recipe_ids):
+            return None
+
+        target_demands = defaultdict(float)
+        for t in targets:
+            target_demands[t['item']] += t['amount']
+        demand = defaultdict(float, target_demands)
+
+        # Visit recipes consumers-first; a recipe's product demand is final when it is reached
+        m_values = {}
+        for rid in sorted(active_recipe_ids, key=item_graph.recipe_component):
+            rec = self.recipes[rid]
+            cycles = 60.0 / (rec.get('time', 1.0) or 1.0)
+            mv = 0.0
+            for p in rec.get('products', []):
+                if p['item'] in needed_items and not is_base_resource(p['item']) and p['amount'] > 0:
+                    mv = max(mv, demand[p['item']] / (p['amount'] * cycles))
+            m_values[rid] = mv
+            for ing in rec.get('ingredients', []):
+                demand[ing['item']] += ing['amount'] * cycles * mv
+
+        # Net production of each target must match its demand (byproducts can force overproduction)
+        produced = defaultdict(float)
+        consumed = defaultdict(float)
+        for rid, mv in m_values.items():
+            rec = self.recipes[rid]
+            cycles = 60.0 / (rec.get('time', 1.0) or 1.0)
+            for p in rec.get('products', []):
+                produced[p['item']] += p['amount'] * cycles * mv
+            for ing in rec.get('ingredients', []):
+                consumed[ing['item']] += ing['amount'] * cycles * mv
+        for iid, amount in target_demands.items():
+            if is_base_resource(iid):
+                continue
+            if produced[iid] - consumed[iid] > amount * 1.0000001:
+                return None
+
+        base_values = {iid: consumed[iid] for iid in needed_items if is_base_resource(iid)}
+
+        # Outside the Big-M bounds the MILP would behave differently
+        if any(v > BIG_M_MACHINE for v in m_values.values()) or any(v > BIG_M_BASE for v in base_values.values()):
+            return None
+
+        all_components = {
+            'total_base': sum(base_values.values()),
+            'uniq_base_types': float(sum(1 for v in base_values.values() if v > 1e-9)),
+            'machines': sum(m_values.values()),
+            'uniq_recipes': float(sum(1 for v in m_values.values() if v > 1e-9))
+        }
+        if strategy == 'custom':
+            components = all_components
+        else:
+            components = {k: all_components[k] for k in priorities or get_strategy_priorities(strategy)}
+
+        return {
+            'm_values': {rid: m_values[rid] for rid in active_recipe_ids},
+            'base_values': base_values,
+            'proven_optimal': True,
+            'objective_components': components,
+            'closed_form': True,
+            'solver_passes': []
+        }
+
+    def build_recipe_nodes(self, targets: List[Dict[str, Any]], needed_items: Set[str],
+                           m_values: Dict[str, float], base_values: Dict[str, float]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build the ``recipe_nodes`` graph from solved machine counts and base usage.
+        
+        Args:
+            targets: List of targets [{"item": str, "amount": float}, ...]
+            needed_items: Item IDs in the dependency closure
+            m_values: Recipe ID -> machine count (in recipe order)
+            base_values: Base item ID -> extraction rate (per minute)
+        """
         recipe_nodes = {}
         node_counter = 0
 
         # Build recipe nodes
-        target_item_set = set(target_item_ids)
-        for rid in active_recipe_ids:
-            mv = value(m_vars[rid])
+        target_item_set = {t['item'] for t in targets}
+        output_items = set(needed_items) | target_item_set
+        for rid, mv in m_values.items():
             if mv and mv > 1e-6:
                 rec = self.recipes[rid]
                 t = rec.get('time', 1.0) or 1.0
@@ -181,7 +759,7 @@ class MILPSolver:
                 
                 # Filter to only relevant items (optional but cleaner)
                 inputs = {k: v for k, v in inputs.items() if k in needed_items}
-                outputs = {k: v for k, v in outputs.items() if k in (set(needed_items) | target_item_set)}
+                outputs = {k: v for k, v in outputs.items() if k in output_items}
 
                 node_id = f"recipe_{rid}_{node_counter}"
                 node_counter += 1
@@ -190,29 +768,155 @@ class MILPSolver:
                 )
 
         # Build base resource nodes
-        for iid in base_items:
-            val = value(base_use[iid])
+        for iid, val in base_values.items():
             if val and val > 1e-6:
                 node_id = f"extract_{iid}_{node_counter}"
                 node_counter += 1
                 recipe_nodes[node_id] = build_base_resource_node(node_id, iid, val)
 
+        return recipe_nodes
+
+    def analyze_sensitivity(self, targets: List[Dict[str, Any]], strategy: str,
+                            active_map: Dict[str, bool], used_recipe_ids: Set[str],
+                            custom_weights: Dict[str, float] = None,
+                            resource_limits: Optional[Dict[str, float]] = None,
+                            time_limit: float = None) -> Optional[Dict[str, Any]]:
+        """
+        Marginal values of a solved plan from one LP with the integer choices fixed.
+
+        Recipes outside ``used_recipe_ids`` are switched off and the binaries drop out, which
+        leaves the linear part of the objective (total base for the built-in strategies,
+        base and machine weights for custom). The LP is solved like any other pass: under
+        admission, on the configured engine, within the request deadline.
+
+        Args:
+            targets: List of targets [{"item": str, "amount": float}, ...]
+            strategy: Optimization strategy name
+            active_map: Recipe enable map the plan was solved with
+            used_recipe_ids: Recipes the plan actually runs
+            custom_weights: Weights for 'custom' strategy
+            resource_limits: Caps (per minute) the plan was solved under
+            time_limit: Solver time limit in seconds
+
+        Returns:
+            Dict with "objective", "objective_value", "item_prices" (shadow price per
+            unit/min of each item the plan makes), "base_prices" (shadow price of each base
+            resource, its objective weight plus any scarcity from a binding cap),
+            "cap_prices" (objective change per extra unit/min of each cap, 0 when slack) and
+            "recipe_reduced_costs" for the unused closure recipes (None when a recipe needs
+            an intermediate the plan does not make), or None if the fixed LP is infeasible.
+
+        Raises:
+            SolveAbortedError: If the deadline passed or the client disconnected.
+        """
+        resource_limits = resource_limits or {}
+        time_limit = time_limit if time_limit is not None else DEFAULT_SOLVER_TIME_LIMIT
+        if strategy == 'custom':
+            weights = get_strategy_weights(strategy, custom_weights)
+            base_weight, machine_weight = weights['base'], weights['machines']
+            objective_name = 'weighted'
+        else:
+            base_weight, machine_weight = 1.0, 0.0
+            objective_name = 'total_base'
+
+        item_graph = get_item_graph(self.recipes, active_map)
+        needed_items, needed_recipes = item_graph.closure([t['item'] for t in targets])
+        used = sorted(set(used_recipe_ids) & needed_recipes)
+        unused = sorted(needed_recipes - set(used))
+        base_items = sorted(iid for iid in needed_items if is_base_resource(iid))
+
+        target_demands = defaultdict(float)
+        for t in targets:
+            target_demands[t['item']] += t['amount']
+
+        rates = {rid: self._net_rates(rid) for rid in needed_recipes}
+
+        # Each base resource the plan mines gets a supply row (its dual is the base price)
+        # and, when capped, a cap row
+        model = LpProblem('sensitivity', LpMinimize)
+        m_vars = {rid: LpVariable(f'm_{rid}', lowBound=0) for rid in used}
+        mined = sorted({iid for rid in used for iid, a in rates[rid].items() if a < 0 and is_base_resource(iid)})
+        base_use = {iid: LpVariable(f'base_{iid}', lowBound=0) for iid in mined}
+        model += (lpSum(machine_weight * m_vars[rid] for rid in used)
+                  + lpSum(base_weight * base_use[iid] for iid in mined))
+
+        supply_rows, cap_rows = {}, {}
+        for iid in mined:
+            supply_rows[iid] = f'supply_{iid}'
+            consumed = lpSum(-rates[rid][iid] * m_vars[rid] for rid in used if rates[rid].get(iid, 0.0) < 0)
+            model += base_use[iid] - consumed >= 0, supply_rows[iid]
+            if iid in resource_limits:
+                cap_rows[iid] = f'cap_{iid}'
+                model += base_use[iid] <= resource_limits[iid], cap_rows[iid]
+
+        # Only items the plan makes or is asked for get a balance row (and so a price)
+        touched = {iid for rid in used for iid in rates[rid]} | set(target_demands)
+        balance_rows = {}
+        for iid in sorted(touched & needed_items):
+            if is_base_resource(iid):
+                continue
+            balance_rows[iid] = f'bal_{iid}'
+            terms = lpSum(rates[rid][iid] * m_vars[rid] for rid in used if iid in rates[rid])
+            model += terms >= target_demands.get(iid, 0.0), balance_rows[iid]
+
+        with self.admission():
+            budget = self.deadline.budget(time_limit)
+            st_str, _ = self._run_solver(model, max(1, int(budget)), 0.0)
+        if st_str != 'Optimal':
+            return None
+
+        item_prices = {iid: model.constraints[name].pi or 0.0 for iid, name in balance_rows.items()}
+        # Base resources the plan does not mine are slack: one more unit costs its weight
+        base_prices = {iid: base_weight for iid in base_items}
+        base_prices.update({iid: model.constraints[name].pi or 0.0 for iid, name in supply_rows.items()})
+        cap_prices = {iid: 0.0 for iid in base_items if iid in resource_limits}
+        cap_prices.update({iid: model.constraints[name].pi or 0.0 for iid, name in cap_rows.items()})
+
+        # d_r = c_r - sum_i pi_i * a_ir, with every base unit consumed at its base price.
+        # A recipe needing an intermediate the plan does not make has no price to compare against.
+        reduced_costs = {}
+        for rid in unused:
+            d = machine_weight
+            for iid, a in rates[rid].items():
+                if iid in item_prices:
+                    d -= item_prices[iid] * a
+                elif iid in base_prices:
+                    d -= base_prices[iid] * min(a, 0.0)
+                elif a < 0:
+                    d = None
+                    break
+            products = [(a, iid) for iid, a in rates[rid].items() if a > 0 and iid in item_prices]
+            rate, product = max(products) if products else (0.0, None)
+            reduced_costs[rid] = {
+                'reduced_cost': d,
+                'product': product,
+                'reduced_cost_per_unit': d / rate if d is not None and rate > 0 else None
+            }
+
         return {
-            'recipe_nodes': recipe_nodes,
-            'targets': targets,
-            # Legacy compatibility fields (for single-target requests)
-            'target_item': targets[0]['item'] if len(targets) == 1 else None,
-            'target_amount': targets[0]['amount'] if len(targets) == 1 else None,
-            'weights_used': weights,
-            'strategy': strategy,
-            'objective_components': {k: float(v) for k, v in comp_values.items()},
-            'solver_time_limit': t_limit,
-            'solver_gap': gap,
-            'proven_optimal': proven_optimal
+            'objective': objective_name,
+            'objective_value': value(model.objective),
+            'item_prices': item_prices,
+            'base_prices': base_prices,
+            'cap_prices': cap_prices,
+            'recipe_reduced_costs': reduced_costs
         }
 
-    def _build_base_model(self, targets: List[Dict[str, Any]], 
-                          active_recipe_ids: List[str], base_items: List[str]) -> Tuple:
+    def _net_rates(self, rid: str) -> Dict[str, float]:
+        """Net per-machine rate of each item for a recipe (products positive, ingredients negative)."""
+        rec = self.recipes[rid]
+        cycles = 60.0 / (rec.get('time', 1.0) or 1.0)
+        rates = defaultdict(float)
+        for p in rec.get('products', []):
+            rates[p['item']] += p['amount'] * cycles
+        for ing in rec.get('ingredients', []):
+            rates[ing['item']] -= ing['amount'] * cycles
+        return dict(rates)
+
+    def _build_base_model(self, targets: List[Dict[str, Any]],
+                          active_recipe_ids: List[str], base_items: List[str],
+                          base_limits: Optional[Dict[str, float]] = None,
+                          demand_scale=None) -> Tuple:
         """
         Helper to build consistent PuLP model structure.
         
@@ -220,6 +924,9 @@ class MILPSolver:
             targets: List of targets [{"item": str, "amount": float}, ...]
             active_recipe_ids: List of recipe IDs to consider
             base_items: List of base resource item IDs
+            base_limits: Optional cap (per minute) on the use of each base resource
+            demand_scale: Optional variable multiplying every target amount, which turns
+                          the target amounts into ratios
         """
         model = LpProblem('production_plan', LpMinimize)
         
@@ -237,6 +944,8 @@ class MILPSolver:
         
         for iid in base_items:
             model += base_use[iid] <= BIG_M_BASE * base_used_bin[iid]
+            if base_limits and iid in base_limits:
+                model += base_use[iid] <= base_limits[iid], f'limit_{iid}'
 
         # Build production and consumption coefficients
         prod_coeff = defaultdict(lambda: defaultdict(float))
@@ -267,7 +976,10 @@ class MILPSolver:
                 demand = target_demands.get(iid, 0)
                 
                 # Production of targets must be exactly enough (with tiny tolerance)
-                if demand > 0:
+                if demand > 0 and demand_scale is not None:
+                    model += prod_expr - cons_expr >= demand * demand_scale
+                    model += prod_expr - cons_expr <= demand * 1.0000001 * demand_scale
+                elif demand > 0:
                     model += prod_expr - cons_expr >= demand
                     model += prod_expr - cons_expr <= demand * 1.0000001
                 else:
@@ -285,11 +997,15 @@ class MILPSolver:
 
     def _solve_weighted(self, targets: List[Dict[str, Any]], 
                         active_recipe_ids: List[str], base_items: List[str], 
-                        weights: Dict[str, float], time_limit: float, rel_gap: float):
+                        weights: Dict[str, float], time_limit: float, rel_gap: float,
+                        warm_start: Optional[Dict[str, Any]] = None,
+                        base_limits: Optional[Dict[str, float]] = None):
         """Single-pass weighted optimization."""
         model, m_vars, y_recipe, base_use, base_used_bin, comps = self._build_base_model(
-            targets, active_recipe_ids, base_items
+            targets, active_recipe_ids, base_items, base_limits
         )
+        if warm_start is not None:
+            _set_initial_values(m_vars, y_recipe, base_use, base_used_bin, warm_start)
         
         # Weighted objective
         model += (
@@ -299,38 +1015,45 @@ class MILPSolver:
             weights['recipes'] * comps['uniq_recipes']
         )
         
-        solver = PULP_CBC_CMD(
-            timeLimit=max(1, int(time_limit)), 
-            msg=DEBUG_CALC, 
-            gapRel=rel_gap if rel_gap > 0 else None
-        )
-        status = model.solve(solver)
+        time_limit = self.deadline.budget(time_limit)
+        started = time.monotonic()
+        st_str, stats = self._run_solver(model, max(1, int(time_limit)), rel_gap, warm_start is not None)
         
-        if LpStatus[status] in ('Infeasible', 'Undefined'):
+        if st_str in ('Infeasible', 'Undefined'):
             return None
             
-        proven_optimal = (LpStatus[status] == 'Optimal')
         comp_values = {k: value(v) for k, v in comps.items()}
+        time_left = time_limit - (time.monotonic() - started)
+        pass_stats = [self._pass_statistics(model, 'weighted', st_str, stats, value(model.objective), rel_gap,
+                                            time_left)]
+        proven_optimal = pass_stats[0]['within_tolerance']
         
-        return model, m_vars, y_recipe, base_use, base_used_bin, comps, proven_optimal, comp_values
+        return model, m_vars, y_recipe, base_use, base_used_bin, comps, proven_optimal, comp_values, pass_stats
 
     def _solve_lexicographic(self, targets: List[Dict[str, Any]], 
                              active_recipe_ids: List[str], base_items: List[str], 
-                             order: List[str], time_limit: float, rel_gap: float):
-        """Multi-pass lexicographic optimization."""
-        fixed_values = {}
+                             order: List[str], time_limit: float, rel_gap: float,
+                             warm_start: Optional[Dict[str, Any]] = None,
+                             base_limits: Optional[Dict[str, float]] = None,
+                             fixed: Optional[Dict[str, float]] = None):
+        """
+        Multi-pass lexicographic optimization.
+        With a warm start, each later pass starts from the previous pass's solution.
+        ``fixed`` holds components already optimized elsewhere, kept at their values.
+        """
+        fixed_values = dict(fixed or {})
         remaining_time = time_limit
         passes = len(order)
         
         last_success = None
         overall_proven_optimal = True
+        pass_stats = []
+        # Each pass's solution is feasible for the next, which keeps its component fixed
+        previous_solution = None
         
         for idx, component_name in enumerate(order):
-            # Allocate time for this pass
-            alloc_time = max(1, int(remaining_time / (passes - idx)))
-            
             model, m_vars, y_recipe, base_use, base_used_bin, comps = self._build_base_model(
-                targets, active_recipe_ids, base_items
+                targets, active_recipe_ids, base_items, base_limits
             )
             
             # Constrain previously optimized components to their optimal values (relax slightly for precision)
@@ -340,14 +1063,19 @@ class MILPSolver:
                 
             # Current objective
             model += comps[component_name]
+
+            if warm_start is not None:
+                _set_initial_values(m_vars, y_recipe, base_use, base_used_bin, warm_start)
+
+            # Allocate time for this pass from what is left after building the model
+            if idx > 0 and self.deadline.remaining() < MIN_PASS_SECONDS and not self.deadline.cancelled():
+                # Deadline reached: keep the earlier passes' plan, unproven
+                last_success = last_success[:6] + (False,) + last_success[7:]
+                break
+            alloc_time = max(1, int(self.deadline.budget(remaining_time) / (passes - idx)))
+            pass_started = time.monotonic()
             
-            solver = PULP_CBC_CMD(
-                timeLimit=alloc_time, 
-                msg=False, 
-                gapRel=rel_gap if rel_gap > 0 else None
-            )
-            status = model.solve(solver)
-            st_str = LpStatus[status]
+            st_str, stats = self._run_solver(model, alloc_time, rel_gap, warm_start is not None, previous_solution)
             
             if DEBUG_CALC:
                 print(f"[MILP] Lex pass {idx+1}/{passes} ({component_name}): status={st_str}, time={alloc_time}s")
@@ -361,14 +1089,25 @@ class MILPSolver:
                 
             val = value(comps[component_name])
             fixed_values[component_name] = val
+            # An LP bound for this pass may use time the later passes have not started on
+            time_left = remaining_time - (time.monotonic() - pass_started)
+            pass_stats.append(self._pass_statistics(model, component_name, st_str, stats, val, rel_gap, time_left))
             
-            is_optimal = (st_str == 'Optimal')
+            # PuLP reports 'Optimal' for time-limited runs with an incumbent, so check the gap too
+            is_optimal = pass_stats[-1]['within_tolerance']
             if not is_optimal:
                 overall_proven_optimal = False
                 
-            last_success = (model, m_vars, y_recipe, base_use, base_used_bin, comps, overall_proven_optimal, dict(fixed_values))
+            last_success = (model, m_vars, y_recipe, base_use, base_used_bin, comps, overall_proven_optimal,
+                            dict(fixed_values), list(pass_stats))
+            previous_solution = {v.name: v.varValue for v in model.variables()}
+            if warm_start is not None:
+                warm_start = {
+                    'm_values': {rid: value(m_vars[rid]) for rid in active_recipe_ids},
+                    'base_values': {iid: value(base_use[iid]) for iid in base_items}
+                }
             
-            remaining_time -= alloc_time
+            remaining_time -= max(alloc_time, time.monotonic() - pass_started)
             if remaining_time <= 0:
                 if idx < passes - 1:
                     overall_proven_optimal = False
@@ -376,3 +1115,218 @@ class MILPSolver:
                 
         return last_success
 
+    def _run_solver(self, model, time_limit: int, rel_gap: float, warm_start: bool = False,
+                    start: Optional[Dict[str, float]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Solve a model on the HiGHS worker pool when it is enabled, otherwise with CBC.
+        A pass whose worker fails is retried with CBC. ``start`` (variable name -> value) seeds
+        HiGHS with a known feasible solution, such as the previous lexicographic pass's.
+        
+        Returns:
+            Tuple of (status string, run statistics).
+        """
+        if engine_enabled():
+            try:
+                return self._run_pooled(model, time_limit, rel_gap, warm_start, start)
+            except SolverWorkerError as e:
+                if DEBUG_CALC:
+                    print(f"[MILP] Solver worker failed ({e}); falling back to CBC")
+        return self._run_cbc(model, time_limit, rel_gap, warm_start)
+
+    def _run_pooled(self, model, time_limit: int, rel_gap: float, warm_start: bool = False,
+                    start: Optional[Dict[str, float]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Solve a model in a persistent HiGHS worker and store the values on its variables
+        (and, for an LP, the duals on its constraints).
+        
+        Raises:
+            SolveAbortedError: If the client disconnected (the worker is killed) or the
+                deadline passed while waiting for a free worker.
+            SolverWorkerError: If the worker failed without a result.
+        """
+        variables, compiled = compile_model(model, warm_start, start)
+        cancelled = self.deadline.cancelled if self.deadline.cancellable else None
+        # A busy pool is waited on only for what is left of the request's budget
+        left = self.deadline.remaining()
+        wait_limit = left if left != float('inf') else None
+        with active_cbc_runs.track():
+            st_str, values, stats = run_compiled(compiled, time_limit, rel_gap, cancelled, wait_limit)
+        apply_solution(variables, values)
+        apply_duals(model, stats.pop('row_duals', None))
+        model.status = {v: k for k, v in LpStatus.items()}[st_str]
+        stats['threads'] = 1
+        return st_str, stats
+
+    def _run_cbc(self, model, time_limit: int, rel_gap: float,
+                 warm_start: bool = False) -> Tuple[str, Dict[str, Any]]:
+        """
+        Solve a model with CBC and collect the run statistics from its log.
+        With ``warm_start``, the variables' initial values are passed as a starting solution.
+        If the deadline is cancellable, the CBC process is killed once the client disconnects.
+        CBC gets the thread share of ``threads_for`` given the runs in flight on the host.
+        
+        Returns:
+            Tuple of (status string, parsed log statistics, including ``threads``).
+
+        Raises:
+            SolveAbortedError: If the solve was killed because the client disconnected.
+        """
+        fd, log_path = tempfile.mkstemp(prefix='cbc_', suffix='.log')
+        os.close(fd)
+        started = []
+        done = threading.Event()
+        aborted = threading.Event()
+        watcher = None
+        if self.deadline.cancellable:
+            def watch():
+                while not done.wait(CANCEL_POLL_INTERVAL):
+                    if self.deadline.cancelled():
+                        aborted.set()
+                        for proc in list(started):
+                            if proc.poll() is None:
+                                proc.kill()
+                        return
+            watcher = threading.Thread(target=watch, name='cbc-cancel-watch', daemon=True)
+        try:
+            with active_cbc_runs.track():
+                threads = threads_for(active_cbc_runs.count())
+                solver = PULP_CBC_CMD(
+                    timeLimit=time_limit,
+                    msg=False,
+                    gapRel=rel_gap if rel_gap > 0 else None,
+                    logPath=log_path,
+                    warmStart=warm_start,
+                    threads=threads if threads > 1 else None
+                )
+                _cbc_processes.started = started
+                if watcher is not None:
+                    watcher.start()
+                try:
+                    status = model.solve(solver)
+                except PulpSolverError:
+                    if aborted.is_set():
+                        raise SolveAbortedError("Client disconnected; solve abandoned")
+                    raise
+            with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+                stats = parse_cbc_log(f.read())
+            stats['threads'] = threads
+        finally:
+            _cbc_processes.started = None
+            done.set()
+            os.remove(log_path)
+        return LpStatus[status], stats
+
+    def _lp_relaxation_bound(self, model, time_left: float) -> Optional[float]:
+        """
+        Solve the LP relaxation of a model and return its objective (a valid lower bound).
+        The solve runs through ``_run_cbc`` within ``time_left`` seconds and the request
+        deadline; with less than a pass's worth of time left it is skipped.
+        Variable values, categories and the model status are restored afterwards.
+
+        Returns:
+            The bound, or None if it was skipped or not solved to optimality in time.
+        """
+        time_limit = min(time_left, self.deadline.remaining())
+        if time_limit < MIN_PASS_SECONDS:
+            return None
+
+        variables = model.variables()
+        saved_values = {v.name: v.varValue for v in variables}
+        saved_status = model.status
+        integer_vars = [(v, v.cat) for v in variables if v.cat != 'Continuous']
+        for v, _ in integer_vars:
+            v.cat = 'Continuous'
+        try:
+            st_str, _ = self._run_cbc(model, int(time_limit), 0.0)
+            bound = value(model.objective) if st_str == 'Optimal' else None
+        finally:
+            for v, cat in integer_vars:
+                v.cat = cat
+            for v in variables:
+                v.varValue = saved_values[v.name]
+            model.status = saved_status
+        return bound
+
+    def _pass_statistics(self, model, component_name: str, st_str: str, stats: Dict[str, Any],
+                         incumbent: Optional[float], rel_gap: float, time_left: float = 0.0) -> Dict[str, Any]:
+        """
+        Build the bound/gap report for one solver pass.
+        
+        Uses CBC's own lower bound when it reports one, the incumbent itself when CBC closed
+        the search tree, and an LP-relaxation solve of the same model otherwise. That solve
+        gets ``time_left`` (the unspent solve budget); without one the bound is None.
+        """
+        bound = stats.get('lower_bound')
+        bound_source = 'cbc'
+        if bound is None:
+            if st_str == 'Optimal' and not stats.get('stopped_on_gap'):
+                # Search tree closed: the incumbent is proven optimal
+                bound = incumbent
+            elif stats.get('best_possible') is not None:
+                bound = stats['best_possible']
+            else:
+                bound = self._lp_relaxation_bound(model, time_left)
+                bound_source = 'lp_relaxation'
+
+        gap = relative_gap(incumbent, bound)
+        return {
+            'component': component_name,
+            'status': st_str,
+            'objective': incumbent,
+            'best_bound': bound,
+            'relative_gap': gap,
+            'nodes': stats.get('nodes'),
+            'bound_source': bound_source,
+            'threads': stats.get('threads'),
+            'within_tolerance': st_str == 'Optimal' and gap is not None and gap <= rel_gap + 1e-6
+        }
+
+
+_CBC_LOG_PATTERNS = {
+    'objective': re.compile(r'^Objective value:\s+(\S+)', re.MULTILINE),
+    'lower_bound': re.compile(r'^Lower bound:\s+(\S+)', re.MULTILINE),
+    'nodes': re.compile(r'^Enumerated nodes:\s+(\d+)', re.MULTILINE),
+}
+
+
+def parse_cbc_log(log_text: str) -> Dict[str, Any]:
+    """
+    Extract objective, bound and node count from a CBC log.
+    Missing entries are left out of the result.
+    """
+    stats = {}
+    for key, pattern in _CBC_LOG_PATTERNS.items():
+        match = pattern.search(log_text)
+        if match:
+            try:
+                stats[key] = int(match.group(1)) if key == 'nodes' else float(match.group(1))
+            except ValueError:
+                pass
+    # Progress lines carry the bound while the search runs ("... best possible 6.47 ...")
+    best_possible = re.findall(r'best possible (\S+?)[,)\s]', log_text)
+    if best_possible:
+        try:
+            stats['best_possible'] = float(best_possible[-1])
+        except ValueError:
+            pass
+    # Cbc0011I: search stopped because the gap tolerance was reached
+    stats['stopped_on_gap'] = 'Cbc0011I' in log_text
+    return stats
+
+
+def relative_gap(incumbent: Optional[float], bound: Optional[float]) -> Optional[float]:
+    """Relative optimality gap |incumbent - bound| / |incumbent| (0 when both are ~0)."""
+    if incumbent is None or bound is None:
+        return None
+    diff = max(0.0, incumbent - bound)
+    if diff <= 1e-9:
+        return 0.0
+    return diff / max(abs(incumbent), 1e-9)
+
+
+def max_relative_gap(pass_stats: List[Dict[str, Any]]) -> Optional[float]:
+    """Largest relative gap over solver passes (0 when no pass was needed)."""
+    gaps = [p.get('relative_gap') for p in pass_stats]
+    if any(g is None for g in gaps):
+        return None
+    return max(gaps, default=0.0)
@@ -0,0 +1,30 @@
+"""
+Worker process start method for Satisfactory Factory Calculator.
+
+Block solves, alternate rankings and HiGHS workers run in child processes started from a
+``multiprocessing`` context of ``SOLVER_START_METHOD``. The fork server preloads the solver
+module once, so each child starts with PuLP and the block solver already imported.
+"""
+
+import multiprocessing
+import threading
+
+from ..config import SOLVER_START_METHOD
+
+_context = None
+_context_lock = threading.Lock()
+
+
+def get_process_context():
+    """The ``multiprocessing`` context solver worker processes are started from."""
+    global _context
+    with _context_lock:
+        if _context is None:
+            method = SOLVER_START_METHOD
+            if method not in multiprocessing.get_all_start_methods():
+                method = 'spawn'
+            context = multiprocessing.get_context(method)
+            if method == 'forkserver':
+                context.set_forkserver_preload([f'{__package__}.milp_solver'])
+            _context = context
+        return _context
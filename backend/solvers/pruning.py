@@ -0,0 +1,156 @@
+"""
+Closure pruning for Satisfactory Factory Calculator.
+Removes recipes that can never appear in an optimal plan before the model is built.
+
+Two kinds of recipe are dropped:
+
+- Unreachable: an ingredient depends on an item with no active producer, so the recipe
+  can never run.
+- Dominated: another recipe makes the same products in the same proportions from a
+  subset of its ingredients at no higher rates. Swapping it in never uses more of any
+  item, base resource, base type or recipe. When the strategy weighs machines, the other
+  recipe must also need no more machine time.
+
+Pruning is skipped for custom weights with negative entries, where using more can pay off.
+"""
+
+from collections import defaultdict
+from typing import Dict, Any, List, Set, Tuple, Iterable, Optional
+
+from ..data.base_resources import is_base_resource
+from .dependency_graph import ItemGraph
+from .feasibility import blocked_closure
+
+# Relative tolerance when comparing recipe amounts
+DOMINANCE_TOLERANCE = 1e-9
+
+
+def prune_closure(targets: List[Dict[str, Any]], needed_items: Iterable[str], needed_recipes: Iterable[str],
+                  item_graph: ItemGraph, recipes_data: Dict[str, Any],
+                  weights: Optional[Dict[str, float]] = None) -> Tuple[Set[str], Set[str], Dict[str, Any]]:
+    """
+    Drop unreachable and dominated recipes from a dependency closure.
+
+    Args:
+        targets: List of targets [{"item": str, "amount": float}, ...]
+        needed_items: Item IDs in the closure
+        needed_recipes: Recipe IDs in the closure
+        item_graph: ItemGraph the closure was taken from
+        recipes_data: Recipe dictionary (from data layer)
+        weights: Strategy weights (machine time is compared when 'machines' is non-zero)
+
+    Returns:
+        Tuple of (items, recipes, stats). ``stats`` counts the removed recipes and model
+        variables: every recipe has a machine variable and a binary, and so does every base
+        resource that no remaining recipe uses.
+    """
+    needed_items = set(needed_items)
+    needed_recipes = set(needed_recipes)
+    stats = {
+        'closure_recipes': len(needed_recipes),
+        'unreachable_recipes': 0,
+        'dominated_recipes': 0,
+        'variables_eliminated': 0,
+        'binaries_eliminated': 0
+    }
+    if weights and any(w < 0 for w in weights.values()):
+        return needed_items, needed_recipes, stats
+
+    _, _, blocked_recipes = blocked_closure(item_graph, recipes_data, needed_items)
+    unreachable = blocked_recipes & needed_recipes
+    remaining = needed_recipes - unreachable
+
+    target_items = {t['item'] for t in targets}
+    compare_machines = bool(weights and weights.get('machines', 0) > 0)
+    dominated = _dominated_recipes(remaining, recipes_data, target_items, compare_machines)
+    remaining -= dominated
+
+    removed = unreachable | dominated
+    if not removed:
+        return needed_items, needed_recipes, stats
+
+    # Items still touched by the remaining recipes
+    items = set(target_items)
+    for rid in remaining:
+        rec = recipes_data[rid]
+        items.update(ing['item'] for ing in rec.get('ingredients', []))
+        items.update(p['item'] for p in rec.get('products', []) if p['item'] in needed_items)
+    dropped_base = {iid for iid in needed_items - items if is_base_resource(iid)}
+
+    stats['unreachable_recipes'] = len(unreachable)
+    stats['dominated_recipes'] = len(dominated)
+    stats['variables_eliminated'] = 2 * (len(removed) + len(dropped_base))
+    stats['binaries_eliminated'] = len(removed) + len(dropped_base)
+    return items & (needed_items | target_items), remaining, stats
+
+
+def _dominated_recipes(recipe_ids: Set[str], recipes_data: Dict[str, Any],
+                       target_items: Set[str], compare_machines: bool) -> Set[str]:
+    """Recipes another recipe in the set beats on every input (ties keep the standard one)."""
+    groups: Dict[frozenset, List[str]] = defaultdict(list)
+    for rid in sorted(recipe_ids):
+        products = frozenset(p['item'] for p in recipes_data[rid].get('products', []))
+        if products:
+            groups[products].append(rid)
+
+    dominated = set()
+    for rids in groups.values():
+        if len(rids) < 2:
+            continue
+        for rid in rids:
+            # A recipe consuming a target could shift the capped target balance; leave it
+            if any(ing['item'] in target_items for ing in recipes_data[rid].get('ingredients', [])):
+                continue
+            for other in rids:
+                if other == rid or other in dominated:
+                    continue
+                if not _dominates(recipes_data[other], recipes_data[rid], compare_machines):
+                    continue
+                # Equivalent recipes: keep the preferred one
+                if _dominates(recipes_data[rid], recipes_data[other], compare_machines) and \
+                        _keep_key(recipes_data, rid) < _keep_key(recipes_data, other):
+                    continue
+                dominated.add(rid)
+                break
+    return dominated
+
+
+def _dominates(better: Dict[str, Any], worse: Dict[str, Any], compare_machines: bool) -> bool:
+    """True if ``better`` scaled to ``worse``'s output needs no more of any input."""
+    better_out = _amounts(better.get('products', []))
+    worse_out = _amounts(worse.get('products', []))
+    if set(better_out) != set(worse_out):
+        return False
+
+    # Scale factor k: k cycles of ``better`` make one cycle of ``worse``'s products
+    ratios = [worse_out[iid] / better_out[iid] for iid in worse_out if better_out[iid] > 0]
+    if len(ratios) != len(worse_out):
+        return False
+    k = ratios[0]
+    if any(abs(r - k) > DOMINANCE_TOLERANCE * max(1.0, k) for r in ratios):
+        return False
+
+    better_in = _amounts(better.get('ingredients', []))
+    worse_in = _amounts(worse.get('ingredients', []))
+    for iid, amount in better_in.items():
+        if amount * k > worse_in.get(iid, 0.0) * (1 + DOMINANCE_TOLERANCE):
+            return False
+
+    if compare_machines:
+        better_time = (better.get('time', 1.0) or 1.0) * k
+        if better_time > (worse.get('time', 1.0) or 1.0) * (1 + DOMINANCE_TOLERANCE):
+            return False
+    return True
+
+
+def _amounts(entries: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Sum item amounts of an ingredient or product list."""
+    totals: Dict[str, float] = defaultdict(float)
+    for e in entries:
+        totals[e['item']] += e['amount']
+    return dict(totals)
+
+
+def _keep_key(recipes_data: Dict[str, Any], rid: str) -> Tuple[bool, str]:
+    """Preference among equivalent recipes: standard before alternate, then by ID."""
+    return (recipes_data[rid].get('alternate', False), rid)
@@ -0,0 +1,376 @@
+"""
+Persistent solver workers for Satisfactory Factory Calculator.
+Solves models with HiGHS in long-lived worker processes instead of starting CBC for every pass.
+
+The request process compiles a PuLP model to sparse row arrays (``compile_model``) and sends
+them over a pipe. The worker loads them into its resident HiGHS instance, solves, and sends
+back the column values with the bound and node statistics. Workers are started on first use
+(see ``process_context``). A worker that crashes, overruns its time limit or is killed to
+abandon a solve is replaced on the next request.
+
+Inside other pool processes (e.g. block solves) models are solved in-process instead:
+daemonic processes cannot start workers, and those processes are long-lived already.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+try:
+    import numpy as np
+    import highspy
+    HIGHSPY_AVAILABLE = True
+except ImportError:
+    HIGHSPY_AVAILABLE = False
+
+from ..config import SOLVER_ENGINE, SOLVER_ENGINE_WORKERS
+from .deadline import SolveAbortedError, MIN_PASS_SECONDS
+from .process_context import get_process_context
+
+# Seconds between client-disconnect checks while a worker solves
+CANCEL_POLL_INTERVAL = 0.25
+# Seconds past the time limit before a silent worker is presumed hung
+WORKER_GRACE_SECONDS = 5.0
+
+# PuLP constraint senses
+_LE, _EQ, _GE = -1, 0, 1
+
+
+class SolverWorkerError(RuntimeError):
+    """A solver worker failed without producing a result."""
+
+
+def engine_enabled() -> bool:
+    """True if solves go to the HiGHS workers rather than CBC."""
+    return SOLVER_ENGINE in ('auto', 'highs') and HIGHSPY_AVAILABLE
+
+
+def compile_model(model, warm_start: bool = False,
+                  start: Optional[Dict[str, float]] = None) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Compile a PuLP model to the arrays a worker solves.
+
+    With ``warm_start``, variables with a value set are passed as a starting solution;
+    ``start`` (variable name -> value) supplies values for the others.
+
+    Returns:
+        Tuple of (variables in column order, compiled model).
+    """
+    variables = model.variables()
+    column = {v.name: j for j, v in enumerate(variables)}
+    inf = float('inf')
+
+    cost = np.zeros(len(variables))
+    offset = 0.0
+    if model.objective is not None:
+        for v, coef in model.objective.items():
+            cost[column[v.name]] += coef
+        offset = model.objective.constant
+
+    row_lower: List[float] = []
+    row_upper: List[float] = []
+    row_start = [0]
+    row_index: List[int] = []
+    row_value: List[float] = []
+    for constraint in model.constraints.values():
+        for v, coef in constraint.items():
+            row_index.append(column[v.name])
+            row_value.append(coef)
+        row_start.append(len(row_index))
+        rhs = -constraint.constant
+        row_lower.append(rhs if constraint.sense in (_GE, _EQ) else -inf)
+        row_upper.append(rhs if constraint.sense in (_LE, _EQ) else inf)
+
+    compiled = {
+        'maximize': model.sense == -1,
+        'cost': cost,
+        'offset': offset,
+        'col_lower': np.array([-inf if v.lowBound is None else v.lowBound for v in variables], dtype=float),
+        'col_upper': np.array([inf if v.upBound is None else v.upBound for v in variables], dtype=float),
+        'integer': np.array([j for j, v in enumerate(variables) if v.cat == 'Integer'], dtype=np.int32),
+        'row_lower': np.array(row_lower, dtype=float),
+        'row_upper': np.array(row_upper, dtype=float),
+        'row_start': np.array(row_start, dtype=np.int32),
+        'row_index': np.array(row_index, dtype=np.int32),
+        'row_value': np.array(row_value, dtype=float),
+        'initial': None
+    }
+    if warm_start or start:
+        start = start or {}
+        initial = []
+        for j, v in enumerate(variables):
+            x = v.varValue if warm_start and v.varValue is not None else start.get(v.name)
+            if x is not None:
+                initial.append((j, x))
+        compiled['initial'] = (np.array([j for j, _ in initial], dtype=np.int32),
+                               np.array([x for _, x in initial], dtype=float))
+    return variables, compiled
+
+
+def apply_solution(variables: List[Any], values: Optional[List[float]]) -> None:
+    """Store a worker's column values on the model's variables (cleared if there are none)."""
+    if values is None:
+        for v in variables:
+            v.varValue = None
+        return
+    for v, x in zip(variables, values):
+        v.varValue = x
+
+
+def apply_duals(model, duals: Optional[List[float]]) -> None:
+    """Store a worker's row duals on the model's constraints as ``pi`` (cleared if there are none)."""
+    for i, constraint in enumerate(model.constraints.values()):
+        constraint.pi = duals[i] if duals is not None else None
+
+
+def solve_compiled(compiled: Dict[str, Any], time_limit: float, rel_gap: float,
+                   highs=None) -> Tuple[str, Optional[List[float]], Dict[str, Any]]:
+    """
+    Solve a compiled model with HiGHS in this process.
+
+    Statuses follow PuLP's names: a run stopped by the time limit with a solution reports
+    'Optimal', as PuLP does for CBC; the gap statistics tell the two apart.
+
+    Returns:
+        Tuple of (status string, column values or None, statistics). For an LP the statistics
+        include ``row_duals``, the shadow price of each row in row order.
+    """
+    if highs is None:
+        highs = highspy.Highs()
+        highs.setOptionValue('output_flag', False)
+    highs.clearModel()
+
+    num_col = len(compiled['cost'])
+    num_row = len(compiled['row_lower'])
+    lp = highspy.HighsLp()
+    lp.num_col_ = num_col
+    lp.num_row_ = num_row
+    lp.col_cost_ = compiled['cost']
+    lp.offset_ = compiled['offset']
+    lp.col_lower_ = compiled['col_lower']
+    lp.col_upper_ = compiled['col_upper']
+    lp.row_lower_ = compiled['row_lower']
+    lp.row_upper_ = compiled['row_upper']
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+    lp.a_matrix_.num_col_ = num_col
+    lp.a_matrix_.num_row_ = num_row
+    lp.a_matrix_.start_ = compiled['row_start']
+    lp.a_matrix_.index_ = compiled['row_index']
+    lp.a_matrix_.value_ = compiled['row_value']
+    is_mip = len(compiled['integer']) > 0
+    if is_mip:
+        integrality = [highspy.HighsVarType.kContinuous] * num_col
+        for j in compiled['integer']:
+            integrality[j] = highspy.HighsVarType.kInteger
+        lp.integrality_ = integrality
+    if compiled['maximize']:
+        lp.sense_ = highspy.ObjSense.kMaximize
+    highs.passModel(lp)
+
+    highs.setOptionValue('time_limit', float(time_limit))
+    highs.setOptionValue('mip_rel_gap', float(rel_gap) if rel_gap > 0 else 1e-9)
+    if compiled['initial'] is not None and is_mip:
+        index, values = compiled['initial']
+        highs.setSolution(len(index), index, values)
+    highs.run()
+
+    model_status = highs.getModelStatus()
+    info = highs.getInfo()
+    has_solution = info.primal_solution_status == 2
+    if has_solution:
+        status = 'Optimal'
+    elif model_status == highspy.HighsModelStatus.kInfeasible:
+        status = 'Infeasible'
+    elif model_status == highspy.HighsModelStatus.kUnbounded:
+        status = 'Unbounded'
+    elif model_status == highspy.HighsModelStatus.kTimeLimit:
+        status = 'Not Solved'
+    else:
+        status = 'Undefined'
+
+    stats: Dict[str, Any] = {}
+    if has_solution:
+        stats['objective'] = info.objective_function_value
+        bound = info.mip_dual_bound if is_mip else info.objective_function_value
+        if bound is not None and abs(bound) != float('inf'):
+            stats['lower_bound'] = bound
+        if is_mip:
+            stats['nodes'] = int(info.mip_node_count)
+            stats['stopped_on_gap'] = model_status == highspy.HighsModelStatus.kOptimal and info.mip_gap > 1e-9
+        elif info.dual_solution_status == 2:
+            stats['row_duals'] = list(highs.getSolution().row_dual)
+    values = list(highs.getSolution().col_value) if has_solution else None
+    return status, values, stats
+
+
+def _worker_main(conn) -> None:
+    """Worker loop: solve each compiled model received until the pipe closes."""
+    highs = highspy.Highs()
+    highs.setOptionValue('output_flag', False)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        compiled, time_limit, rel_gap = request
+        try:
+            conn.send(('ok', solve_compiled(compiled, time_limit, rel_gap, highs)))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    def __init__(self):
+        context = get_process_context()
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,),
+                                       name='sfc-solver-worker', daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class SolverWorkerPool:
+    """A fixed number of persistent HiGHS worker processes, started on demand."""
+
+    def __init__(self, size: int = SOLVER_ENGINE_WORKERS):
+        self.size = max(1, size)
+        self._idle: 'queue.LifoQueue[_Worker]' = queue.LifoQueue()
+        self._slots = threading.Semaphore(self.size)
+        self._lock = threading.Lock()
+        self._started = 0
+        self._replaced = 0
+
+    def solve(self, compiled: Dict[str, Any], time_limit: float, rel_gap: float,
+              cancelled: Optional[Callable[[], bool]] = None,
+              wait_limit: Optional[float] = None) -> Tuple[str, Optional[List[float]], Dict[str, Any]]:
+        """
+        Solve a compiled model on a free worker, waiting up to ``wait_limit`` seconds for one
+        if all are busy (no limit if None). Time spent waiting comes off ``time_limit``.
+
+        Raises:
+            SolveAbortedError: If ``cancelled`` turned true (the worker is killed) or no
+                worker came free in time.
+            SolverWorkerError: If the worker failed, died or hung.
+        """
+        waited = self._acquire_slot(cancelled, wait_limit)
+        time_limit = max(MIN_PASS_SECONDS, time_limit - waited)
+        try:
+            worker = self._checkout()
+            healthy = False
+            try:
+                worker.conn.send((compiled, time_limit, rel_gap))
+                give_up = time.monotonic() + time_limit + WORKER_GRACE_SECONDS
+                while not worker.conn.poll(CANCEL_POLL_INTERVAL):
+                    if cancelled is not None and cancelled():
+                        raise SolveAbortedError("Client disconnected; solve abandoned")
+                    if not worker.alive():
+                        raise SolverWorkerError("Solver worker exited")
+                    if time.monotonic() > give_up:
+                        raise SolverWorkerError("Solver worker did not answer within its time limit")
+                try:
+                    kind, payload = worker.conn.recv()
+                except (EOFError, OSError):
+                    raise SolverWorkerError("Solver worker exited")
+                healthy = True
+            finally:
+                if healthy:
+                    self._idle.put(worker)
+                else:
+                    worker.kill()
+                    with self._lock:
+                        self._replaced += 1
+            if kind == 'error':
+                raise SolverWorkerError(payload)
+            return payload
+        finally:
+            self._slots.release()
+
+    def _acquire_slot(self, cancelled: Optional[Callable[[], bool]], wait_limit: Optional[float]) -> float:
+        """Take a worker slot, checking ``cancelled`` while waiting; returns the seconds waited."""
+        started = time.monotonic()
+        while not self._slots.acquire(timeout=CANCEL_POLL_INTERVAL):
+            if cancelled is not None and cancelled():
+                raise SolveAbortedError("Client disconnected; solve abandoned")
+            if wait_limit is not None and time.monotonic() - started >= wait_limit:
+                raise SolveAbortedError("Request deadline reached while waiting for a solver worker")
+        return time.monotonic() - started
+
+    def _checkout(self) -> _Worker:
+        """An idle live worker, or a new one."""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    self._started += 1
+                return _Worker()
+            if worker.alive():
+                return worker
+            worker.kill()
+
+    def close(self) -> None:
+        """Stop the idle workers."""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.kill()
+
+    def stats(self) -> Dict[str, Any]:
+        """Worker counts for the metrics endpoint."""
+        with self._lock:
+            return {
+                'size': self.size,
+                'idle': self._idle.qsize(),
+                'started': self._started,
+                'replaced': self._replaced
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_solver_pool() -> SolverWorkerPool:
+    """Get this process's solver worker pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SolverWorkerPool()
+        return _pool
+
+
+def run_compiled(compiled: Dict[str, Any], time_limit: float, rel_gap: float,
+                 cancelled: Optional[Callable[[], bool]] = None,
+                 wait_limit: Optional[float] = None) -> Tuple[str, Optional[List[float]], Dict[str, Any]]:
+    """Solve a compiled model on the worker pool, or in-process inside a pool process."""
+    if multiprocessing.parent_process() is not None:
+        return solve_compiled(compiled, time_limit, rel_gap)
+    return get_solver_pool().solve(compiled, time_limit, rel_gap, cancelled, wait_limit)
+
+
+def get_engine_stats() -> Dict[str, Any]:
+    """Solver engine in use and, for HiGHS, this process's worker counts."""
+    if not engine_enabled():
+        return {'engine': 'cbc'}
+    return {'engine': 'highs', 'workers': get_solver_pool().stats()}
@@ -0,0 +1,145 @@
+"""
+CBC thread policy for Satisfactory Factory Calculator.
+Gives each CBC run an even share of the cores left over by the other runs in flight.
+
+Every run holds an exclusive lock on a marker file in ``SOLVER_STATE_DIR`` while CBC
+works, so runs in all gunicorn workers and block-pool processes on the host are counted
+together. The OS releases the lock of a process that dies, and its stale marker is removed
+on the next count. Without ``fcntl`` (Windows), only this process's runs are counted.
+"""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+from ..config import SOLVER_MAX_THREADS, SOLVER_RESERVED_CORES, SOLVER_STATE_DIR
+
+_MARKER_PREFIX = 'cbc_run_'
+
+
+def available_cores() -> int:
+    """Cores this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def threads_for(active_runs: int, cores: Optional[int] = None,
+                max_threads: int = SOLVER_MAX_THREADS, reserved_cores: int = SOLVER_RESERVED_CORES) -> int:
+    """
+    CBC threads for one run when ``active_runs`` runs (itself included) are in flight.
+
+    The unreserved cores are split evenly across the runs, with at least one thread each
+    and at most ``max_threads``.
+    """
+    if cores is None:
+        cores = available_cores()
+    budget = max(1, cores - max(0, reserved_cores))
+    return max(1, min(max_threads, budget // max(1, active_runs)))
+
+
+class ActiveRunCounter:
+    """Counts CBC runs in flight across the processes sharing a state directory."""
+
+    def __init__(self, directory: str = SOLVER_STATE_DIR):
+        self.directory = directory
+        self._local_runs = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Count one run for the duration of the block."""
+        marker = self._acquire_marker() if FCNTL_AVAILABLE else None
+        with self._lock:
+            self._local_runs += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._local_runs -= 1
+            if marker is not None:
+                fd, path = marker
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                os.close(fd)
+
+    def count(self) -> int:
+        """Runs in flight on the host (this process only without ``fcntl``)."""
+        with self._lock:
+            local_runs = self._local_runs
+        if not FCNTL_AVAILABLE:
+            return local_runs
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return local_runs
+
+        runs = 0
+        for name in names:
+            if not name.startswith(_MARKER_PREFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except OSError:
+                runs += 1
+            else:
+                # Nobody holds it: the owning process died mid-run
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            finally:
+                os.close(fd)
+        return max(runs, local_runs)
+
+    def _acquire_marker(self):
+        """Create and lock this run's marker file; None if the directory is unusable."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Lock under a temporary name first so a concurrent count never sees it unlocked
+            fd, staging = tempfile.mkstemp(prefix='.pending_', dir=self.directory)
+        except OSError:
+            return None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            path = os.path.join(self.directory, _MARKER_PREFIX + os.path.basename(staging)[len('.pending_'):])
+            os.rename(staging, path)
+        except OSError:
+            os.close(fd)
+            try:
+                os.remove(staging)
+            except OSError:
+                pass
+            return None
+        return fd, path
+
+
+active_cbc_runs = ActiveRunCounter()
+
+
+def get_thread_stats() -> Dict[str, Any]:
+    """CBC thread policy settings and the runs currently in flight."""
+    runs = active_cbc_runs.count()
+    cores = available_cores()
+    return {
+        'cores': cores,
+        'max_threads': SOLVER_MAX_THREADS,
+        'reserved_cores': SOLVER_RESERVED_CORES,
+        'active_runs': runs,
+        'next_run_threads': threads_for(runs + 1, cores)
+    }
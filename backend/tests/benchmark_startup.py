@@ -0,0 +1,62 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Runs in a fresh interpreter: times from process start to each first response
+PROBE = r"""
+import json, sys, time
+start = time.perf_counter()
+from backend.app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+client = app.test_client()
+timings = {'import': imported - start, 'create_app': created - imported}
+requests = [
+    ('health', 'get', '/api/health', None),
+    ('items', 'get', '/api/items', None),
+    ('recipes', 'get', '/api/recipes', None),
+    ('calculate', 'post', '/api/calculate', {'targets': [{'item': 'Desc_IronPlate_C', 'amount': 30}]}),
+    # A non-default recipe set misses the precomputed table and runs the MILP
+    ('calculate_milp', 'post', '/api/calculate',
+     {'targets': [{'item': 'Desc_ModularFrame_C', 'amount': 7}],
+      'active_recipes': {'enable': ['Recipe_Alternate_IngotIron_C']}}),
+]
+if len(sys.argv) > 1:
+    # Give the warm-up thread time to finish, as an idle server would
+    time.sleep(float(sys.argv[1]))
+for name, method, url, body in requests:
+    t = time.perf_counter()
+    response = getattr(client, method)(url, json=body, headers={'Accept-Encoding': 'br, gzip'})
+    assert response.status_code == 200, (url, response.status_code)
+    timings[name] = time.perf_counter() - t
+timings['solver_loaded'] = 'pulp' in sys.modules
+print(json.dumps(timings))
+"""
+
+def run_probe(warmup, idle_seconds):
+    env = dict(os.environ, STARTUP_WARMUP='1' if warmup else '0')
+    args = [sys.executable, '-c', PROBE] + ([str(idle_seconds)] if idle_seconds else [])
+    out = subprocess.run(args, cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def run_benchmark(label, warmup, idle_seconds=0.0, runs=5):
+    results = [run_probe(warmup, idle_seconds) for _ in range(runs)]
+    print(f"--- Startup Benchmark: {label} (median of {runs} cold starts) ---")
+    for key in ('import', 'create_app', 'health', 'items', 'recipes', 'calculate', 'calculate_milp'):
+        values = [r[key] for r in results]
+        print(f"{key:16} {statistics.median(values) * 1000:8.1f} ms  (min {min(values) * 1000:.1f})")
+    ready = [r['import'] + r['create_app'] + r['health'] for r in results]
+    print(f"{'first response':16} {statistics.median(ready) * 1000:8.1f} ms")
+    print("-" * 40)
+    return results
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run_benchmark("lazy, no warm-up", warmup=False, runs=runs)
+    run_benchmark("warm-up, requests at once", warmup=True, runs=runs)
+    run_benchmark("warm-up, idle 3s first", warmup=True, idle_seconds=3.0, runs=runs)
@@ -16,6 +16,9 @@ import sys
 # Add project root to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
+# Tests load game data and solvers themselves: no background warm-up thread
+os.environ.setdefault('STARTUP_WARMUP', '0')
+
 
 # =============================================================================
 # Sample Data Fixtures (Minimal - for unit tests)
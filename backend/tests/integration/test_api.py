@@ -54,6 +54,125 @@ class TestAPI:
         assert 'production_graph' in data
         assert 'summary' in data
 
+    @pytest.mark.parametrize("response_format", ["compact", "columnar"])
+    def test_calculate_compact_formats(self, client, response_format):
+        """response_format drops recipe data and keeps the plan numbers."""
+        payload = {"item": "Desc_IronPlate_C", "amount": 20.0}
+        full = client.post('/api/calculate', data=json.dumps(payload),
+                           content_type='application/json')
+        packed = client.post('/api/calculate',
+                             data=json.dumps({**payload, "response_format": response_format}),
+                             content_type='application/json')
+        assert packed.status_code == 200
+        data = packed.get_json()
+        assert data['format'] == response_format
+        assert data['summary'] == full.get_json()['summary']
+        assert 'recipe_data' not in packed.get_data(as_text=True)
+        assert len(packed.get_data()) < len(full.get_data())
+
+    def test_calculate_unknown_response_format(self, client):
+        response = client.post('/api/calculate?format=xml',
+                               data=json.dumps({"item": "Desc_IronPlate_C", "amount": 20.0}),
+                               content_type='application/json')
+        assert response.status_code == 400
+
+    def test_calculate_with_bitset_active_recipes(self, client):
+        """A bitset from /api/recipes/index stands in for the full active map."""
+        index = client.get('/api/recipes/index').get_json()
+        assert len(index['recipes']) > 0
+        payload = {"targets": [{"item": "Desc_IronPlate_C", "amount": 20.0}],
+                   "optimization_strategy": "resource_efficiency"}
+        full = client.post('/api/calculate', json=payload).get_json()
+        packed = client.post('/api/calculate', json={
+            **payload,
+            "active_recipes": {"bitset": index['default_bitset'], "version": index['version']}
+        })
+        assert packed.status_code == 200
+        assert packed.get_json()['summary'] == full['summary']
+
+        stale = client.post('/api/calculate', json={
+            **payload, "active_recipes": {"bitset": index['default_bitset'], "version": "stale"}
+        })
+        assert stale.status_code == 400
+
+    def test_calculate_request_timeout_header(self, client):
+        """X-Request-Timeout bounds the solve; too little time left gives 504."""
+        payload = {"targets": [{"item": "Desc_IronPlate_C", "amount": 20.0}],
+                   "active_recipes": {"enable": ["Recipe_Alternate_IngotIron_C"]}}
+        ok = client.post('/api/calculate', json=payload, headers={'X-Request-Timeout': '30'})
+        assert ok.status_code == 200
+        late = client.post('/api/calculate', json=payload, headers={'X-Request-Timeout': '0.6'})
+        assert late.status_code == 504
+        bad = client.post('/api/calculate', json=payload, headers={'X-Request-Timeout': 'soon'})
+        assert bad.status_code == 400
+        for value in ('nan', 'inf'):
+            bad = client.post('/api/calculate', json=payload, headers={'X-Request-Timeout': value})
+            assert bad.status_code == 400
+
+    def test_calculate_with_sensitivity(self, client):
+        """solver.sensitivity adds shadow prices to the production graph."""
+        payload = {
+            "targets": [{"item": "Desc_IronPlate_C", "amount": 20.0}],
+            "optimization_strategy": "resource_efficiency",
+            "solver": {"sensitivity": True}
+        }
+        response = client.post('/api/calculate',
+                               data=json.dumps(payload),
+                               content_type='application/json')
+        assert response.status_code == 200
+        sensitivity = response.get_json()['production_graph']['sensitivity']
+        assert sensitivity['objective'] == 'total_base'
+        assert sensitivity['item_prices']['Desc_IronPlate_C'] > 0
+
+    def test_calculate_max_throughput(self, client):
+        """mode=max_throughput scales the target ratios up to the resource limits."""
+        payload = {
+            "targets": [{"item": "Desc_IronPlate_C", "amount": 1}],
+            "optimization_strategy": "resource_efficiency",
+            "mode": "max_throughput",
+            "resource_limits": {"Desc_OreIron_C": 120}
+        }
+        response = client.post('/api/calculate',
+                               data=json.dumps(payload),
+                               content_type='application/json')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['production_graph']['throughput']['limiting_resources'] == ["Desc_OreIron_C"]
+        assert data['summary']['base_resources']['Desc_OreIron_C'] <= 120.0 + 1e-3
+
+        response = client.post('/api/calculate',
+                               data=json.dumps({**payload, "resource_limits": {"Desc_IronPlate_C": 1}}),
+                               content_type='application/json')
+        assert response.status_code == 400
+
+    def test_calculate_resource_limits_infeasible(self, client):
+        """Caps below the cheapest possible use fail up front with details."""
+        payload = {
+            "targets": [{"item": "Desc_IronPlate_C", "amount": 100}],
+            "resource_limits": {"Desc_OreIron_C": 10}
+        }
+        response = client.post('/api/calculate',
+                               data=json.dumps(payload),
+                               content_type='application/json')
+        assert response.status_code == 400
+        data = response.get_json()
+        assert data['details'][0]['resource'] == "Desc_OreIron_C"
+        assert data['details'][0]['required_at_least'] == pytest.approx(150.0)
+
+    def test_calculate_missing_producer(self, client):
+        """A disabled intermediate is reported with the recipes that could make it."""
+        payload = {
+            "targets": [{"item": "Desc_IronPlate_C", "amount": 10}],
+            "active_recipes": {"Recipe_IronPlate_C": True}
+        }
+        response = client.post('/api/calculate',
+                               data=json.dumps(payload),
+                               content_type='application/json')
+        assert response.status_code == 400
+        details = response.get_json()['details']
+        assert details[0]['item'] == "Desc_IronIngot_C"
+        assert "Recipe_IngotIron_C" in details[0]['disabled_producers']
+
     def test_calculate_endpoint_invalid_item(self, client):
         """Test POST /api/calculate with ghost item."""
         payload = {
@@ -151,3 +270,63 @@ class TestAPI:
         assert response.status_code == 200
         data = response.get_json()
         assert data['summary']['total_recipe_nodes'] > 0
+
+    def test_planner_flows_endpoint(self, client):
+        """Test POST /api/planner/flows on a miner -> smelter chain."""
+        payload = {
+            "nodes": [
+                {"id": "miner", "data": {"isResource": True, "resourceId": "Desc_OreIron_C", "outputRate": 60}},
+                {"id": "smelter", "data": {"recipeId": "Recipe_IngotIron_C", "machineCount": 1, "efficiency": 100}}
+            ],
+            "edges": [
+                {"id": "e1", "source": "miner", "target": "smelter", "sourceHandle": "Desc_OreIron_C"}
+            ]
+        }
+        response = client.post('/api/planner/flows',
+                               data=json.dumps(payload),
+                               content_type='application/json')
+        assert response.status_code == 200
+        data = response.get_json()
+        # One smelter takes 30 ore/min; the rest stays on the miner
+        assert data['edges']['e1'] == pytest.approx(30.0)
+        assert data['nodes']['smelter']['throughput'] == pytest.approx(1.0)
+
+    def test_planner_flows_invalid_graph(self, client):
+        """Test rejection of malformed planner graphs."""
+        response = client.post('/api/planner/flows',
+                               data=json.dumps({"nodes": [{"data": {}}], "edges": []}),
+                               content_type='application/json')
+        assert response.status_code == 400
+
+    def test_item_costs_endpoint(self, client):
+        """Test GET and POST /api/item-costs."""
+        response = client.get('/api/item-costs')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['items']['Desc_IronIngot_C']['total_base'] == pytest.approx(1.0)
+
+        response = client.post('/api/item-costs',
+                               data=json.dumps({"optimization_strategy": "not_a_strategy"}),
+                               content_type='application/json')
+        assert response.status_code == 400
+
+    def test_alternate_impact_endpoint(self, client):
+        """Test POST /api/alternate-impact."""
+        payload = {
+            "targets": [{"item": "Desc_ModularFrameHeavy_C", "amount": 10}],
+            "optimization_strategy": "resource_efficiency",
+            "candidates": ["Recipe_Alternate_ModularFrameHeavy_C", "Recipe_Alternate_Wire_1_C"],
+            "time_budget": 20
+        }
+        response = client.post('/api/alternate-impact',
+                               data=json.dumps(payload),
+                               content_type='application/json')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['ranking'][0]['recipe_id'] == "Recipe_Alternate_ModularFrameHeavy_C"
+        assert data['ranking'][0]['savings'] > 0
+
+        response = client.post('/api/alternate-impact',
+                               data=json.dumps({**payload, "time_budget": -1}),
+                               content_type='application/json')
+        assert response.status_code == 400
@@ -0,0 +1,76 @@
+"""
+Unit tests for active recipe encodings.
+"""
+
+import pytest
+import base64
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.data import get_default_active_recipes, get_recipe_index, get_recipe_index_version
+from backend.services.active_recipes import (
+    resolve_active_map, encode_active_bitset, decode_active_bitset, apply_active_diff
+)
+
+
+def _enabled(active_map):
+    return {rid for rid, enabled in active_map.items() if enabled}
+
+
+class TestActiveRecipes:
+    """Test map, bitset and diff forms of active_recipes."""
+
+    def test_none_is_default(self):
+        assert resolve_active_map(None) == get_default_active_recipes()
+
+    def test_map_filters_unknown(self):
+        active = resolve_active_map({'Recipe_IronPlate_C': True, 'Recipe_Nope_C': True, 'Recipe_IngotIron_C': False})
+        assert active == {'Recipe_IronPlate_C': True, 'Recipe_IngotIron_C': False}
+
+    def test_bitset_round_trip(self):
+        defaults = get_default_active_recipes()
+        bitset = encode_active_bitset(defaults)
+        active = resolve_active_map({'bitset': bitset, 'version': get_recipe_index_version()})
+        assert _enabled(active) == _enabled(defaults)
+
+    def test_bitset_bit_order(self):
+        index = get_recipe_index()
+        bitset = encode_active_bitset({index[0]: True, index[9]: True})
+        assert _enabled(decode_active_bitset(bitset, get_recipe_index_version())) == {index[0], index[9]}
+
+    def test_bitset_version_mismatch(self):
+        bitset = encode_active_bitset({})
+        with pytest.raises(ValueError, match="version mismatch"):
+            resolve_active_map({'bitset': bitset, 'version': 'stale'})
+
+    def test_bitset_wrong_length(self):
+        with pytest.raises(ValueError, match="must encode"):
+            decode_active_bitset('AAAA', get_recipe_index_version())
+
+    def test_bitset_bits_past_end(self):
+        n = len(get_recipe_index())
+        if n % 8 == 0:
+            pytest.skip("recipe index fills its last byte")
+        bitset = encode_active_bitset({})
+        data = bytearray(base64.urlsafe_b64decode(bitset + '=' * (-len(bitset) % 4)))
+        data[-1] |= 0x80
+        bad = base64.urlsafe_b64encode(bytes(data)).decode('ascii').rstrip('=')
+        with pytest.raises(ValueError, match="past the end"):
+            decode_active_bitset(bad, get_recipe_index_version())
+
+    def test_diff(self):
+        active = resolve_active_map({'enable': ['Recipe_Alternate_IngotIron_C', 'Recipe_Nope_C'],
+                                     'disable': ['Recipe_IronPlate_C']})
+        expected = _enabled(get_default_active_recipes()) | {'Recipe_Alternate_IngotIron_C'}
+        assert _enabled(active) == expected - {'Recipe_IronPlate_C'}
+
+    def test_diff_requires_lists(self):
+        with pytest.raises(ValueError, match="list of recipe IDs"):
+            apply_active_diff('Recipe_IronPlate_C', [])
+
+    def test_not_an_object(self):
+        with pytest.raises(ValueError, match="must be an object"):
+            resolve_active_map(['Recipe_IronPlate_C'])
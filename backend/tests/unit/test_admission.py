@@ -0,0 +1,153 @@
+"""
+Unit tests for solver admission control.
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.app import create_app
+from backend.services import calculation_service
+from backend.services.admission import AdmissionController, SolverBusyError
+from backend.solvers.deadline import Deadline, SolveAbortedError, DEADLINE_MARGIN, MIN_PASS_SECONDS
+
+
+def _hold(controller, release):
+    """Occupy one slot from another thread until ``release`` is set."""
+    entered = threading.Event()
+
+    def run():
+        with controller.admit():
+            entered.set()
+            release.wait(5)
+    thread = threading.Thread(target=run)
+    thread.start()
+    entered.wait(5)
+    return thread
+
+
+class TestAdmissionController:
+    """Test slot limits, queueing and counters."""
+
+    def test_reentrant(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=0.1)
+        with controller.admit():
+            with controller.admit():
+                assert controller.stats()['active'] == 1
+        assert controller.stats()['active'] == 0
+        assert controller.stats()['admitted'] == 1
+
+    def test_queue_full_rejects(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=1)
+        release = threading.Event()
+        thread = _hold(controller, release)
+        try:
+            with pytest.raises(SolverBusyError) as exc:
+                with controller.admit():
+                    pass
+            assert exc.value.retry_after >= 1
+            assert controller.stats()['rejected_queue_full'] == 1
+        finally:
+            release.set()
+            thread.join()
+
+    def test_queue_timeout(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        release = threading.Event()
+        thread = _hold(controller, release)
+        try:
+            with pytest.raises(SolverBusyError, match="Timed out"):
+                with controller.admit():
+                    pass
+            assert controller.stats()['rejected_timeout'] == 1
+        finally:
+            release.set()
+            thread.join()
+
+    def test_queued_request_leaves_at_deadline(self):
+        """A queued request gives up its spot once its deadline leaves no time for a pass."""
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=15)
+        release = threading.Event()
+        thread = _hold(controller, release)
+        try:
+            started = time.monotonic()
+            with pytest.raises(SolveAbortedError, match="deadline"):
+                with controller.admit(Deadline(DEADLINE_MARGIN + MIN_PASS_SECONDS + 0.3)):
+                    pass
+            assert time.monotonic() - started < 2
+            stats = controller.stats()
+            assert stats['abandoned'] == 1
+            assert stats['queue_depth'] == 0
+        finally:
+            release.set()
+            thread.join()
+
+    def test_queued_request_leaves_on_disconnect(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=15)
+        release = threading.Event()
+        gone = threading.Event()
+        thread = _hold(controller, release)
+        threading.Timer(0.1, gone.set).start()
+        try:
+            started = time.monotonic()
+            with pytest.raises(SolveAbortedError, match="disconnected"):
+                with controller.admit(Deadline(is_cancelled=gone.is_set)):
+                    pass
+            assert time.monotonic() - started < 2
+        finally:
+            release.set()
+            thread.join()
+
+    def test_queued_request_runs_when_slot_frees(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5)
+        release = threading.Event()
+        thread = _hold(controller, release)
+        threading.Timer(0.05, release.set).start()
+        with controller.admit():
+            stats = controller.stats()
+        thread.join()
+        assert stats['queued_total'] == 1
+        assert stats['wait_seconds_max'] > 0
+        assert controller.stats()['queue_depth'] == 0
+
+
+class TestCalculateAdmission:
+    """Test the calculate route under a saturated controller."""
+
+    @pytest.fixture
+    def busy(self, monkeypatch):
+        controller = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=0.1)
+        monkeypatch.setattr(calculation_service, 'solver_admission', controller)
+        release = threading.Event()
+        thread = _hold(controller, release)
+        yield controller
+        release.set()
+        thread.join()
+
+    def test_solve_rejected_with_retry_after(self, busy):
+        client = create_app().test_client()
+        response = client.post('/api/calculate', json={
+            'targets': [{'item': 'Desc_IronPlate_C', 'amount': 20}],
+            'active_recipes': {'enable': ['Recipe_Alternate_IngotIron_C']}
+        })
+        assert response.status_code == 503
+        assert int(response.headers['Retry-After']) >= 1
+        assert response.get_json()['retry_after'] >= 1
+
+    def test_closed_form_bypasses_queue(self, busy):
+        client = create_app().test_client()
+        response = client.post('/api/calculate', json={
+            'targets': [{'item': 'Desc_IronPlate_C', 'amount': 20}, {'item': 'Desc_IronRod_C', 'amount': 10}]
+        })
+        assert response.status_code == 200
+        assert response.get_json()['production_graph']['closed_form']
+
+    def test_metrics_endpoint(self):
+        client = create_app().test_client()
+        stats = client.get('/api/metrics').get_json()['solver_admission']
+        assert {'active', 'queue_depth', 'wait_seconds_mean', 'rejected_queue_full'} <= set(stats)
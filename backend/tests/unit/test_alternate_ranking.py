@@ -0,0 +1,142 @@
+"""
+Unit tests for alternate recipe impact ranking.
+"""
+
+import pytest
+from unittest.mock import patch
+import os
+import subprocess
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.solvers import alternate_ranking
+from backend.solvers.alternate_ranking import rank_alternates, candidate_alternates
+from backend.solvers.deadline import Deadline, SolveAbortedError
+from backend.services.admission import AdmissionController
+from backend.solvers.milp_solver import MILPSolver
+from backend.solvers.dependency_graph import ItemGraph
+from backend.solvers.strategy_weights import get_strategy_weights
+
+
+def _slow_candidate(pid_dir, *args, **kwargs):
+    """Stands in for a candidate solve: a long-running child process, like CBC."""
+    proc = subprocess.Popen(['sleep', '30'])
+    with open(os.path.join(pid_dir, str(proc.pid)), 'w'):
+        pass
+    proc.wait()
+
+
+def _exited(pid):
+    """True once a process is gone or a zombie."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().split(') ')[1].startswith('Z')
+    except FileNotFoundError:
+        return True
+
+
+class TestAlternateRanking:
+    """Test ranking of alternates against a base plan."""
+
+    ACTIVE = {"Recipe_IngotIron_C": True, "Recipe_IronPlate_C": True}
+    TARGETS = [{"item": "Desc_IronIngot_C", "amount": 30.0}]
+
+    def test_candidates_touch_closure(self, sample_recipes):
+        """Only disabled alternates producing a closure item are candidates."""
+        assert candidate_alternates(sample_recipes, self.ACTIVE, {"Desc_IronIngot_C", "Desc_OreIron_C"}) == \
+            ["Recipe_Alternate_IngotIron_1_C"]
+        assert candidate_alternates(sample_recipes, self.ACTIVE, {"Desc_CopperIngot_C"}) == []
+
+    @patch('backend.solvers.alternate_ranking.SOLVER_PARALLEL_WORKERS', 1)
+    def test_improving_alternate_ranked(self, sample_items, sample_recipes):
+        """Pure Iron Ingot saves base resources under resource efficiency."""
+        result = rank_alternates(sample_items, sample_recipes, self.TARGETS,
+                                 "resource_efficiency", self.ACTIVE, time_budget=10)
+        assert result['baseline']['objective_components']['total_base'] == pytest.approx(30.0)
+        assert len(result['ranking']) == 1
+        entry = result['ranking'][0]
+        assert entry['rank'] == 1
+        assert entry['recipe_id'] == "Recipe_Alternate_IngotIron_1_C"
+        assert entry['recipe_used'] is True
+        # 30 ingots/min from 30 * 11/13 ore + water
+        assert entry['savings'] == pytest.approx(30.0 - 30.0 * 11.0 / 13.0, abs=1e-3)
+        assert entry['objective_deltas']['uniq_base_types'] == pytest.approx(-1.0)
+
+    @patch('backend.solvers.alternate_ranking.SOLVER_PARALLEL_WORKERS', 1)
+    def test_no_gain_alternate(self, sample_items, sample_recipes):
+        """An extra base type outweighs the savings when base types rank first."""
+        result = rank_alternates(sample_items, sample_recipes, self.TARGETS,
+                                 "resource_consolidation", self.ACTIVE, time_budget=10)
+        assert result['ranking'] == []
+        assert result['no_gain'] == ["Recipe_Alternate_IngotIron_1_C"]
+
+    def test_warm_start_matches_cold_solve(self, sample_items, sample_recipes):
+        """Starting from a feasible solution does not change the optimum."""
+        solver = MILPSolver(sample_items, sample_recipes)
+        active = {**self.ACTIVE, "Recipe_Alternate_IngotIron_1_C": True}
+        cold = solver.solve_values(self.TARGETS, "resource_efficiency", active)
+        graph = ItemGraph(sample_recipes, active)
+        items, recipes = graph.closure(["Desc_IronIngot_C"])
+        warm = solver._solve_closure(
+            self.TARGETS, "resource_efficiency", get_strategy_weights("resource_efficiency"),
+            items, sorted(recipes), 10, 0.0, graph, decompose=False,
+            warm_start={'m_values': {"Recipe_IngotIron_C": 1.0}, 'base_values': {"Desc_OreIron_C": 30.0}}
+        )
+        assert warm['objective_components'] == pytest.approx(cold['objective_components'])
+
+    @patch('backend.solvers.alternate_ranking.SOLVER_PARALLEL_WORKERS', 1)
+    def test_ranking_holds_one_admission_slot(self, sample_items, sample_recipes):
+        """The baseline, sensitivity and candidate solves all run under one admission."""
+        admission = AdmissionController(max_concurrent=1, max_queue=0)
+        rank_alternates(sample_items, sample_recipes, self.TARGETS, "resource_efficiency",
+                        self.ACTIVE, time_budget=10, admission=admission.admit)
+        assert admission.stats()['admitted'] == 1
+
+
+class TestCandidatePool:
+    """Test that candidate solves stop when the ranking does."""
+
+    @pytest.fixture
+    def slow_jobs(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(alternate_ranking, 'SOLVER_PARALLEL_WORKERS', 2)
+        monkeypatch.setattr(alternate_ranking, '_evaluate_candidate', _slow_candidate)
+        return {'a': (str(tmp_path),), 'b': (str(tmp_path),)}, tmp_path
+
+    def _wait_for_children(self, pid_dir, count):
+        for _ in range(100):
+            pids = [int(name) for name in os.listdir(pid_dir)]
+            if len(pids) == count:
+                return pids
+            time.sleep(0.05)
+        raise AssertionError("candidate processes did not start")
+
+    def test_running_candidates_killed_at_deadline(self, slow_jobs):
+        jobs, pid_dir = slow_jobs
+        ends_at = time.monotonic() + 1.5
+        started = time.monotonic()
+        results = alternate_ranking._run_jobs(jobs, lambda: ends_at - time.monotonic(), Deadline())
+
+        assert results == {}
+        assert time.monotonic() - started < 5
+        pids = self._wait_for_children(pid_dir, 2)
+        for _ in range(50):
+            if all(_exited(pid) for pid in pids):
+                break
+            time.sleep(0.1)
+        assert all(_exited(pid) for pid in pids)
+
+    def test_disconnect_aborts(self, slow_jobs):
+        jobs, pid_dir = slow_jobs
+        gone = time.monotonic() + 1.0
+        deadline = Deadline(is_cancelled=lambda: time.monotonic() > gone)
+        with pytest.raises(SolveAbortedError):
+            alternate_ranking._run_jobs(jobs, lambda: 60.0, deadline)
+        pids = self._wait_for_children(pid_dir, 2)
+        for _ in range(50):
+            if all(_exited(pid) for pid in pids):
+                break
+            time.sleep(0.1)
+        assert all(_exited(pid) for pid in pids)
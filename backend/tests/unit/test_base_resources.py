@@ -67,3 +67,19 @@ class TestBaseResources:
         # Returning copy, not reference
         resources.add("Test_Item")
         assert "Test_Item" not in base_resources.BASE_RESOURCES
+
+    def test_node_extraction_rate(self):
+        """Node output scales with extractor, purity and clock speed."""
+        assert base_resources.node_extraction_rate() == 60
+        assert base_resources.node_extraction_rate('pure', 'Desc_MinerMk3_C', 250) == 1200
+        assert base_resources.node_extraction_rate('impure', 'Desc_MinerMk2_C') == 60
+        with pytest.raises(ValueError):
+            base_resources.node_extraction_rate('rich')
+        with pytest.raises(ValueError):
+            base_resources.node_extraction_rate('normal', 'Desc_MinerMk1_C', 300)
+
+    def test_world_limits(self):
+        """Mined resources have map totals; water is unlimited."""
+        assert base_resources.get_world_limit('Desc_SAM_C') > 0
+        assert base_resources.get_world_limit('Desc_Water_C') is None
+        assert set(base_resources.WORLD_RESOURCE_LIMITS) <= base_resources.BASE_RESOURCES
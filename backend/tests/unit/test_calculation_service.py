@@ -88,3 +88,23 @@ class TestCalculationService:
         mock_solver.optimize.assert_called_once()
         args, kwargs = mock_solver.optimize.call_args
         assert kwargs['active_map'] == {"recipe1": True}
+
+    def test_build_resource_limits(self):
+        """Nodes, explicit caps and world totals combine into one cap map."""
+        limits = calculation_service.build_resource_limits(
+            resource_limits={"Desc_Coal_C": 100},
+            resource_nodes=[
+                {"resource": "Desc_OreIron_C", "purity": "pure", "extractor": "Desc_MinerMk2_C", "count": 2},
+                {"resource": "Desc_OreIron_C", "purity": "impure", "clock_speed": 250},
+            ],
+            world_limits=True
+        )
+        assert limits["Desc_OreIron_C"] == pytest.approx(2 * 240 + 75)
+        assert limits["Desc_Coal_C"] == 100
+        assert limits["Desc_SAM_C"] > 0
+        assert "Desc_Water_C" not in limits
+
+        with pytest.raises(ValueError, match="Not a base resource"):
+            calculation_service.build_resource_limits(resource_limits={"Desc_IronPlate_C": 10})
+        with pytest.raises(ValueError, match="purity"):
+            calculation_service.build_resource_limits(resource_nodes=[{"resource": "Desc_OreIron_C", "purity": "rich"}])
@@ -0,0 +1,80 @@
+"""
+Unit tests for response compression.
+"""
+
+import pytest
+import gzip
+import json
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.app import create_app
+from backend.utils import compression
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+class TestCompression:
+    """Test negotiated gzip/brotli and precompressed payloads."""
+
+    def test_identity_without_accept_encoding(self, client):
+        response = client.get('/api/recipes')
+        assert 'Content-Encoding' not in response.headers
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert response.get_json()
+
+    def test_static_gzip(self, client):
+        plain = client.get('/api/items').get_data()
+        response = client.get('/api/items', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.get_data()) == plain
+
+    def test_static_brotli_preferred(self, client):
+        brotli = pytest.importorskip("brotli")
+        plain = client.get('/api/recipes').get_data()
+        response = client.get('/api/recipes', headers={'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.get_data()) == plain
+
+    def test_static_etag(self, client):
+        etag = client.get('/api/recipes').headers['ETag']
+        response = client.get('/api/recipes', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        gz_etag = client.get('/api/recipes', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+        assert gz_etag != etag
+
+    def test_dynamic_response_compressed(self, client):
+        payload = {"targets": [{"item": "Desc_Computer_C", "amount": 5}]}
+        response = client.post('/api/calculate', json=payload, headers={'Accept-Encoding': 'gzip;q=1, br;q=0'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.get_data()))['production_graph']
+
+    def test_small_response_not_compressed(self, client):
+        response = client.get('/api/health', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+
+    def test_threshold(self, client, monkeypatch):
+        monkeypatch.setattr(compression, 'COMPRESSION_MIN_SIZE', 0)
+        response = client.get('/api/health', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.get_data()))['status'] == 'ok'
+
+    def test_refused_encoding(self, client):
+        response = client.get('/api/items', headers={'Accept-Encoding': 'gzip;q=0, br;q=0'})
+        assert 'Content-Encoding' not in response.headers
+
+    def test_compressed_before_plain(self):
+        """A compressed body requested first builds the plain one under the same lock."""
+        app = create_app()
+        payload = compression.StaticPayload(lambda: {'rates': list(range(1000))})
+        compression.STATIC_PAYLOADS.remove(payload)
+        with app.app_context():
+            data, etag = payload.body('application/json', 'gzip')
+        assert json.loads(gzip.decompress(data))['rates'][-1] == 999
+        assert etag.endswith('-gzip')
@@ -0,0 +1,75 @@
+"""
+Unit tests for MessagePack/CBOR content negotiation.
+"""
+
+import pytest
+import json
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.app import create_app
+from backend.utils import content_negotiation
+
+msgpack = pytest.importorskip("msgpack")
+cbor2 = pytest.importorskip("cbor2")
+
+CODECS = {
+    'application/msgpack': (lambda o: msgpack.packb(o, use_bin_type=True),
+                            lambda b: msgpack.unpackb(b, raw=False)),
+    'application/cbor': (cbor2.dumps, cbor2.loads)
+}
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+class TestContentNegotiation:
+    """Test Accept/Content-Type handling on the API."""
+
+    def test_json_is_default(self, client):
+        response = client.get('/api/health')
+        assert response.mimetype == 'application/json'
+        assert 'Accept' in response.headers.get('Vary', '')
+
+    def test_json_wins_wildcard(self, client):
+        response = client.get('/api/health', headers={'Accept': '*/*'})
+        assert response.mimetype == 'application/json'
+
+    @pytest.mark.parametrize("mimetype", list(CODECS))
+    def test_binary_response(self, client, mimetype):
+        _, decode = CODECS[mimetype]
+        response = client.get('/api/recipes', headers={'Accept': mimetype})
+        assert response.mimetype == mimetype
+        assert decode(response.get_data()) == client.get('/api/recipes').get_json()
+
+    @pytest.mark.parametrize("mimetype", list(CODECS))
+    def test_binary_request(self, client, mimetype):
+        encode, decode = CODECS[mimetype]
+        payload = {'targets': [{'item': 'Desc_IronPlate_C', 'amount': 20.0}]}
+        response = client.post('/api/calculate', data=encode(payload),
+                               headers={'Content-Type': mimetype, 'Accept': mimetype})
+        assert response.status_code == 200
+        assert decode(response.get_data())['targets'] == payload['targets']
+
+    def test_binary_error_response(self, client):
+        response = client.post('/api/calculate', data=msgpack.packb({}),
+                               headers={'Content-Type': 'application/msgpack',
+                                        'Accept': 'application/msgpack'})
+        assert response.status_code == 400
+        assert 'error' in msgpack.unpackb(response.get_data(), raw=False)
+
+    def test_malformed_binary_body(self, client):
+        response = client.post('/api/calculate', data=b'\xc1',
+                               headers={'Content-Type': 'application/msgpack'})
+        assert response.status_code == 400
+
+    def test_unavailable_format_falls_back_to_json(self, client, monkeypatch):
+        monkeypatch.setattr(content_negotiation, 'BINARY_FORMATS', {})
+        response = client.get('/api/health', headers={'Accept': 'application/msgpack'})
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.get_data())
@@ -0,0 +1,114 @@
+"""
+Unit tests for request deadlines and client-disconnect aborts.
+"""
+
+import pytest
+import os
+import socket
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.data import get_items, get_recipes, load_game_data
+from backend.solvers import MILPSolver, Deadline, SolveAbortedError
+from backend.solvers.deadline import DEADLINE_MARGIN
+from backend.utils.connection import disconnect_check, deadline_from_request
+
+# A closure CBC needs many seconds for when every recipe is enabled
+HEAVY_TARGET = [{'item': 'Desc_SpaceElevatorPart_9_C', 'amount': 5}]
+
+
+class TestDeadline:
+    """Test the deadline budget."""
+
+    def test_no_deadline(self):
+        deadline = Deadline()
+        assert deadline.remaining() == float('inf')
+        assert deadline.budget(0.5) == 0.5
+        assert not deadline.cancellable
+
+    def test_budget_is_clamped(self):
+        deadline = Deadline(10)
+        assert deadline.budget(30) <= 10 - DEADLINE_MARGIN
+        assert deadline.budget(2) == 2
+
+    def test_expired(self):
+        with pytest.raises(SolveAbortedError, match="deadline"):
+            Deadline(0.1).budget(20)
+
+    def test_cancelled(self):
+        with pytest.raises(SolveAbortedError, match="disconnected"):
+            Deadline(None, lambda: True).budget(20)
+
+
+class TestSolverDeadline:
+    """Test deadlines and cancellation inside MILPSolver."""
+
+    @pytest.fixture
+    def all_recipes(self):
+        # Other tests may leave mocked game data in the loader cache
+        load_game_data.cache_clear()
+        return get_items(), get_recipes(), {rid: True for rid in get_recipes()}
+
+    def test_deadline_bounds_solve(self, all_recipes):
+        items, recipes, active = all_recipes
+        start = time.monotonic()
+        graph = MILPSolver(items, recipes, deadline=Deadline(4)).optimize(
+            HEAVY_TARGET, 'compact_build', active, time_limit=20
+        )
+        assert time.monotonic() - start < 6
+        assert graph is not None
+        assert not graph['proven_optimal']
+
+    def test_disconnect_kills_cbc(self, all_recipes):
+        items, recipes, active = all_recipes
+        start = time.monotonic()
+        deadline = Deadline(None, lambda: time.monotonic() - start > 0.5)
+        with pytest.raises(SolveAbortedError):
+            MILPSolver(items, recipes, deadline=deadline).optimize(
+                HEAVY_TARGET, 'compact_build', active, time_limit=20
+            )
+        assert time.monotonic() - start < 4
+
+
+class TestDisconnectCheck:
+    """Test client-socket disconnect detection."""
+
+    def test_no_socket(self):
+        assert disconnect_check({}) is None
+
+    def test_open_then_closed(self):
+        server, client = socket.socketpair()
+        try:
+            check = disconnect_check({'gunicorn.socket': server})
+            assert check() is False
+            client.sendall(b'x')
+            assert check() is False  # unread data is not a disconnect
+            server.recv(1)
+            client.close()
+            assert check() is True
+        finally:
+            server.close()
+
+
+class TestDeadlineFromRequest:
+    """Test X-Request-Timeout parsing."""
+
+    class _Request:
+        def __init__(self, headers):
+            self.headers = headers
+            self.environ = {}
+
+    def test_no_header(self):
+        assert deadline_from_request(self._Request({})).remaining() == float('inf')
+
+    def test_timeout(self):
+        deadline = deadline_from_request(self._Request({'X-Request-Timeout': '10'}))
+        assert 9 < deadline.remaining() <= 10 - DEADLINE_MARGIN
+
+    @pytest.mark.parametrize('header', ['soon', '0', '-1', 'nan', 'inf', '-inf'])
+    def test_rejected(self, header):
+        with pytest.raises(ValueError):
+            deadline_from_request(self._Request({'X-Request-Timeout': header}))
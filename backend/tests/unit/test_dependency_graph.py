@@ -95,3 +95,111 @@ class TestDependencyGraph:
         # Since Desc_OreIron_C is a base resource, it shouldn't look for recipes for it.
         assert len(needed_recipes) == 1
         assert "Recipe_Ingot" in needed_recipes
+
+
+class TestItemGraph:
+    """Test SCC detection, topological order and reachability of ItemGraph."""
+
+    @pytest.fixture
+    def cyclic_recipes(self):
+        return {
+            # Packaging loop: Fuel needs Canister, Canister is recovered from Fuel
+            "Recipe_Fuel": {
+                "ingredients": [{"item": "Item_Oil", "amount": 1}, {"item": "Item_Canister", "amount": 1}],
+                "products": [{"item": "Item_Fuel", "amount": 1}]
+            },
+            "Recipe_Unpack": {
+                "ingredients": [{"item": "Item_Fuel", "amount": 1}],
+                "products": [{"item": "Item_Oil", "amount": 1}, {"item": "Item_Canister", "amount": 1}]
+            },
+            "Recipe_Oil": {
+                "ingredients": [{"item": "Desc_LiquidOil_C", "amount": 1}],
+                "products": [{"item": "Item_Oil", "amount": 1}]
+            },
+            "Recipe_Plate": {
+                "ingredients": [{"item": "Item_Ingot", "amount": 2}],
+                "products": [{"item": "Item_Plate", "amount": 1}]
+            },
+            "Recipe_Ingot": {
+                "ingredients": [{"item": "Desc_OreIron_C", "amount": 1}],
+                "products": [{"item": "Item_Ingot", "amount": 1}]
+            }
+        }
+
+    @pytest.fixture
+    def active_all(self, cyclic_recipes):
+        return {rid: True for rid in cyclic_recipes}
+
+    def test_cycle_detected(self, cyclic_recipes, active_all):
+        """Recipes on the packaging loop are cyclic, the plate chain is a tree."""
+        graph = dependency_graph.ItemGraph(cyclic_recipes, active_all)
+
+        assert graph.has_cycles(["Recipe_Fuel"])
+        assert graph.has_cycles(["Recipe_Unpack"])
+        assert not graph.has_cycles(["Recipe_Plate", "Recipe_Ingot", "Recipe_Oil"])
+
+        cyclic = graph.cyclic_components(["Recipe_Fuel", "Recipe_Plate"])
+        assert len(cyclic) == 1
+        items, recipes = cyclic[0]
+        assert recipes == {"Recipe_Fuel", "Recipe_Unpack"}
+        assert {"Item_Fuel", "Item_Canister"} <= items
+
+    def test_topological_items(self, cyclic_recipes, active_all):
+        """Consumers come before the items they depend on."""
+        graph = dependency_graph.ItemGraph(cyclic_recipes, active_all)
+        order = graph.topological_items(["Desc_OreIron_C", "Item_Ingot", "Item_Plate"])
+        assert order == ["Item_Plate", "Item_Ingot", "Desc_OreIron_C"]
+
+    def test_inactive_recipe_breaks_cycle(self, cyclic_recipes, active_all):
+        """Disabling the unpack recipe leaves an acyclic graph."""
+        active_all["Recipe_Unpack"] = False
+        graph = dependency_graph.ItemGraph(cyclic_recipes, active_all)
+        assert not graph.has_cycles(graph.active_recipe_ids)
+        items, recipes = graph.closure(["Item_Fuel"])
+        assert "Recipe_Unpack" not in recipes
+        assert "Desc_LiquidOil_C" in items
+
+    def test_closure_multi_is_union(self, cyclic_recipes, active_all):
+        """Multi-target closure equals the union of single closures."""
+        items, recipes = dependency_graph.dependency_closure_multi(
+            ["Item_Plate", "Item_Fuel"], cyclic_recipes, active_all
+        )
+        assert recipes == set(cyclic_recipes)
+        assert {"Desc_OreIron_C", "Desc_LiquidOil_C"} <= items
+
+    def test_graph_cached_per_active_map(self, cyclic_recipes, active_all):
+        """The same recipes and enabled set reuse one graph instance."""
+        first = dependency_graph.get_item_graph(cyclic_recipes, active_all)
+        second = dependency_graph.get_item_graph(cyclic_recipes, dict(active_all))
+        assert first is second
+
+        active_all["Recipe_Unpack"] = False
+        third = dependency_graph.get_item_graph(cyclic_recipes, active_all)
+        assert third is not first
+
+    def test_closure_cache_bounded(self, cyclic_recipes, active_all, monkeypatch):
+        """The closure cache drops the least recently used target set past its size."""
+        monkeypatch.setattr(dependency_graph, 'CLOSURE_CACHE_SIZE', 3)
+        graph = dependency_graph.ItemGraph(cyclic_recipes, active_all)
+        graph.closure(["Item_Plate"])
+        graph.closure(["Item_Fuel"])
+        graph.closure(["Item_Ingot"])
+        graph.closure(["Item_Plate"])
+        graph.closure(["Item_Oil"])
+
+        assert len(graph._closure_cache) == 3
+        assert frozenset(["Item_Fuel"]) not in graph._closure_cache
+        assert frozenset(["Item_Plate"]) in graph._closure_cache
+
+    def test_restricted_graph_cached(self, cyclic_recipes, active_all):
+        """A pruned recipe set reuses one subgraph, with its own closures."""
+        graph = dependency_graph.ItemGraph(cyclic_recipes, active_all)
+        pruned = ["Recipe_Fuel", "Recipe_Oil"]
+        first = graph.restricted(pruned)
+        assert graph.restricted(set(pruned)) is first
+        assert graph.restricted(graph.active_recipe_ids) is graph
+
+        assert first.active_recipe_ids == set(pruned)
+        assert not first.has_cycles(first.active_recipe_ids)
+        items, recipes = first.closure(["Item_Fuel"])
+        assert recipes == set(pruned)
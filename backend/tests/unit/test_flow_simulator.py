@@ -0,0 +1,138 @@
+"""
+Unit tests for the planner flow simulation.
+"""
+
+import pytest
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.solvers.flow_simulator import simulate_flows
+
+
+RECIPES = {
+    # 1 ore -> 1 ingot every 2s (30/min per machine)
+    "Smelt": {"time": 2.0, "ingredients": [{"item": "Ore", "amount": 1}], "products": [{"item": "Ingot", "amount": 1}]},
+    # 1 ore + 1 scrap -> 1 plate + 0.5 scrap every 60s
+    "Recycle": {
+        "time": 60.0,
+        "ingredients": [{"item": "Ore", "amount": 1}, {"item": "Scrap", "amount": 1}],
+        "products": [{"item": "Plate", "amount": 1}, {"item": "Scrap", "amount": 0.5}]
+    },
+    # 1 scrap -> 1 scrap every 60s (a lossless loop)
+    "Cycle": {"time": 60.0, "ingredients": [{"item": "Scrap", "amount": 1}], "products": [{"item": "Scrap", "amount": 1}]}
+}
+
+
+def _resource(node_id, item_id, rate):
+    return {"id": node_id, "data": {"isResource": True, "resourceId": item_id, "outputRate": rate}}
+
+
+def _machine(node_id, recipe_id, count=1, efficiency=100):
+    return {"id": node_id, "data": {"recipeId": recipe_id, "machineCount": count, "efficiency": efficiency}}
+
+
+def _edge(source, target, item_id, manual=None):
+    data = {} if manual is None else {"manualFlow": manual}
+    return {"id": f"{source}-{target}-{item_id}", "source": source, "target": target,
+            "sourceHandle": item_id, "targetHandle": item_id, "data": data}
+
+
+class TestSimulateFlows:
+    """Test steady-state flow propagation."""
+
+    def test_supply_limited_chain(self):
+        """A starved smelter runs at the supplied fraction and reports the bottleneck."""
+        nodes = [_resource("ore", "Ore", 15.0), _machine("smelter", "Smelt")]
+        edges = [_edge("ore", "smelter", "Ore")]
+        result = simulate_flows(nodes, edges, RECIPES)
+
+        smelter = result['nodes']['smelter']
+        assert smelter['throughput'] == pytest.approx(0.5)
+        assert smelter['outputs']['Ingot'] == pytest.approx(15.0)
+        assert smelter['theoretical_outputs']['Ingot'] == pytest.approx(30.0)
+        assert smelter['bottlenecks'] == ['Ore']
+        assert result['edges']['ore-smelter-Ore'] == pytest.approx(15.0)
+
+    def test_water_filling_and_manual_edges(self):
+        """Locked edges are served first; the rest is shared up to each consumer's intake."""
+        nodes = [
+            _resource("ore", "Ore", 100.0),
+            _machine("a", "Smelt"), _machine("b", "Smelt", count=2), _machine("c", "Smelt", count=4)
+        ]
+        edges = [_edge("ore", "a", "Ore"), _edge("ore", "b", "Ore"), _edge("ore", "c", "Ore", manual=10.0)]
+        result = simulate_flows(nodes, edges, RECIPES)
+
+        # 90 left after the locked 10: a is capped at 30, b takes the other 60
+        assert result['edges']['ore-c-Ore'] == pytest.approx(10.0)
+        assert result['edges']['ore-a-Ore'] == pytest.approx(30.0)
+        assert result['edges']['ore-b-Ore'] == pytest.approx(60.0)
+        assert result['nodes']['c']['throughput'] == pytest.approx(10.0 / 120.0)
+
+    def test_loop_reaches_fixpoint(self):
+        """A byproduct loop converges to its steady state in one call."""
+        nodes = [
+            _resource("ore", "Ore", 10.0),
+            _resource("scrap", "Scrap", 5.0),
+            _machine("recycler", "Recycle", count=10)
+        ]
+        edges = [
+            _edge("ore", "recycler", "Ore"),
+            _edge("scrap", "recycler", "Scrap"),
+            _edge("recycler", "recycler", "Scrap")
+        ]
+        result = simulate_flows(nodes, edges, RECIPES)
+
+        # throughput t = (5 + 5t) / 10 has its fixpoint at t = 1, solved without iterating
+        assert result['converged'] is True
+        assert result['iterated_loops'] == 0
+        assert result['nodes']['recycler']['throughput'] == pytest.approx(1.0)
+        assert result['nodes']['recycler']['outputs']['Plate'] == pytest.approx(10.0)
+        assert result['edges']['recycler-recycler-Scrap'] == pytest.approx(5.0)
+
+    def test_loop_with_shared_port_solved_exactly(self):
+        """A partially fed loop lands on the exact fixpoint of its water-filled regime."""
+        nodes = [
+            _resource("ore", "Ore", 10.0),
+            _resource("scrap", "Scrap", 2.0),
+            _machine("recycler", "Recycle", count=10),
+            _machine("sink", "Recycle", count=10)
+        ]
+        edges = [
+            _edge("ore", "recycler", "Ore"),
+            _edge("scrap", "recycler", "Scrap"),
+            _edge("recycler", "recycler", "Scrap"),
+            _edge("recycler", "sink", "Scrap")
+        ]
+        result = simulate_flows(nodes, edges, RECIPES)
+
+        # 5t scrap is shared with the sink: t = (2 + 2.5t) / 10, so t = 4/15
+        t = 4.0 / 15.0
+        assert result['iterated_loops'] == 0
+        assert result['nodes']['recycler']['throughput'] == pytest.approx(t)
+        assert result['edges']['recycler-sink-Scrap'] == pytest.approx(2.5 * t)
+        assert result['loop_iterations'] < 10
+
+    def test_singular_loop_falls_back_to_iteration(self):
+        """A lossless loop has no unique linear solution and is iterated instead."""
+        nodes = [_resource("scrap", "Scrap", 5.0), _machine("cycle", "Cycle", count=10)]
+        edges = [_edge("scrap", "cycle", "Scrap"), _edge("cycle", "cycle", "Scrap")]
+        result = simulate_flows(nodes, edges, RECIPES)
+
+        # t = (5 + 10t) / 10 only settles once the loop saturates
+        assert result['iterated_loops'] == 1
+        assert result['converged'] is True
+        assert result['nodes']['cycle']['throughput'] == pytest.approx(1.0)
+
+    def test_acyclic_graph_needs_no_iteration(self):
+        """Graphs without loops are settled in a single sweep."""
+        nodes = [_resource("ore", "Ore", 60.0), _machine("s1", "Smelt"), _machine("s2", "Smelt")]
+        edges = [_edge("ore", "s1", "Ore"), _edge("ore", "s2", "Ore")]
+        result = simulate_flows(nodes, edges, RECIPES)
+
+        assert result['loop_iterations'] == 0
+        assert result['iterated_loops'] == 0
+        assert result['nodes']['s1']['outputs']['Ingot'] == pytest.approx(30.0)
+        assert result['nodes']['s2']['inputs']['Ore'] == pytest.approx(30.0)
@@ -0,0 +1,112 @@
+"""
+Unit tests for the item cost service.
+"""
+
+import pytest
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.services.item_cost_service import compute_item_costs, get_item_cost_table
+from backend.data import get_default_active_recipes, load_game_data
+
+
+def _recipe(ingredients, products, time=60.0):
+    return {
+        "time": time,
+        "ingredients": [{"item": i, "amount": a} for i, a in ingredients],
+        "products": [{"item": i, "amount": a} for i, a in products]
+    }
+
+
+class TestItemCosts:
+    """Test the per-unit cost sweep."""
+
+    def test_chain_cost(self, sample_recipes):
+        """4 screws come from 1 rod = 1 ingot = 1 ore."""
+        active_map = {"Recipe_IngotIron_C": True, "Recipe_IronRod_C": True, "Recipe_Screw_C": True}
+        table = compute_item_costs(sample_recipes, active_map)
+
+        screw = table['items']['Desc_Screw_C']
+        assert screw['recipe'] == 'Recipe_Screw_C'
+        assert screw['base'] == {'Desc_OreIron_C': pytest.approx(0.25)}
+        # Per 1 screw/min: 1/40 screw machine + 0.25 * (1/15 rod + 1/30 ingot machines)
+        assert screw['machines'] == pytest.approx(1 / 40 + 0.25 * (1 / 15 + 1 / 30))
+
+    def test_cheaper_alternate_chosen(self, sample_recipes):
+        """With both smelting recipes active the one using less raw input wins."""
+        active_map = {"Recipe_IngotIron_C": True, "Recipe_Alternate_IngotIron_1_C": True}
+        ingot = compute_item_costs(sample_recipes, active_map)['items']['Desc_IronIngot_C']
+
+        assert ingot['recipe'] == 'Recipe_Alternate_IngotIron_1_C'
+        assert ingot['total_base'] == pytest.approx(11 / 13)
+
+    def test_cycle_relaxed_to_fixpoint(self):
+        """A rubber/plastic recycling loop converges to its cheapest steady cost."""
+        recipes = {
+            "Rubber": _recipe([("Desc_LiquidOil_C", 3)], [("Desc_Rubber_C", 1)]),
+            "RecycledPlastic": _recipe([("Desc_Rubber_C", 1), ("Desc_LiquidOil_C", 1)], [("Desc_Plastic_C", 2)]),
+            "RecycledRubber": _recipe([("Desc_Plastic_C", 1), ("Desc_LiquidOil_C", 1)], [("Desc_Rubber_C", 2)]),
+        }
+        table = compute_item_costs(recipes, {rid: True for rid in recipes})
+
+        # R = (P + 1) / 2 and P = (R + 1) / 2 meet at 1 oil each
+        assert table['items']['Desc_Rubber_C']['total_base'] == pytest.approx(1.0, abs=1e-6)
+        assert table['items']['Desc_Plastic_C']['total_base'] == pytest.approx(1.0, abs=1e-6)
+        assert table['items']['Desc_Rubber_C']['recipe'] == 'RecycledRubber'
+
+    def test_strategy_priorities_rank_recipes(self):
+        """resource_efficiency takes the cheaper two-step chain, compact_build the single recipe."""
+        recipes = {
+            "Direct": _recipe([("Desc_OreIron_C", 3)], [("Desc_IronPlate_C", 1)]),
+            "ViaIngot": _recipe([("Desc_IronIngot_C", 1)], [("Desc_IronPlate_C", 1)]),
+            "Ingot": _recipe([("Desc_OreIron_C", 1)], [("Desc_IronIngot_C", 1)]),
+        }
+        active_map = {rid: True for rid in recipes}
+        efficient = compute_item_costs(recipes, active_map, priorities=['total_base', 'uniq_base_types', 'uniq_recipes'])
+        compact = compute_item_costs(recipes, active_map, priorities=['uniq_recipes', 'uniq_base_types', 'total_base'])
+
+        assert efficient['items']['Desc_IronPlate_C']['recipe'] == 'ViaIngot'
+        assert efficient['items']['Desc_IronPlate_C']['recipe_count'] == 2
+        assert compact['items']['Desc_IronPlate_C']['recipe'] == 'Direct'
+        assert compact['items']['Desc_IronPlate_C']['total_base'] == pytest.approx(3.0)
+
+    def test_unconverged_loop_unresolved(self):
+        """A loop whose cost keeps shrinking is reported unresolved, as is everything it feeds."""
+        recipes = {
+            "Ingot": _recipe([("Desc_OreIron_C", 1)], [("Desc_IronIngot_C", 1)]),
+            "Multiply": _recipe([("Desc_IronIngot_C", 100)], [("Desc_IronIngot_C", 101)]),
+            "Plate": _recipe([("Desc_IronIngot_C", 2)], [("Desc_IronPlate_C", 1)]),
+            "Wire": _recipe([("Desc_OreCopper_C", 1)], [("Desc_Wire_C", 2)]),
+        }
+        table = compute_item_costs(recipes, {rid: True for rid in recipes})
+
+        assert table['unresolved'] == ['Desc_IronIngot_C', 'Desc_IronPlate_C']
+        assert table['items']['Desc_IronIngot_C'] is None
+        assert table['items']['Desc_IronPlate_C'] is None
+        assert table['items']['Desc_Wire_C']['total_base'] == pytest.approx(0.5)
+        assert 'Desc_IronPlate_C' not in table['unreachable']
+
+    def test_strategies_cached_separately(self):
+        """Each strategy's ranking gets its own table."""
+        # Other tests may leave mocked game data in the loader cache
+        load_game_data.cache_clear()
+        efficient = get_item_cost_table(strategy='resource_efficiency')
+        compact = get_item_cost_table(strategy='compact_build')
+
+        assert efficient['priorities'] == ['total_base', 'uniq_base_types', 'uniq_recipes']
+        assert compact['priorities'][0] == 'uniq_recipes'
+        assert efficient['items'] is not compact['items']
+
+    def test_default_table_cached(self):
+        """Tables are cached per active-map fingerprint."""
+        # Other tests may leave mocked game data in the loader cache
+        load_game_data.cache_clear()
+        first = get_item_cost_table()
+        second = get_item_cost_table(get_default_active_recipes())
+
+        assert first['fingerprint'] == second['fingerprint']
+        assert first['items'] is second['items']
+        assert first['items']['Desc_IronPlate_C']['base'] == {'Desc_OreIron_C': pytest.approx(1.5)}
@@ -3,13 +3,18 @@ Unit tests for core MILP solver.
 """
 
 import pytest
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from unittest.mock import patch
 import os
 import sys
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from backend.solvers.milp_solver import MILPSolver
+from backend.solvers.milp_solver import MILPSolver, parse_cbc_log, relative_gap
+from backend.solvers.deadline import Deadline, SolveAbortedError, DEADLINE_MARGIN
 
 class TestMILPSolver:
     """Test MILP optimization logic."""
@@ -103,3 +108,158 @@ class TestMILPSolver:
         """Test targeting unknown item."""
         with pytest.raises(ValueError, match="Unknown target item"):
             solver.optimize("Ghost_Item", 1.0, "balanced_production", {})
+
+    def test_closed_form_fast_path(self, solver):
+        """Acyclic single-recipe chains skip CBC and are proven optimal."""
+        active_map = {"Recipe_IngotIron_C": True, "Recipe_IronRod_C": True, "Recipe_Screw_C": True}
+        with patch('backend.solvers.milp_solver.PULP_CBC_CMD') as mock_cbc:
+            result = solver.optimize(targets=[{"item": "Desc_Screw_C", "amount": 40.0}],
+                                     strategy="balanced_production", active_map=active_map)
+            mock_cbc.assert_not_called()
+
+        assert result['closed_form'] is True
+        assert result['proven_optimal'] is True
+        machines = {n['recipe_id']: n['machines_needed'] for n in result['recipe_nodes'].values()}
+        # 40 screws/min = 10 rods/min = 10 ingots/min
+        assert machines["Recipe_Screw_C"] == pytest.approx(1.0)
+        assert machines["Recipe_IronRod_C"] == pytest.approx(10.0 / 15.0, abs=1e-4)
+        assert machines["Recipe_IngotIron_C"] == pytest.approx(10.0 / 30.0, abs=1e-4)
+        assert result['objective_components']['total_base'] == pytest.approx(10.0)
+
+    def test_closed_form_skipped_with_alternatives(self, solver):
+        """Two active recipes for one item require the MILP."""
+        active_map = {"Recipe_IngotIron_C": True, "Recipe_Alternate_IngotIron_1_C": True}
+        result = solver.optimize(targets=[{"item": "Desc_IronIngot_C", "amount": 30.0}],
+                                 strategy="resource_efficiency", active_map=active_map)
+        assert result['closed_form'] is False
+        assert result['solver_passes']
+        for p in result['solver_passes']:
+            assert p['relative_gap'] is not None
+            assert p['best_bound'] <= p['objective'] + 1e-6
+        assert result['optimality_gap'] == max(p['relative_gap'] for p in result['solver_passes'])
+
+    def test_parse_cbc_log(self):
+        """Bound and node count are read from a time-limited CBC log."""
+        log = (
+            "Cbc0010I After 500 nodes, 12 on tree, 28 best solution, best possible 6.4790 (5.21 seconds)\n"
+            "Result - Stopped on time limit\n\n"
+            "Objective value:                28.00000000\n"
+            "Lower bound:                    6.479\n"
+            "Gap:                            3.32\n"
+            "Enumerated nodes:               500\n"
+        )
+        stats = parse_cbc_log(log)
+        assert stats['objective'] == pytest.approx(28.0)
+        assert stats['lower_bound'] == pytest.approx(6.479)
+        assert stats['best_possible'] == pytest.approx(6.479)
+        assert stats['nodes'] == 500
+        assert stats['stopped_on_gap'] is False
+        assert relative_gap(28.0, 6.479) == pytest.approx((28.0 - 6.479) / 28.0)
+        assert relative_gap(0.0, 0.0) == 0.0
+        assert relative_gap(28.0, None) is None
+
+    def test_lp_relaxation_bound(self, solver):
+        """The LP bound runs through _run_cbc within the time left, and is skipped without any."""
+        from pulp import LpProblem, LpVariable, LpMinimize
+        model = LpProblem('bound', LpMinimize)
+        x = LpVariable('x', lowBound=0, cat='Integer')
+        model += x
+        model += 2 * x >= 3
+        x.varValue = 2
+
+        with patch.object(solver, '_run_cbc', wraps=solver._run_cbc) as run_cbc:
+            assert solver._lp_relaxation_bound(model, 0.5) is None
+            run_cbc.assert_not_called()
+
+            assert solver._lp_relaxation_bound(model, 5.0) == pytest.approx(1.5)
+            assert run_cbc.call_args.args[1] == 5
+        assert x.cat == 'Integer'
+        assert x.varValue == 2
+
+    def test_analyze_sensitivity(self, solver):
+        """Shadow prices follow the chosen recipes; a cheaper unused recipe has negative reduced cost."""
+        active_map = {"Recipe_IngotIron_C": True, "Recipe_IronPlate_C": True,
+                      "Recipe_Alternate_IngotIron_1_C": True}
+        targets = [{"item": "Desc_IronPlate_C", "amount": 20.0}]
+        result = solver.analyze_sensitivity(targets, "resource_efficiency", active_map,
+                                            {"Recipe_IngotIron_C", "Recipe_IronPlate_C"})
+
+        assert result['objective'] == 'total_base'
+        assert result['objective_value'] == pytest.approx(30.0)
+        assert result['item_prices']['Desc_IronIngot_C'] == pytest.approx(1.0)
+        assert result['item_prices']['Desc_IronPlate_C'] == pytest.approx(1.5)
+        assert result['base_prices']['Desc_OreIron_C'] == pytest.approx(1.0)
+
+        # Pure Iron Ingot: 55 base/min for 65 ingots/min against ingots priced at 1.0
+        alt = result['recipe_reduced_costs']['Recipe_Alternate_IngotIron_1_C']
+        assert alt['product'] == 'Desc_IronIngot_C'
+        assert alt['reduced_cost'] == pytest.approx(-10.0)
+        assert alt['reduced_cost_per_unit'] == pytest.approx(-10.0 / 65.0)
+
+    def test_sensitivity_binding_cap(self, solver):
+        """A binding water cap gets a nonzero price and raises water's base price."""
+        active_map = {"Recipe_IngotIron_C": True, "Recipe_IronPlate_C": True,
+                      "Recipe_Alternate_IngotIron_1_C": True}
+        used = set(active_map)
+        targets = [{"item": "Desc_IronPlate_C", "amount": 20.0}]
+        result = solver.analyze_sensitivity(targets, "resource_efficiency", active_map, used,
+                                            resource_limits={"Desc_Water_C": 5.0})
+
+        # One more water/min moves 3.25 ingots to Pure Iron: 2.75 base instead of 3.25
+        assert result['cap_prices']['Desc_Water_C'] == pytest.approx(-0.5)
+        assert result['base_prices']['Desc_Water_C'] == pytest.approx(1.5)
+        assert result['base_prices']['Desc_OreIron_C'] == pytest.approx(1.0)
+
+    def test_sensitivity_runs_under_admission(self, sample_items, sample_recipes):
+        """The sensitivity LP waits for an admission slot like every other solve."""
+        entered = []
+
+        @contextmanager
+        def admit():
+            entered.append(True)
+            yield
+
+        solver = MILPSolver(sample_items, sample_recipes, admission=admit)
+        active_map = {"Recipe_IngotIron_C": True, "Recipe_IronPlate_C": True}
+        solver.analyze_sensitivity([{"item": "Desc_IronPlate_C", "amount": 20.0}],
+                                   "resource_efficiency", active_map, set(active_map))
+        assert entered == [True]
+
+    def test_block_wait_stops_at_deadline(self, sample_items, sample_recipes):
+        """Unfinished block solves are cancelled and the solve aborted at the deadline."""
+        solver = MILPSolver(sample_items, sample_recipes, deadline=Deadline(DEADLINE_MARGIN + 0.3))
+        futures = [Future(), Future()]
+        started = time.monotonic()
+        with pytest.raises(SolveAbortedError):
+            solver._wait_blocks(futures)
+        assert time.monotonic() - started < 2
+        assert all(f.cancelled() for f in futures)
+
+    def test_block_wait_stops_on_disconnect(self, sample_items, sample_recipes):
+        solver = MILPSolver(sample_items, sample_recipes, deadline=Deadline(is_cancelled=lambda: True))
+        future = Future()
+        with pytest.raises(SolveAbortedError):
+            solver._wait_blocks([future])
+        assert future.cancelled()
+
+    def test_maximize_throughput(self, solver):
+        """Output grows until the capped resource runs out."""
+        active_map = {"Recipe_IngotIron_C": True, "Recipe_IronPlate_C": True}
+        result = solver.maximize_throughput(
+            [{"item": "Desc_IronPlate_C", "amount": 1.0}], {"Desc_OreIron_C": 60.0},
+            "resource_efficiency", active_map
+        )
+        # 60 ore -> 60 ingots -> 40 plates
+        assert result['throughput']['scale'] == pytest.approx(40.0, rel=1e-5)
+        assert result['targets'][0]['amount'] == pytest.approx(40.0, rel=1e-5)
+        assert result['throughput']['limiting_resources'] == ["Desc_OreIron_C"]
+        assert result['objective_components']['total_base'] <= 60.0 + 1e-6
+
+    def test_maximize_throughput_unbounded(self, solver):
+        """Without a cap on the resources used, throughput has no limit."""
+        active_map = {"Recipe_IngotIron_C": True, "Recipe_IronPlate_C": True}
+        with pytest.raises(ValueError, match="unbounded"):
+            solver.maximize_throughput(
+                [{"item": "Desc_IronPlate_C", "amount": 1.0}], {"Desc_OreCopper_C": 60.0},
+                "resource_efficiency", active_map
+            )
@@ -3,6 +3,7 @@ Unit tests for multi-target optimization in the MILP solver.
 """
 
 import pytest
+from unittest.mock import patch
 import os
 import sys
 
@@ -130,6 +131,70 @@ class TestMultiTargetOptimization:
         for node in result['recipe_nodes'].values():
             assert node['is_base_resource'] is True
 
+    def test_independent_blocks_decomposed(self, solver):
+        """Targets sharing no intermediate or base item are solved as separate blocks."""
+        targets = [
+            {"item": "Desc_IronIngot_C", "amount": 65.0},
+            {"item": "Desc_CopperIngot_C", "amount": 20.0}
+        ]
+        # Two iron ingot recipes force the MILP path instead of the closed form
+        active_map = {
+            "Recipe_IngotIron_C": True,
+            "Recipe_Alternate_IngotIron_1_C": True,
+            "Recipe_IngotCopper_C": True
+        }
+
+        with patch('backend.solvers.milp_solver.SOLVER_PARALLEL_WORKERS', 2):
+            decomposed = solver.optimize(targets=targets, strategy="resource_efficiency", active_map=active_map)
+        with patch('backend.solvers.milp_solver.SOLVER_PARALLEL_WORKERS', 1):
+            monolithic = solver.optimize(targets=targets, strategy="resource_efficiency", active_map=active_map)
+
+        assert decomposed['independent_blocks'] == 2
+        assert monolithic['independent_blocks'] == 1
+        for key, val in monolithic['objective_components'].items():
+            assert decomposed['objective_components'][key] == pytest.approx(val, rel=1e-6)
+
+        copper_output = sum(n['outputs'].get('Desc_CopperIngot_C', 0) for n in decomposed['recipe_nodes'].values())
+        assert copper_output == pytest.approx(20.0)
+
+
+    def test_blocks_sharing_base_split_leading_passes(self, sample_items, sample_recipes):
+        """Blocks sharing only a base resource solve the passes above base types separately."""
+        recipes = dict(sample_recipes)
+        recipes["Recipe_Test_CopperFromIron_C"] = {
+            "id": "Recipe_Test_CopperFromIron_C",
+            "name": "Copper Ingot (Iron)",
+            "time": 2.0,
+            "ingredients": [{"item": "Desc_OreIron_C", "amount": 2}],
+            "products": [{"item": "Desc_CopperIngot_C", "amount": 1}],
+            "producedIn": ["Desc_SmelterMk1_C"],
+            "alternate": True
+        }
+        solver = MILPSolver(sample_items, recipes)
+        targets = [
+            {"item": "Desc_IronIngot_C", "amount": 65.0},
+            {"item": "Desc_CopperIngot_C", "amount": 20.0}
+        ]
+        active_map = {
+            "Recipe_IngotIron_C": True,
+            "Recipe_Alternate_IngotIron_1_C": True,
+            "Recipe_IngotCopper_C": True,
+            "Recipe_Test_CopperFromIron_C": True
+        }
+
+        with patch('backend.solvers.milp_solver.SOLVER_PARALLEL_WORKERS', 2):
+            split = solver.optimize(targets=targets, strategy="balanced_production", active_map=active_map)
+        with patch('backend.solvers.milp_solver.SOLVER_PARALLEL_WORKERS', 1):
+            monolithic = solver.optimize(targets=targets, strategy="balanced_production", active_map=active_map)
+
+        assert split['independent_blocks'] == 2
+        assert monolithic['independent_blocks'] == 1
+        assert list(split['objective_components']) == list(monolithic['objective_components'])
+        for key, val in monolithic['objective_components'].items():
+            assert split['objective_components'][key] == pytest.approx(val, rel=1e-6)
+        # uniq_recipes ran once per block, the base-type and total passes on the whole plan
+        blocks = [p.get('block') for p in split['solver_passes']]
+        assert blocks == [0, 1, None, None]
 
 class TestMultiTargetAPI:
     """Integration tests for multi-target API endpoint."""
@@ -0,0 +1,89 @@
+"""
+Unit tests for the precomputed plan service.
+"""
+
+import pytest
+from unittest.mock import patch
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.services import precomputed_plans
+from backend.data import get_default_active_recipes, load_game_data, get_items, get_recipes
+from backend.solvers.milp_solver import MILPSolver
+
+
+class TestPrecomputedPlans:
+    """Test lookup and linear scaling of precomputed plans."""
+
+    @pytest.fixture(autouse=True)
+    def require_table(self):
+        # Other tests may leave mocked game data in the loader cache
+        load_game_data.cache_clear()
+        precomputed_plans.get_default_active_set.cache_clear()
+        precomputed_plans.load_precomputed_table.cache_clear()
+        if precomputed_plans.load_precomputed_table() is None:
+            pytest.skip("Precomputed plan table not built")
+
+    def test_scaled_plan_machine_counts(self):
+        """Iron Plate at 60/min needs 3 constructors and 3 smelters."""
+        targets = [{"item": "Desc_IronPlate_C", "amount": 60.0}]
+        graph = precomputed_plans.get_precomputed_plan(
+            targets, 'balanced_production', get_default_active_recipes()
+        )
+
+        assert graph is not None
+        assert graph['precomputed'] is True
+        assert graph['proven_optimal'] is True
+        machines = {n['recipe_id']: n['machines_needed'] for n in graph['recipe_nodes'].values()}
+        assert machines['Recipe_IronPlate_C'] == pytest.approx(3.0)
+        assert machines['Recipe_IngotIron_C'] == pytest.approx(3.0)
+        assert graph['objective_components']['total_base'] == pytest.approx(90.0)
+        assert graph['objective_components']['uniq_recipes'] == pytest.approx(2.0)
+
+    def test_same_schema_as_solver(self):
+        """Precomputed and solved responses carry the same top-level keys."""
+        targets = [{"item": "Desc_IronPlate_C", "amount": 60.0}]
+        active_map = get_default_active_recipes()
+        graph = precomputed_plans.get_precomputed_plan(targets, 'balanced_production', active_map)
+        solved = MILPSolver(get_items(), get_recipes()).optimize(
+            targets=targets, strategy='balanced_production', active_map=active_map
+        )
+
+        assert set(graph) - {'precomputed'} == set(solved)
+        assert graph['closed_form'] == solved['closed_form']
+        assert graph['independent_blocks'] == solved['independent_blocks']
+        assert graph['model_reduction'] == solved['model_reduction']
+
+    def test_non_default_map_not_served(self):
+        """A modified active map must go to the solver."""
+        active_map = get_default_active_recipes()
+        active_map['Recipe_Alternate_PureIronIngot_C'] = True
+        targets = [{"item": "Desc_IronPlate_C", "amount": 60.0}]
+        assert precomputed_plans.get_precomputed_plan(targets, 'balanced_production', active_map) is None
+
+    def test_multi_target_and_custom_not_served(self):
+        """Only single-target requests with built-in strategies match."""
+        active_map = get_default_active_recipes()
+        targets = [{"item": "Desc_IronPlate_C", "amount": 10.0}, {"item": "Desc_IronRod_C", "amount": 10.0}]
+        assert precomputed_plans.get_precomputed_plan(targets, 'balanced_production', active_map) is None
+        single = [{"item": "Desc_IronPlate_C", "amount": 10.0}]
+        assert precomputed_plans.get_precomputed_plan(single, 'custom', active_map) is None
+
+    def test_big_m_overflow_not_served(self):
+        """Amounts beyond the Big-M bounds fall back to the solver."""
+        targets = [{"item": "Desc_IronPlate_C", "amount": 1e7}]
+        assert precomputed_plans.get_precomputed_plan(
+            targets, 'balanced_production', get_default_active_recipes()
+        ) is None
+
+    def test_stale_table_ignored(self):
+        """A fingerprint mismatch disables the table."""
+        precomputed_plans.load_precomputed_table.cache_clear()
+        try:
+            with patch.object(precomputed_plans, 'compute_table_fingerprint', return_value='stale'):
+                assert precomputed_plans.load_precomputed_table() is None
+        finally:
+            precomputed_plans.load_precomputed_table.cache_clear()
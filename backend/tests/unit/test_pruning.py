@@ -0,0 +1,80 @@
+"""
+Unit tests for closure pruning.
+"""
+
+import pytest
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.solvers.pruning import prune_closure
+from backend.solvers.dependency_graph import ItemGraph
+from backend.solvers.milp_solver import MILPSolver
+from backend.solvers.strategy_weights import get_strategy_weights
+
+
+class TestPruneClosure:
+    """Test removal of unreachable and dominated recipes."""
+
+    @pytest.fixture
+    def recipes(self, sample_recipes):
+        recipes = dict(sample_recipes)
+        # Same product from more ore, but twice as fast
+        recipes["Recipe_Alternate_WastefulIngot_C"] = {
+            "id": "Recipe_Alternate_WastefulIngot_C",
+            "name": "Wasteful Ingot",
+            "time": 1.0,
+            "ingredients": [{"item": "Desc_OreIron_C", "amount": 2}],
+            "products": [{"item": "Desc_IronIngot_C", "amount": 1}],
+            "producedIn": ["Desc_SmelterMk1_C"],
+            "alternate": True
+        }
+        # Needs screws, which nothing active produces here
+        recipes["Recipe_Alternate_ScrewedPlate_C"] = {
+            "id": "Recipe_Alternate_ScrewedPlate_C",
+            "name": "Screwed Plate",
+            "time": 6.0,
+            "ingredients": [{"item": "Desc_Screw_C", "amount": 4}, {"item": "Desc_IronIngot_C", "amount": 1}],
+            "products": [{"item": "Desc_IronPlate_C", "amount": 2}],
+            "producedIn": ["Desc_AssemblerMk1_C"],
+            "alternate": True
+        }
+        return recipes
+
+    ACTIVE = {"Recipe_IngotIron_C": True, "Recipe_IronPlate_C": True,
+              "Recipe_Alternate_WastefulIngot_C": True, "Recipe_Alternate_ScrewedPlate_C": True}
+    TARGETS = [{"item": "Desc_IronPlate_C", "amount": 20.0}]
+
+    def _prune(self, recipes, strategy):
+        graph = ItemGraph(recipes, self.ACTIVE)
+        items, recipe_ids = graph.closure(["Desc_IronPlate_C"])
+        return prune_closure(self.TARGETS, items, recipe_ids, graph, recipes, get_strategy_weights(strategy))
+
+    def test_prunes_unreachable_and_dominated(self, recipes):
+        """Recipes needing screws and recipes using more ore are dropped."""
+        items, recipe_ids, stats = self._prune(recipes, "resource_efficiency")
+        assert recipe_ids == {"Recipe_IngotIron_C", "Recipe_IronPlate_C"}
+        assert "Desc_Screw_C" not in items
+        assert stats['unreachable_recipes'] == 1
+        assert stats['dominated_recipes'] == 1
+        assert stats['binaries_eliminated'] == 2
+        assert stats['variables_eliminated'] == 4
+
+    def test_keeps_faster_recipe_when_machines_count(self, recipes):
+        """With a machine weight, a faster recipe is not dominated."""
+        weights = {"base": 1.0, "base_types": 0.0, "machines": 1.0, "recipes": 0.0}
+        graph = ItemGraph(recipes, self.ACTIVE)
+        items, recipe_ids = graph.closure(["Desc_IronPlate_C"])
+        _, kept, stats = prune_closure(self.TARGETS, items, recipe_ids, graph, recipes, weights)
+        assert "Recipe_Alternate_WastefulIngot_C" in kept
+        assert stats['dominated_recipes'] == 0
+
+    def test_optimize_reports_reduction(self, sample_items, recipes):
+        """optimize solves the pruned closure and reports what was removed."""
+        solver = MILPSolver(sample_items, recipes)
+        result = solver.optimize(targets=self.TARGETS, strategy="resource_efficiency", active_map=self.ACTIVE)
+        assert result['model_reduction']['dominated_recipes'] == 1
+        assert result['closed_form'] is True
+        assert result['objective_components']['total_base'] == pytest.approx(30.0)
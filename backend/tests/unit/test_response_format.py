@@ -0,0 +1,92 @@
+"""
+Unit tests for compact and columnar response formats.
+"""
+
+import pytest
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.services.response_format import format_production_response, node_kind
+
+
+def _response():
+    return {
+        'target_item': 'Desc_IronPlate_C',
+        'summary': {'total_machines': 3.0},
+        'production_graph': {
+            'recipe_nodes': {
+                'Recipe_IronPlate_C_0': {
+                    'recipe_id': 'Recipe_IronPlate_C', 'item_id': 'Desc_IronPlate_C',
+                    'recipe_name': 'Iron Plate', 'machine_type': 'Desc_ConstructorMk1_C',
+                    'machines_needed': 2.0, 'machine_display': '2 Constructors',
+                    'is_base_resource': False, 'recipe_data': {'id': 'Recipe_IronPlate_C'},
+                    'inputs': {'Desc_OreIron_C': 60.0}, 'outputs': {'Desc_IronPlate_C': 40.0}
+                },
+                'Desc_OreIron_C_base': {
+                    'recipe_id': 'extract_Desc_OreIron_C', 'item_id': 'Desc_OreIron_C',
+                    'machines_needed': 0, 'is_base_resource': True,
+                    'inputs': {}, 'outputs': {'Desc_OreIron_C': 60.0}
+                },
+                'end_product_Desc_IronPlate_C': {
+                    'recipe_id': 'end_product_Desc_IronPlate_C', 'item_id': 'Desc_IronPlate_C',
+                    'machines_needed': 0, 'is_base_resource': False, 'is_end_product_node': True,
+                    'inputs': {'Desc_IronPlate_C': 40.0}, 'outputs': {}
+                }
+            },
+            'edges': [
+                {'source': 'Desc_OreIron_C_base', 'target': 'Recipe_IronPlate_C_0',
+                 'item': 'Desc_OreIron_C', 'rate': 60.0}
+            ],
+            'strategy': 'balanced_production',
+            'proven_optimal': True
+        }
+    }
+
+
+class TestResponseFormat:
+    """Test re-shaping of calculate responses."""
+
+    def test_full_is_unchanged(self):
+        response = _response()
+        assert format_production_response(response) is response
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError, match="Unknown response format"):
+            format_production_response(_response(), 'xml')
+
+    def test_node_kind(self):
+        nodes = _response()['production_graph']['recipe_nodes']
+        assert [node_kind(n) for n in nodes.values()] == ['recipe', 'base', 'end']
+        assert node_kind({'is_surplus_node': True}) == 'surplus'
+
+    def test_compact(self):
+        out = format_production_response(_response(), 'compact')
+        graph = out['production_graph']
+        assert out['format'] == 'compact'
+        assert out['summary'] == {'total_machines': 3.0}
+        assert graph['strategy'] == 'balanced_production'
+        assert 'recipe_nodes' not in graph
+        assert graph['nodes'][0] == {
+            'id': 'Recipe_IronPlate_C_0', 'kind': 'recipe', 'recipe': 'Recipe_IronPlate_C',
+            'item': 'Desc_IronPlate_C', 'machines': 2.0,
+            'in': {'Desc_OreIron_C': 60.0}, 'out': {'Desc_IronPlate_C': 40.0}
+        }
+        assert graph['nodes'][1]['recipe'] is None
+        assert graph['edges'] == [['Desc_OreIron_C_base', 'Recipe_IronPlate_C_0', 'Desc_OreIron_C', 60.0]]
+
+    def test_columnar(self):
+        graph = format_production_response(_response(), 'columnar')['production_graph']
+        nodes = graph['nodes']
+        assert nodes['id'] == ['Recipe_IronPlate_C_0', 'Desc_OreIron_C_base', 'end_product_Desc_IronPlate_C']
+        assert nodes['kind'] == ['recipe', 'base', 'end']
+        assert nodes['recipe'] == ['Recipe_IronPlate_C', None, None]
+        assert nodes['machines'] == [2.0, 0, 0]
+        rates = graph['rates']
+        assert list(zip(rates['node'], rates['item'], rates['rate'])) == [
+            (0, 'Desc_OreIron_C', -60.0), (0, 'Desc_IronPlate_C', 40.0),
+            (1, 'Desc_OreIron_C', 60.0), (2, 'Desc_IronPlate_C', -40.0)
+        ]
+        assert graph['edges']['rate'] == [60.0]
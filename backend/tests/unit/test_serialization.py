@@ -0,0 +1,56 @@
+"""
+Unit tests for response serialization.
+"""
+
+import pytest
+import json
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.utils import serialization
+
+
+@pytest.fixture(params=[True, False], ids=['orjson', 'stdlib'])
+def encoder(request, monkeypatch):
+    """Run a test with orjson (when installed) and with the stdlib fallback."""
+    if request.param and not serialization.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(serialization, 'ORJSON_AVAILABLE', request.param)
+    return serialization
+
+
+class TestSerialization:
+    """Test single-pass JSON encoding."""
+
+    def test_non_finite_to_null(self, encoder):
+        data = {'a': float('nan'), 'b': [1.5, float('inf'), {'c': float('-inf')}]}
+        assert json.loads(encoder.encode_json(data)) == {'a': None, 'b': [1.5, None, {'c': None}]}
+
+    def test_keeps_key_order(self, encoder):
+        data = {'z': 1, 'a': 2}
+        assert encoder.encode_json(data) == b'{"z":1,"a":2}'
+
+    def test_pretty(self, encoder):
+        assert encoder.encode_json({'a': 1}, pretty=True) == b'{\n  "a": 1\n}'
+
+    def test_default_hook(self, encoder):
+        class Point:
+            pass
+        assert encoder.encode_json({'p': Point()}, default=lambda o: 'point') == b'{"p":"point"}'
+
+    def test_round_trip(self, encoder):
+        data = {'targets': [{'item': 'Desc_IronPlate_C', 'amount': 20.0}], 'name': 'Eisenplatte ä'}
+        assert encoder.decode_json(encoder.encode_json(data)) == data
+        assert encoder.decode_json(encoder.encode_json(data).decode('utf-8')) == data
+
+    def test_app_provider(self, encoder):
+        from backend.app import create_app
+        app = create_app()
+        with app.app_context():
+            from flask import jsonify
+            response = jsonify({'x': float('nan'), 'y': 1})
+        assert response.get_data() == b'{"x":null,"y":1}\n'
+        assert response.mimetype == 'application/json'
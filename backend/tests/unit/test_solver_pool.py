@@ -0,0 +1,202 @@
+"""
+Unit tests for the persistent HiGHS solver workers.
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from pulp import LpProblem, LpVariable, LpMinimize, LpMaximize, LpBinary, PULP_CBC_CMD, value
+
+from backend.data import get_items, get_recipes, load_game_data
+from backend.solvers import MILPSolver, Deadline, SolveAbortedError, SolverWorkerPool, SolverWorkerError
+from backend.solvers import solver_pool
+from backend.solvers.solver_pool import compile_model, apply_solution, solve_compiled
+
+pytestmark = pytest.mark.skipif(not solver_pool.HIGHSPY_AVAILABLE, reason="highspy not installed")
+
+# A closure CBC and HiGHS need many seconds for when every recipe is enabled
+HEAVY_TARGET = [{'item': 'Desc_SpaceElevatorPart_9_C', 'amount': 5}]
+
+
+def _knapsack():
+    """Small MILP with equality, inequality and binary constraints."""
+    model = LpProblem('knapsack', LpMaximize)
+    x = LpVariable('x', lowBound=0, upBound=10)
+    y = LpVariable('y', lowBound=0)
+    use = LpVariable('use', cat=LpBinary)
+    model += 3 * x + 2 * y - 5 * use + 1
+    model += x + y <= 8
+    model += y >= 1
+    model += x <= 10 * use
+    model += x - y == 2
+    return model, x, y, use
+
+
+class TestCompileModel:
+    """Test compiling PuLP models to arrays."""
+
+    def test_arrays(self):
+        model, x, y, use = _knapsack()
+        variables, compiled = compile_model(model)
+        names = [v.name for v in variables]
+        assert compiled['maximize']
+        assert compiled['offset'] == 1
+        assert compiled['cost'][names.index('x')] == 3
+        assert compiled['cost'][names.index('use')] == -5
+        assert list(compiled['integer']) == [names.index('use')]
+        assert compiled['col_upper'][names.index('x')] == 10
+        assert compiled['col_upper'][names.index('y')] == float('inf')
+        assert len(compiled['row_lower']) == 4
+        assert len(compiled['row_start']) == 5
+        # x - y == 2 is an equality row
+        assert compiled['row_lower'][3] == compiled['row_upper'][3] == 2
+        assert compiled['initial'] is None
+
+    def test_start_values(self):
+        model, x, y, use = _knapsack()
+        x.setInitialValue(5)
+        variables, compiled = compile_model(model, warm_start=True, start={'y': 3, 'use': 1})
+        index, values = compiled['initial']
+        got = {variables[j].name: v for j, v in zip(index, values)}
+        assert got == {'x': 5, 'y': 3, 'use': 1}
+
+
+class TestSolveCompiled:
+    """Test solving compiled models in-process."""
+
+    def test_matches_cbc(self):
+        model, x, y, use = _knapsack()
+        model.solve(PULP_CBC_CMD(msg=False))
+        expected = value(model.objective)
+
+        model, x, y, use = _knapsack()
+        variables, compiled = compile_model(model)
+        status, values, stats = solve_compiled(compiled, 10, 0.0)
+        apply_solution(variables, values)
+        assert status == 'Optimal'
+        assert value(model.objective) == pytest.approx(expected)
+        assert stats['objective'] == pytest.approx(expected)
+        assert stats['lower_bound'] == pytest.approx(expected)
+        assert x.varValue == pytest.approx(5)
+
+    def test_infeasible(self):
+        model = LpProblem('infeasible', LpMinimize)
+        x = LpVariable('x', lowBound=0, cat='Integer')
+        model += x
+        model += x >= 3
+        model += x <= 2
+        variables, compiled = compile_model(model)
+        status, values, _ = solve_compiled(compiled, 10, 0.0)
+        assert status == 'Infeasible'
+        assert values is None
+
+
+class TestSolverWorkerPool:
+    """Test the worker processes."""
+
+    @pytest.fixture
+    def pool(self):
+        pool = SolverWorkerPool(size=1)
+        yield pool
+        pool.close()
+
+    def test_worker_reused(self, pool):
+        for _ in range(3):
+            _, compiled = compile_model(_knapsack()[0])
+            status, values, _ = pool.solve(compiled, 10, 0.0)
+            assert status == 'Optimal'
+        stats = pool.stats()
+        assert stats['started'] == 1
+        assert stats['idle'] == 1
+        assert stats['replaced'] == 0
+
+    def test_dead_worker_replaced(self, pool):
+        _, compiled = compile_model(_knapsack()[0])
+        pool.solve(compiled, 10, 0.0)
+        worker = pool._idle.get_nowait()
+        worker.process.kill()
+        worker.process.join()
+        pool._idle.put(worker)
+        status, _, _ = pool.solve(compiled, 10, 0.0)
+        assert status == 'Optimal'
+        assert pool.stats()['started'] == 2
+
+    def test_worker_error(self, pool):
+        with pytest.raises(SolverWorkerError):
+            pool.solve({'cost': []}, 10, 0.0)
+        # The worker survives a failed solve
+        _, compiled = compile_model(_knapsack()[0])
+        assert pool.solve(compiled, 10, 0.0)[0] == 'Optimal'
+        assert pool.stats()['started'] == 1
+
+    def test_slot_wait_bounded(self, pool):
+        """A solve gives up waiting for a busy pool at its wait limit or on disconnect."""
+        _, compiled = compile_model(_knapsack()[0])
+        pool._slots.acquire()
+        try:
+            started = time.monotonic()
+            with pytest.raises(SolveAbortedError):
+                pool.solve(compiled, 10, 0.0, wait_limit=0.5)
+            assert time.monotonic() - started < 2
+            with pytest.raises(SolveAbortedError):
+                pool.solve(compiled, 10, 0.0, cancelled=lambda: True)
+        finally:
+            pool._slots.release()
+        assert pool.solve(compiled, 10, 0.0)[0] == 'Optimal'
+
+
+class TestHighsEngine:
+    """Test MILPSolver passes on the HiGHS workers."""
+
+    @pytest.fixture(autouse=True)
+    def highs_engine(self, monkeypatch):
+        # Other tests may leave mocked game data in the loader cache
+        load_game_data.cache_clear()
+        monkeypatch.setattr(solver_pool, 'SOLVER_ENGINE', 'highs')
+        yield
+        load_game_data.cache_clear()
+
+    def test_same_objectives_as_cbc(self, monkeypatch):
+        recipes = get_recipes()
+        active = {rid: True for rid in recipes}
+        targets = [{'item': 'Desc_ModularFrame_C', 'amount': 10}]
+        highs = MILPSolver(get_items(), recipes).optimize(targets, 'compact_build', active)
+
+        monkeypatch.setattr(solver_pool, 'SOLVER_ENGINE', 'cbc')
+        cbc = MILPSolver(get_items(), recipes).optimize(targets, 'compact_build', active)
+
+        assert highs['solver_passes']
+        for name, val in cbc['objective_components'].items():
+            assert highs['objective_components'][name] == pytest.approx(val, rel=1e-6)
+        assert all(p['threads'] == 1 for p in highs['solver_passes'])
+
+    def test_failed_worker_falls_back_to_cbc(self, monkeypatch):
+        def broken(*args, **kwargs):
+            raise SolverWorkerError("worker exited")
+
+        monkeypatch.setattr('backend.solvers.milp_solver.run_compiled', broken)
+        recipes = get_recipes()
+        active = {rid: True for rid in recipes}
+        result = MILPSolver(get_items(), recipes).optimize(
+            [{'item': 'Desc_ModularFrame_C', 'amount': 10}], 'compact_build', active
+        )
+        assert result['objective_components']['uniq_recipes'] == pytest.approx(5)
+
+    def test_cancel_kills_worker(self):
+        cancel = threading.Event()
+        recipes = get_recipes()
+        active = {rid: True for rid in recipes}
+        solver = MILPSolver(get_items(), recipes, deadline=Deadline(is_cancelled=cancel.is_set))
+        threading.Timer(0.5, cancel.set).start()
+
+        started = time.monotonic()
+        with pytest.raises(SolveAbortedError):
+            solver.optimize(HEAVY_TARGET, 'compact_build', active)
+        assert time.monotonic() - started < 5
+        assert solver_pool.get_solver_pool().stats()['replaced'] >= 1
@@ -0,0 +1,137 @@
+"""
+Unit tests for the CBC thread policy and the shared count of CBC runs.
+"""
+
+import pytest
+import os
+import sys
+import threading
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.data import get_items, get_recipes, load_game_data
+from backend.solvers import MILPSolver, threads_for
+from backend.solvers import thread_policy
+from backend.solvers.thread_policy import ActiveRunCounter
+from backend.app import create_app
+
+
+class TestThreadsFor:
+    """Test the thread share of one run."""
+
+    def test_idle_server_gets_all_cores(self):
+        assert threads_for(1, cores=8, max_threads=8, reserved_cores=0) == 8
+
+    def test_cores_split_across_runs(self):
+        assert threads_for(2, cores=8, max_threads=8, reserved_cores=0) == 4
+        assert threads_for(3, cores=8, max_threads=8, reserved_cores=0) == 2
+        assert threads_for(4, cores=8, max_threads=8, reserved_cores=0) == 2
+
+    def test_at_least_one_thread(self):
+        assert threads_for(20, cores=8, max_threads=8, reserved_cores=0) == 1
+        assert threads_for(1, cores=1, max_threads=8, reserved_cores=4) == 1
+        assert threads_for(0, cores=4, max_threads=8, reserved_cores=0) == 4
+
+    def test_capped_by_max_threads(self):
+        assert threads_for(1, cores=32, max_threads=8, reserved_cores=0) == 8
+        assert threads_for(1, cores=32, max_threads=1, reserved_cores=0) == 1
+
+    def test_reserved_cores(self):
+        assert threads_for(1, cores=8, max_threads=8, reserved_cores=2) == 6
+        assert threads_for(2, cores=8, max_threads=8, reserved_cores=2) == 3
+
+
+class TestActiveRunCounter:
+    """Test counting runs through lock files."""
+
+    def test_counts_nested_runs(self, tmp_path):
+        counter = ActiveRunCounter(str(tmp_path))
+        assert counter.count() == 0
+        with counter.track():
+            assert counter.count() == 1
+            with counter.track():
+                assert counter.count() == 2
+            assert counter.count() == 1
+        assert counter.count() == 0
+        assert not [n for n in os.listdir(tmp_path) if n.startswith('cbc_run_')]
+
+    def test_shared_between_counters(self, tmp_path):
+        """Counters on the same directory (as in separate workers) see each other's runs."""
+        first = ActiveRunCounter(str(tmp_path))
+        second = ActiveRunCounter(str(tmp_path))
+        with first.track():
+            assert second.count() == 1
+
+    @pytest.mark.skipif(not thread_policy.FCNTL_AVAILABLE, reason="needs fcntl")
+    def test_stale_marker_removed(self, tmp_path):
+        """A marker nobody holds a lock on belongs to a dead process."""
+        stale = tmp_path / 'cbc_run_dead'
+        stale.write_text('')
+        counter = ActiveRunCounter(str(tmp_path))
+        assert counter.count() == 0
+        assert not stale.exists()
+
+    def test_concurrent_runs(self, tmp_path):
+        counter = ActiveRunCounter(str(tmp_path))
+        inside = threading.Barrier(4)
+        seen = []
+
+        def run():
+            with counter.track():
+                inside.wait(timeout=5)
+                seen.append(counter.count())
+                inside.wait(timeout=5)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert seen == [4, 4, 4, 4]
+        assert counter.count() == 0
+
+    def test_unusable_directory_counts_locally(self, tmp_path):
+        blocker = tmp_path / 'file'
+        blocker.write_text('')
+        counter = ActiveRunCounter(str(blocker / 'state'))
+        with counter.track():
+            assert counter.count() == 1
+        assert counter.count() == 0
+
+
+class TestSolverThreads:
+    """Test that solver passes report their thread count."""
+
+    @pytest.fixture(autouse=True)
+    def real_data(self):
+        # Other tests may leave mocked game data in the loader cache
+        load_game_data.cache_clear()
+        yield
+        load_game_data.cache_clear()
+
+    def test_passes_report_threads(self, monkeypatch):
+        seen = []
+        real_threads_for = threads_for
+
+        def fake_threads_for(active_runs):
+            seen.append(active_runs)
+            return real_threads_for(active_runs, cores=1)
+
+        monkeypatch.setattr('backend.solvers.milp_solver.threads_for', fake_threads_for)
+        recipes = get_recipes()
+        active = {rid: True for rid in recipes}
+        solver = MILPSolver(get_items(), recipes)
+        result = solver.optimize([{'item': 'Desc_ModularFrame_C', 'amount': 10}], 'compact_build', active)
+
+        assert result['solver_passes']
+        assert all(p['threads'] == 1 for p in result['solver_passes'])
+        # The run counts itself
+        assert seen and all(n >= 1 for n in seen)
+
+    def test_metrics_report_thread_policy(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        stats = app.test_client().get('/api/metrics').get_json()['cbc_threads']
+        assert stats['cores'] >= 1
+        assert stats['next_run_threads'] == threads_for(stats['active_runs'] + 1)
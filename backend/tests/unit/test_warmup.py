@@ -0,0 +1,102 @@
+"""
+Unit tests for lazy loading of the solver stack and the startup warm-up.
+"""
+
+import pytest
+import os
+import subprocess
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.app import create_app
+from backend.data import load_game_data
+from backend.services import warmup
+from backend.services.warmup import run_warmup, start_warmup, get_warmup_stats, WARMUP_STEPS
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+
+def _run_fresh(code, **env):
+    """Run code in a fresh interpreter and return its stdout."""
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=dict(os.environ, **env),
+                            capture_output=True, text=True, check=True, timeout=120)
+    return result.stdout.strip()
+
+
+class TestLazyImports:
+    """Test that startup does not load the solver stack."""
+
+    def test_create_app_skips_solver_stack(self):
+        out = _run_fresh(
+            "import sys; from backend.app import create_app; create_app(); "
+            "print(sorted(m for m in ('pulp', 'backend.solvers.milp_solver', "
+            "'backend.services.calculation_service') if m in sys.modules))",
+            STARTUP_WARMUP='0'
+        )
+        assert out == '[]'
+
+    def test_solver_loads_on_first_use(self):
+        out = _run_fresh(
+            "import sys; from backend.app import create_app; c = create_app().test_client(); "
+            "c.get('/api/items'); before = 'pulp' in sys.modules; "
+            "r = c.post('/api/calculate', json={'targets': [{'item': 'Desc_IronPlate_C', 'amount': 30}]}); "
+            "print(before, 'pulp' in sys.modules, r.status_code)",
+            STARTUP_WARMUP='0'
+        )
+        assert out == 'False True 200'
+
+    def test_lazy_package_exports(self):
+        from backend.solvers import MILPSolver, rank_alternates
+        from backend.solvers.milp_solver import MILPSolver as direct
+        from backend.services import calculate_production
+        assert MILPSolver is direct
+        assert callable(rank_alternates) and callable(calculate_production)
+        import backend.solvers
+        with pytest.raises(AttributeError):
+            backend.solvers.not_an_export
+
+
+class TestWarmup:
+    """Test the warm-up steps and thread."""
+
+    @pytest.fixture(autouse=True)
+    def real_data(self):
+        # Other tests may leave mocked game data in the loader cache
+        load_game_data.cache_clear()
+        yield
+        load_game_data.cache_clear()
+
+    def test_run_warmup(self):
+        steps = run_warmup(create_app())
+        assert list(steps) == [name for name, _ in WARMUP_STEPS]
+        assert all(seconds >= 0 for seconds in steps.values())
+        assert 'backend.services.calculation_service' in sys.modules
+        stats = get_warmup_stats()
+        assert stats['state'] == 'done'
+        assert stats['error'] is None
+
+    def test_failed_step_stops(self, monkeypatch):
+        def broken(app):
+            raise RuntimeError("disk gone")
+
+        monkeypatch.setattr(warmup, 'WARMUP_STEPS', [WARMUP_STEPS[0], ('broken', broken), WARMUP_STEPS[2]])
+        steps = run_warmup(create_app())
+        assert list(steps) == [WARMUP_STEPS[0][0]]
+        stats = get_warmup_stats()
+        assert stats['state'] == 'failed'
+        assert stats['error'] == 'broken: disk gone'
+
+    def test_started_once_per_process(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(warmup, '_started', False)
+        monkeypatch.setattr(warmup, 'run_warmup', lambda app: calls.append(app))
+        app = create_app()
+        assert start_warmup(app)
+        assert not start_warmup(app)
+
+    def test_metrics_report_warmup(self):
+        stats = create_app().test_client().get('/api/metrics').get_json()['warmup']
+        assert stats['state'] in ('idle', 'running', 'done', 'failed')
+        assert isinstance(stats['steps'], dict)
@@ -2,11 +2,23 @@
 # Contains utility functions for math, machines, etc.
 
 from .math_helpers import round_to_precision, clean_nan_values
+from .serialization import encode_json, decode_json, FastJSONProvider, ORJSON_AVAILABLE
+from .content_negotiation import NegotiatingJSONProvider, ApiRequest, negotiate_mimetype
+from .compression import StaticPayload, init_compression, compress_response
+from .connection import disconnect_check
 from .machine_helpers import get_machine_display_name, calculate_machine_info, MACHINE_DISPLAY_NAMES
 
 __all__ = [
     # Math
     'round_to_precision', 'clean_nan_values',
+    # Serialization
+    'encode_json', 'decode_json', 'FastJSONProvider', 'ORJSON_AVAILABLE',
+    # Content negotiation
+    'NegotiatingJSONProvider', 'ApiRequest', 'negotiate_mimetype',
+    # Compression
+    'StaticPayload', 'init_compression', 'compress_response',
+    # Connection
+    'disconnect_check',
     # Machine
     'get_machine_display_name', 'calculate_machine_info', 'MACHINE_DISPLAY_NAMES'
 ]
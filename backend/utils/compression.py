@@ -0,0 +1,148 @@
+"""
+Response compression for Satisfactory Factory Calculator.
+Negotiated gzip/brotli for API responses, and precompressed immutable payloads.
+
+Dynamic responses at least ``COMPRESSION_MIN_SIZE`` bytes long are compressed in an
+``after_request`` hook with the best encoding the client accepts (brotli first when the
+optional ``brotli`` package is installed). Static payloads (``StaticPayload``) encode and
+compress their body once per representation and serve it with an ETag, so repeated
+/api/items and /api/recipes requests cost no encoding work.
+"""
+
+import gzip
+import hashlib
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, Response, current_app, request, has_request_context
+
+from ..config import (
+    COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY,
+    STATIC_COMPRESSION_GZIP_LEVEL, STATIC_COMPRESSION_BROTLI_QUALITY
+)
+from .content_negotiation import JSON_MIMETYPE, BINARY_FORMATS, encode_body, negotiate_mimetype
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Mimetypes worth compressing (JSON and the binary API formats)
+COMPRESSIBLE_MIMETYPES = frozenset({JSON_MIMETYPE, *BINARY_FORMATS})
+
+
+def available_encodings() -> List[str]:
+    """Supported content codings, preferred first."""
+    return ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+
+
+def negotiate_encoding() -> Optional[str]:
+    """Best content coding for the current request, or None for identity."""
+    if not COMPRESSION_ENABLED or not has_request_context() or 'Accept-Encoding' not in request.headers:
+        return None
+    accepted = request.accept_encodings
+    for encoding in available_encodings():
+        if accepted[encoding] > 0:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str, static: bool = False) -> bytes:
+    """Compress with the configured level (the static levels for precompressed payloads)."""
+    if encoding == 'br':
+        quality = STATIC_COMPRESSION_BROTLI_QUALITY if static else COMPRESSION_BROTLI_QUALITY
+        return brotli.compress(data, quality=quality)
+    level = STATIC_COMPRESSION_GZIP_LEVEL if static else COMPRESSION_GZIP_LEVEL
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_response(response: Response) -> Response:
+    """``after_request`` hook: compress large API responses the client accepts compressed."""
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESSION_MIN_SIZE:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+# Every StaticPayload, warmed by init_compression
+STATIC_PAYLOADS: List['StaticPayload'] = []
+
+
+class StaticPayload:
+    """
+    Response body that never changes while the process runs, kept encoded and compressed.
+
+    ``build`` returns the object to serve; it is called once. Each (mimetype, encoding)
+    representation is produced on first use, and ``warm`` produces the JSON ones up front.
+    """
+
+    def __init__(self, build: Callable[[], Any]):
+        self._build = build
+        self._obj = None
+        self._bodies: Dict[Tuple[str, Optional[str]], Tuple[bytes, str]] = {}
+        # Reentrant: a compressed body builds the plain one under the same lock
+        self._lock = threading.RLock()
+        STATIC_PAYLOADS.append(self)
+
+    def body(self, mimetype: str, encoding: Optional[str]) -> Tuple[bytes, str]:
+        """Encoded (and compressed) body with its ETag."""
+        key = (mimetype, encoding)
+        cached = self._bodies.get(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            if key not in self._bodies:
+                if encoding is None:
+                    if self._obj is None:
+                        self._obj = self._build()
+                    data = encode_body(self._obj, mimetype, current_app.json.default)
+                    etag = hashlib.sha256(data).hexdigest()[:16]
+                    self._bodies[key] = (data, etag)
+                else:
+                    data, etag = self.body(mimetype, None)
+                    self._bodies[key] = (compress(data, encoding, static=True), f'{etag}-{encoding}')
+            return self._bodies[key]
+
+    def warm(self) -> None:
+        """Encode and compress the JSON representations."""
+        self.body(JSON_MIMETYPE, None)
+        if COMPRESSION_ENABLED:
+            for encoding in available_encodings():
+                self.body(JSON_MIMETYPE, encoding)
+
+    def response(self) -> Response:
+        """Response for the current request's Accept and Accept-Encoding headers."""
+        mimetype = negotiate_mimetype()
+        encoding = negotiate_encoding()
+        data, etag = self.body(mimetype, encoding)
+        response = current_app.response_class(data, mimetype=mimetype)
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        if BINARY_FORMATS:
+            response.vary.add('Accept')
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Register the compression hook.
+    The static payloads are compressed by the startup warm-up, or on first request.
+    """
+    if COMPRESSION_ENABLED:
+        app.after_request(compress_response)
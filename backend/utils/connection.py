@@ -0,0 +1,60 @@
+"""
+Client connection helpers for Satisfactory Factory Calculator.
+Detects a client that closed its connection while its request is still being worked on.
+"""
+
+import math
+import select
+import socket
+from typing import Any, Callable, Dict, Optional
+
+from ..solvers.deadline import Deadline
+
+# WSGI environ keys under which servers expose the client socket
+SOCKET_ENVIRON_KEYS = ('gunicorn.socket', 'werkzeug.socket')
+# Header carrying the client's own timeout (seconds)
+TIMEOUT_HEADER = 'X-Request-Timeout'
+
+
+def disconnect_check(environ: Dict[str, Any]) -> Optional[Callable[[], bool]]:
+    """
+    Callable that returns True once the request's client has closed the connection.
+
+    The socket is peeked without consuming data: it is closed when it is readable and
+    yields no bytes. Returns None if the server does not expose the socket.
+    """
+    sock = next((environ[k] for k in SOCKET_ENVIRON_KEYS if environ.get(k) is not None), None)
+    if sock is None:
+        return None
+
+    def is_disconnected() -> bool:
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+            if not readable:
+                return False
+            return sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b''
+        except BlockingIOError:
+            return False
+        except (OSError, ValueError):
+            return True
+    return is_disconnected
+
+
+def deadline_from_request(request) -> Deadline:
+    """
+    Deadline for a Flask request: its X-Request-Timeout header (if sent) and a check
+    for the client disconnecting.
+
+    Raises:
+        ValueError: If the header is not a positive, finite number of seconds.
+    """
+    timeout_header = request.headers.get(TIMEOUT_HEADER)
+    timeout = None
+    if timeout_header is not None:
+        try:
+            timeout = float(timeout_header)
+        except ValueError:
+            raise ValueError(f"{TIMEOUT_HEADER} must be a number of seconds")
+        if not math.isfinite(timeout) or timeout <= 0:
+            raise ValueError(f"{TIMEOUT_HEADER} must be a positive, finite number of seconds")
+    return Deadline(timeout, is_cancelled=disconnect_check(request.environ))
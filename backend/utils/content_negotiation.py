@@ -0,0 +1,129 @@
+"""
+Content negotiation for Satisfactory Factory Calculator.
+MessagePack and CBOR request/response bodies alongside the default JSON.
+
+Responses: every ``jsonify`` result is encoded in the best match for the request's
+``Accept`` header among JSON and the installed binary formats; JSON wins ties and is used
+when nothing acceptable is installed. Requests: ``request.json`` also decodes bodies sent
+as MessagePack or CBOR (by ``Content-Type``).
+
+msgpack and cbor2 are optional dependencies; a format is offered only if its package is
+installed. Binary formats keep non-finite floats as IEEE values instead of null.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Request, request, has_request_context
+
+from .serialization import FastJSONProvider, encode_json
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import cbor2
+    CBOR_AVAILABLE = True
+except ImportError:
+    CBOR_AVAILABLE = False
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack', 'application/vnd.msgpack')
+CBOR_MIMETYPE = 'application/cbor'
+
+
+def _plain(default: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Wrap a JSON ``default`` hook so NumPy arrays and scalars also encode."""
+    def hook(obj):
+        if hasattr(obj, 'tolist'):
+            return obj.tolist()
+        return default(obj)
+    return hook
+
+
+def _msgpack_encode(obj: Any, default: Callable[[Any], Any]) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True, default=_plain(default))
+
+
+def _msgpack_decode(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _cbor_encode(obj: Any, default: Callable[[Any], Any]) -> bytes:
+    hook = _plain(default)
+    return cbor2.dumps(obj, default=lambda encoder, value: encoder.encode(hook(value)))
+
+
+def _cbor_decode(data: bytes) -> Any:
+    return cbor2.loads(data)
+
+
+def _binary_formats() -> Dict[str, Tuple[Callable, Callable]]:
+    """Installed binary formats: mimetype -> (encode, decode)."""
+    formats = {}
+    if MSGPACK_AVAILABLE:
+        for mimetype in MSGPACK_MIMETYPES:
+            formats[mimetype] = (_msgpack_encode, _msgpack_decode)
+    if CBOR_AVAILABLE:
+        formats[CBOR_MIMETYPE] = (_cbor_encode, _cbor_decode)
+    return formats
+
+
+BINARY_FORMATS = _binary_formats()
+
+
+def negotiate_mimetype() -> str:
+    """Best response mimetype for the current request's Accept header (JSON by default)."""
+    if not BINARY_FORMATS or not has_request_context():
+        return JSON_MIMETYPE
+    return request.accept_mimetypes.best_match([JSON_MIMETYPE, *BINARY_FORMATS]) or JSON_MIMETYPE
+
+
+def encode_body(obj: Any, mimetype: str, default: Callable[[Any], Any]) -> bytes:
+    """Encode an object as compact JSON or one of the installed binary formats."""
+    if mimetype == JSON_MIMETYPE:
+        return encode_json(obj, default=default)
+    encode, _ = BINARY_FORMATS[mimetype]
+    return encode(obj, default)
+
+
+class NegotiatingJSONProvider(FastJSONProvider):
+    """JSON provider whose responses follow the request's Accept header."""
+
+    def response(self, *args: Any, **kwargs: Any):
+        mimetype = negotiate_mimetype()
+        if mimetype == JSON_MIMETYPE:
+            rv = super().response(*args, **kwargs)
+        else:
+            obj = self._prepare_response_obj(args, kwargs)
+            rv = self._app.response_class(encode_body(obj, mimetype, self.default), mimetype=mimetype)
+        if BINARY_FORMATS:
+            rv.vary.add('Accept')
+        return rv
+
+
+class ApiRequest(Request):
+    """Request whose ``get_json``/``json`` also decode MessagePack and CBOR bodies."""
+
+    def get_json(self, force: bool = False, silent: bool = False, cache: bool = True) -> Optional[Any]:
+        codec = BINARY_FORMATS.get(self.mimetype)
+        if codec is None:
+            return super().get_json(force=force, silent=silent, cache=cache)
+        if cache and self._cached_json[silent] is not Ellipsis:
+            return self._cached_json[silent]
+
+        _, decode = codec
+        try:
+            rv = decode(self.get_data(cache=cache))
+        except Exception as e:
+            if not silent:
+                return self.on_json_loading_failed(ValueError(str(e)))
+            rv = None
+            if cache:
+                self._cached_json = (self._cached_json[0], rv)
+        else:
+            if cache:
+                self._cached_json = (rv, rv)
+        return rv
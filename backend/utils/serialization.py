@@ -0,0 +1,78 @@
+"""
+Response serialization for Satisfactory Factory Calculator.
+Single-pass JSON encoding that writes NaN/Infinity as null.
+
+orjson is used when installed; it already encodes non-finite floats as null and keeps dict
+insertion order. The stdlib fallback encodes with ``allow_nan=False`` and only on the rare
+ValueError re-encodes a copy with the non-finite values replaced.
+"""
+
+import json
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+from .math_helpers import clean_nan_values
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def encode_json(obj: Any, pretty: bool = False, default=None) -> bytes:
+    """
+    Encode an object as UTF-8 JSON with NaN/Infinity written as null.
+
+    Args:
+        obj: Object to encode
+        pretty: Indent by two spaces instead of compact separators
+        default: Called for objects the encoder cannot handle
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+
+    kwargs = {'default': default, 'ensure_ascii': False, 'allow_nan': False}
+    if pretty:
+        kwargs['indent'] = 2
+    else:
+        kwargs['separators'] = (',', ':')
+    try:
+        text = json.dumps(obj, **kwargs)
+    except ValueError:
+        text = json.dumps(clean_nan_values(obj), **kwargs)
+    return text.encode('utf-8')
+
+
+def decode_json(data: Any) -> Any:
+    """Decode JSON text or UTF-8 bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by ``encode_json``/``decode_json``.
+
+    Keys keep insertion order instead of being sorted, so both encoders give the same output.
+    """
+
+    sort_keys = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return encode_json(obj, pretty='indent' in kwargs, default=self.default).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return decode_json(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            encode_json(obj, pretty=pretty, default=self.default) + b'\n', mimetype=self.mimetype
+        )
@@ -2,8 +2,10 @@ import type {
     Item,
     Recipe,
     CalculateRequest,
-    CalculateResponse
+    CalculateResponse,
+    PlannerFlowsResponse
 } from '@/types';
+import type { PlannerNode, PlannerEdge } from '@/stores/plannerStore';
 import { MOCK_ITEMS, MOCK_RECIPES, MOCK_CALCULATION } from './mockData';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || '';
@@ -117,6 +119,25 @@ export const api = {
             body: JSON.stringify(params),
         });
     },
+
+    /**
+      * Compute steady-state flows for a planner graph
+      */
+    simulatePlannerFlows: async (nodes: PlannerNode[], edges: PlannerEdge[]): Promise<PlannerFlowsResponse> => {
+        return request('/api/planner/flows', {
+            method: 'POST',
+            body: JSON.stringify({
+                nodes: nodes.map(n => ({ id: n.id, data: n.data })),
+                edges: edges.map(e => ({
+                    id: e.id,
+                    source: e.source,
+                    target: e.target,
+                    sourceHandle: e.sourceHandle,
+                    data: { manualFlow: e.data?.manualFlow },
+                })),
+            }),
+        });
+    },
 };
 
 export { APIError };
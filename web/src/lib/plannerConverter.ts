@@ -4,7 +4,7 @@
  * and handles .sfc file import/export.
  */
 
-import { CalculateResponse, RecipeNode } from '@/types';
+import { CalculateResponse, FlowEdge, ProductionGraph, RecipeNode } from '@/types';
 import { PlannerNode, PlannerEdge, PlannerNodeData } from '@/stores/plannerStore';
 import ELK from 'elkjs/lib/elk.bundled.js';
 
@@ -21,6 +21,55 @@ export interface SFCFile {
 
 const elk = new ELK();
 
+/**
+ * Producer -> consumer flows for a production graph.
+ * Uses the server-routed edge list when present, otherwise splits each consumer's
+ * input across all producers in proportion to their output.
+ */
+function collectFlows(productionGraph: ProductionGraph): FlowEdge[] {
+    const recipeNodes = productionGraph.recipe_nodes;
+
+    if (productionGraph.edges) {
+        // Drop flows into target/surplus sinks, which have no planner node
+        return productionGraph.edges.filter(e => e.target in recipeNodes && e.source in recipeNodes);
+    }
+
+    const itemProducers: Map<string, { nodeId: string; amount: number }[]> = new Map();
+    const itemTotalProduction: Map<string, number> = new Map();
+
+    Object.entries(recipeNodes).forEach(([nodeId, recipeNode]) => {
+        Object.entries(recipeNode.outputs).forEach(([itemId, amount]) => {
+            const currentProducers = itemProducers.get(itemId) || [];
+            currentProducers.push({ nodeId, amount });
+            itemProducers.set(itemId, currentProducers);
+            itemTotalProduction.set(itemId, (itemTotalProduction.get(itemId) || 0) + amount);
+        });
+    });
+
+    const flows: FlowEdge[] = [];
+    Object.entries(recipeNodes).forEach(([nodeId, recipeNode]) => {
+        if (recipeNode.is_base_resource || recipeNode.is_end_product_node || recipeNode.is_surplus_node) {
+            return;
+        }
+
+        Object.entries(recipeNode.inputs).forEach(([itemId, inputAmount]) => {
+            const producers = itemProducers.get(itemId);
+            const totalProduction = itemTotalProduction.get(itemId) || 0;
+
+            if (producers && totalProduction > 0 && inputAmount > 0) {
+                producers.forEach(producer => {
+                    // (ProducerOutput / TotalOutput) * ConsumerInput
+                    const flowShare = (producer.amount / totalProduction) * inputAmount;
+                    if (flowShare > 0.001) {
+                        flows.push({ source: producer.nodeId, target: nodeId, item: itemId, rate: flowShare });
+                    }
+                });
+            }
+        });
+    });
+    return flows;
+}
+
 /**
  * Convert Calculator API response to Factory Planner nodes and edges.
  * Uses ELK for proper hierarchical layout.
@@ -32,19 +81,13 @@ export async function convertCalculationToPlannerAsync(response: CalculateRespon
     const nodes: PlannerNode[] = [];
     const edges: PlannerEdge[] = [];
 
-    // Track which node produces which items and how much
-    interface ProducerInfo {
-        nodeId: string;
-        amount: number;
-    }
-    const itemProducers: Map<string, ProducerInfo[]> = new Map(); // itemId -> producers[]
-    const itemTotalProduction: Map<string, number> = new Map();   // itemId -> totalAmount
+    const flows = collectFlows(production_graph);
 
     // Build ELK graph structure
     const elkNodes: any[] = [];
     const elkEdges: any[] = [];
 
-    // First pass: Create nodes and track producers
+    // Create ELK nodes
     const nodeEntries = Object.entries(recipeNodes);
 
     nodeEntries.forEach(([nodeId, recipeNode]) => {
@@ -57,44 +100,13 @@ export async function convertCalculationToPlannerAsync(response: CalculateRespon
             width,
             height,
         });
-
-        // Track which items this node produces
-        Object.entries(recipeNode.outputs).forEach(([itemId, amount]) => {
-            const currentProducers = itemProducers.get(itemId) || [];
-            currentProducers.push({ nodeId, amount });
-            itemProducers.set(itemId, currentProducers);
-
-            const currentTotal = itemTotalProduction.get(itemId) || 0;
-            itemTotalProduction.set(itemId, currentTotal + amount);
-        });
     });
 
-    // Second pass: Create edges based on inputs matching outputs
-    nodeEntries.forEach(([nodeId, recipeNode]) => {
-        if (recipeNode.is_base_resource || recipeNode.is_end_product_node || recipeNode.is_surplus_node) {
-            return;
-        }
-
-        Object.entries(recipeNode.inputs).forEach(([itemId, inputAmount]) => {
-            const producers = itemProducers.get(itemId);
-            const totalProduction = itemTotalProduction.get(itemId) || 0;
-
-            if (producers && totalProduction > 0 && inputAmount > 0) {
-                // Distribute input demand across producers
-                producers.forEach(producer => {
-                    // Calculate flow share: (ProducerOutput / TotalOutput) * ConsumerInput
-                    // We use the producer's share of total supply to fulfill this consumer's demand share
-                    const flowShare = (producer.amount / totalProduction) * inputAmount;
-
-                    if (flowShare > 0.001) {
-                        elkEdges.push({
-                            id: `e-${producer.nodeId}-${nodeId}-${itemId}`,
-                            sources: [producer.nodeId],
-                            targets: [nodeId],
-                        });
-                    }
-                });
-            }
+    flows.forEach(flow => {
+        elkEdges.push({
+            id: `e-${flow.source}-${flow.target}-${flow.item}`,
+            sources: [flow.source],
+            targets: [flow.target],
         });
     });
 
@@ -142,35 +154,17 @@ export async function convertCalculationToPlannerAsync(response: CalculateRespon
     });
 
     // Create edges (REAL edges for the store)
-    nodeEntries.forEach(([nodeId, recipeNode]) => {
-        if (recipeNode.is_base_resource || recipeNode.is_end_product_node || recipeNode.is_surplus_node) {
-            return;
-        }
-
-        Object.entries(recipeNode.inputs).forEach(([itemId, inputAmount]) => {
-            const producers = itemProducers.get(itemId);
-            const totalProduction = itemTotalProduction.get(itemId) || 0;
-
-            if (producers && totalProduction > 0 && inputAmount > 0) {
-                producers.forEach(producer => {
-                    const flowShare = (producer.amount / totalProduction) * inputAmount;
-
-                    if (flowShare > 0.001) {
-                        const edge: PlannerEdge = {
-                            id: `e-${producer.nodeId}-${nodeId}-${itemId}`,
-                            source: producer.nodeId,
-                            target: nodeId,
-                            sourceHandle: itemId,
-                            targetHandle: itemId,
-                            type: 'customEdge',
-                            animated: true,
-                            style: { stroke: '#FA9549', strokeWidth: 2 },
-                            data: { actualFlow: flowShare }, // Use the calculated share!
-                        };
-                        edges.push(edge);
-                    }
-                });
-            }
+    flows.forEach(flow => {
+        edges.push({
+            id: `e-${flow.source}-${flow.target}-${flow.item}`,
+            source: flow.source,
+            target: flow.target,
+            sourceHandle: flow.item,
+            targetHandle: flow.item,
+            type: 'customEdge',
+            animated: true,
+            style: { stroke: '#FA9549', strokeWidth: 2 },
+            data: { actualFlow: flow.rate },
         });
     });
 
@@ -188,13 +182,7 @@ export function convertCalculationToPlanner(response: CalculateResponse): { node
     const nodes: PlannerNode[] = [];
     const edges: PlannerEdge[] = [];
 
-    // Track which node produces which items and how much
-    interface ProducerInfo {
-        nodeId: string;
-        amount: number;
-    }
-    const itemProducers: Map<string, ProducerInfo[]> = new Map(); // itemId -> producers[]
-    const itemTotalProduction: Map<string, number> = new Map();   // itemId -> totalAmount
+    const flows = collectFlows(production_graph);
 
     const nodeEntries = Object.entries(recipeNodes);
 
@@ -223,45 +211,19 @@ export function convertCalculationToPlanner(response: CalculateResponse): { node
             position: { x, y },
             data: nodeData,
         });
-
-        Object.entries(recipeNode.outputs).forEach(([itemId, amount]) => {
-            const currentProducers = itemProducers.get(itemId) || [];
-            currentProducers.push({ nodeId, amount });
-            itemProducers.set(itemId, currentProducers);
-
-            const currentTotal = itemTotalProduction.get(itemId) || 0;
-            itemTotalProduction.set(itemId, currentTotal + amount);
-        });
     });
 
-    nodeEntries.forEach(([nodeId, recipeNode]) => {
-        if (recipeNode.is_base_resource || recipeNode.is_end_product_node || recipeNode.is_surplus_node) {
-            return;
-        }
-
-        Object.entries(recipeNode.inputs).forEach(([itemId, inputAmount]) => {
-            const producers = itemProducers.get(itemId);
-            const totalProduction = itemTotalProduction.get(itemId) || 0;
-
-            if (producers && totalProduction > 0 && inputAmount > 0) {
-                producers.forEach(producer => {
-                    const flowShare = (producer.amount / totalProduction) * inputAmount;
-
-                    if (flowShare > 0.001) {
-                        edges.push({
-                            id: `e-${producer.nodeId}-${nodeId}-${itemId}`,
-                            source: producer.nodeId,
-                            target: nodeId,
-                            sourceHandle: itemId,
-                            targetHandle: itemId,
-                            type: 'customEdge',
-                            animated: true,
-                            style: { stroke: '#FA9549', strokeWidth: 2 },
-                            data: { actualFlow: flowShare },
-                        });
-                    }
-                });
-            }
+    flows.forEach(flow => {
+        edges.push({
+            id: `e-${flow.source}-${flow.target}-${flow.item}`,
+            source: flow.source,
+            target: flow.target,
+            sourceHandle: flow.item,
+            targetHandle: flow.item,
+            type: 'customEdge',
+            animated: true,
+            style: { stroke: '#FA9549', strokeWidth: 2 },
+            data: { actualFlow: flow.rate },
         });
     });
 
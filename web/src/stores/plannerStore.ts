@@ -11,6 +11,8 @@ import {
     applyNodeChanges,
     applyEdgeChanges,
 } from '@xyflow/react';
+import type { PlannerFlowsResponse } from '@/types';
+import api from '@/lib/api';
 
 export interface PlannerNodeData extends Record<string, unknown> {
     machineId?: string;
@@ -74,9 +76,11 @@ function sortNodesWithParentsFirst(nodes: PlannerNode[]): PlannerNode[] {
     return [...parentNodes, ...rootNodes, ...childNodesWithParent];
 }
 
-// PERF: Debounce timer for flow calculation
+// PERF: Debounce timer for flow calculation (one server request per burst of edits)
 let flowCalcTimer: ReturnType<typeof setTimeout> | null = null;
 const FLOW_CALC_DEBOUNCE_MS = 100; // 100ms debounce
+// Sequence number of the latest flow request; older responses are dropped
+let flowRequestSeq = 0;
 
 /**
  * Strip computed fields from nodes for serialization/history.
@@ -95,237 +99,290 @@ function stripComputedFields(nodes: PlannerNode[]): PlannerNode[] {
     }));
 }
 
-export const usePlannerStore = create<PlannerState>()(
-    temporal(
-        persist(
-            (set, get) => ({
-                nodes: [],
-                edges: [],
-                isSidebarVisible: true,
-                toggleSidebar: () => set((state) => ({ isSidebarVisible: !state.isSidebarVisible })),
+/**
+ * Compute flows in the browser by iterating passes until nothing changes.
+ * Fallback for when POST /api/planner/flows cannot be reached.
+ */
+function simulateFlowsLocally(
+    nodes: PlannerNode[],
+    edges: PlannerEdge[],
+    recipes: Record<string, any>
+): { nodes: PlannerNode[]; edges: PlannerEdge[] } {
+    const nodeMap = new Map<string, PlannerNode>();
+    nodes.forEach(n => {
+        nodeMap.set(n.id, {
+            ...n,
+            data: {
+                ...n.data,
+                inputs: {} as Record<string, number>,
+                outputs: {} as Record<string, number>,
+                theoreticalOutputs: {} as Record<string, number>,
+                bottlenecks: [] as string[]
+            }
+        });
+    });
+
+    const edgeMap = new Map<string, PlannerEdge>(edges.map(e => [e.id, { ...e, data: { ...e.data, actualFlow: 0 } }]));
+
+    // 1. Initialize Resources (Always output at full capacity/yield)
+    // For SourceNodes (isResource), the outputRate IS the final rate - no modifiers needed
+    nodeMap.forEach(node => {
+        if (node.data.isResource && node.data.resourceId) {
+            const rate = (node.data.outputRate as number) || 60;
+            const outputs = node.data.outputs as Record<string, number>;
+            const theoreticalOutputs = node.data.theoreticalOutputs as Record<string, number>;
+            outputs[node.data.resourceId] = rate;
+            theoreticalOutputs[node.data.resourceId] = rate;
+        }
+    });
 
-                calculateFlows: (recipes) => {
-                    const { nodes, edges } = get();
-                    if (nodes.length === 0) return;
+    // 2. Propagate flows (approximate using passes for convergence)
+    // Increased passes to 100 to handle complex cycles (e.g. Excited Photonic Matter)
+    for (let i = 0; i < 100; i++) {
+        let changed = false;
 
-                    const nodeMap = new Map<string, PlannerNode>();
-                    nodes.forEach(n => {
-                        nodeMap.set(n.id, {
-                            ...n,
-                            data: {
-                                ...n.data,
-                                inputs: {} as Record<string, number>,
-                                outputs: {} as Record<string, number>,
-                                theoreticalOutputs: {} as Record<string, number>,
-                                bottlenecks: [] as string[]
-                            }
-                        });
-                    });
+        // CRITICAL FIX: Reset inputs at the start of each pass to prevent accumulation
+        nodeMap.forEach(node => {
+            if (!node.data.isResource) {
+                node.data.inputs = {};
+            }
+        });
+
+        // Aggregate inputs from edges
+        // Aggregate inputs from edges
+        // NEW: Group edges by source+handle to handle Distribution properly (Water-filling)
+        const edgesBySourcePort = new Map<string, PlannerEdge[]>();
+        edgeMap.forEach(edge => {
+            if (edge.source && edge.sourceHandle) {
+                const key = `${edge.source}__${edge.sourceHandle}`;
+                if (!edgesBySourcePort.has(key)) {
+                    edgesBySourcePort.set(key, []);
+                }
+                edgesBySourcePort.get(key)!.push(edge);
+            }
+        });
+
+        // Process each source port's distribution
+        edgesBySourcePort.forEach((edges, key) => {
+            const [sourceId, handleId] = key.split('__');
+            const source = nodeMap.get(sourceId);
+            if (!source) return;
+
+            const sourceOutputs = (source.data.outputs || {}) as Record<string, number>;
+            // Output of this port
+            const totalSourceOutput = sourceOutputs[handleId] || 0;
+
+            // 1. Separate Manual vs Auto
+            const manualEdges = edges.filter(e => e.data?.manualFlow !== undefined);
+            const autoEdges = edges.filter(e => e.data?.manualFlow === undefined);
+
+            let flowUsed = 0;
+
+            // 2. Fulfill Manual first
+            manualEdges.forEach(edge => {
+                const requested = edge.data!.manualFlow!;
+                const allocated = Math.min(requested, totalSourceOutput - flowUsed);
+                flowUsed += allocated;
+
+                // Update Edge
+                const oldFlow = edge.data?.actualFlow || 0;
+                if (Math.abs(oldFlow - allocated) > 0.0001) changed = true;
+                edge.data = { ...edge.data, actualFlow: allocated };
+
+                // Update Target
+                const target = nodeMap.get(edge.target);
+                if (target) {
+                    const targetInputs = (target.data.inputs || {}) as Record<string, number>;
+                    targetInputs[handleId] = (targetInputs[handleId] || 0) + allocated;
+                }
+            });
 
-                    const edgeMap = new Map<string, PlannerEdge>(edges.map(e => [e.id, { ...e, data: { ...e.data, actualFlow: 0 } }]));
-
-                    // 1. Initialize Resources (Always output at full capacity/yield)
-                    // For SourceNodes (isResource), the outputRate IS the final rate - no modifiers needed
-                    nodeMap.forEach(node => {
-                        if (node.data.isResource && node.data.resourceId) {
-                            const rate = (node.data.outputRate as number) || 60;
-                            const outputs = node.data.outputs as Record<string, number>;
-                            const theoreticalOutputs = node.data.theoreticalOutputs as Record<string, number>;
-                            outputs[node.data.resourceId] = rate;
-                            theoreticalOutputs[node.data.resourceId] = rate;
-                        }
-                    });
+            if (autoEdges.length === 0) return;
 
-                    // 2. Propagate flows (approximate using passes for convergence)
-                    // Increased passes to 100 to handle complex cycles (e.g. Excited Photonic Matter)
-                    for (let i = 0; i < 100; i++) {
-                        let changed = false;
+            // 3. Water-filling for Auto Edges
+            let flowAvailable = Math.max(0, totalSourceOutput - flowUsed);
 
-                        // CRITICAL FIX: Reset inputs at the start of each pass to prevent accumulation
-                        nodeMap.forEach(node => {
-                            if (!node.data.isResource) {
-                                node.data.inputs = {};
-                            }
-                        });
+            // Calculate capacity constraints for each edge
+            interface FlowRequest {
+                edge: PlannerEdge;
+                cap: number;
+                assigned: number;
+            }
 
-                        // Aggregate inputs from edges
-                        // Aggregate inputs from edges
-                        // NEW: Group edges by source+handle to handle Distribution properly (Water-filling)
-                        const edgesBySourcePort = new Map<string, PlannerEdge[]>();
-                        edgeMap.forEach(edge => {
-                            if (edge.source && edge.sourceHandle) {
-                                const key = `${edge.source}__${edge.sourceHandle}`;
-                                if (!edgesBySourcePort.has(key)) {
-                                    edgesBySourcePort.set(key, []);
-                                }
-                                edgesBySourcePort.get(key)!.push(edge);
-                            }
-                        });
+            const allRequests: FlowRequest[] = autoEdges.map(edge => {
+                let cap = Number.MAX_VALUE;
+                const target = nodeMap.get(edge.target);
+
+                if (target && target.data.recipeId && recipes[target.data.recipeId]) {
+                    const recipe = recipes[target.data.recipeId];
+                    const ingredient = recipe.ingredients.find((ing: any) => ing.item === handleId);
+                    if (ingredient) {
+                        const targetEfficiency = (target.data.efficiency as number) || 100;
+                        const targetMachineCount = (target.data.machineCount as number) || 1;
+                        const maxIntake = (ingredient.amount / recipe.time) * 60 * (targetEfficiency / 100) * targetMachineCount;
+
+                        const alreadyReceived = ((target.data.inputs || {}) as Record<string, number>)[handleId] || 0;
+                        // Allow small epsilon for floating point issues
+                        cap = Math.max(0, maxIntake - alreadyReceived + 0.0001);
+                    }
+                }
+                return { edge, cap, assigned: 0 };
+            });
 
-                        // Process each source port's distribution
-                        edgesBySourcePort.forEach((edges, key) => {
-                            const [sourceId, handleId] = key.split('__');
-                            const source = nodeMap.get(sourceId);
-                            if (!source) return;
-
-                            const sourceOutputs = (source.data.outputs || {}) as Record<string, number>;
-                            // Output of this port
-                            const totalSourceOutput = sourceOutputs[handleId] || 0;
-
-                            // 1. Separate Manual vs Auto
-                            const manualEdges = edges.filter(e => e.data?.manualFlow !== undefined);
-                            const autoEdges = edges.filter(e => e.data?.manualFlow === undefined);
-
-                            let flowUsed = 0;
-
-                            // 2. Fulfill Manual first
-                            manualEdges.forEach(edge => {
-                                const requested = edge.data!.manualFlow!;
-                                const allocated = Math.min(requested, totalSourceOutput - flowUsed);
-                                flowUsed += allocated;
-
-                                // Update Edge
-                                const oldFlow = edge.data?.actualFlow || 0;
-                                if (Math.abs(oldFlow - allocated) > 0.0001) changed = true;
-                                edge.data = { ...edge.data, actualFlow: allocated };
-
-                                // Update Target
-                                const target = nodeMap.get(edge.target);
-                                if (target) {
-                                    const targetInputs = (target.data.inputs || {}) as Record<string, number>;
-                                    targetInputs[handleId] = (targetInputs[handleId] || 0) + allocated;
-                                }
-                            });
+            let activeRequests = [...allRequests];
 
-                            if (autoEdges.length === 0) return;
+            // Iterative distribution
+            let distributing = true;
+            while (distributing && activeRequests.length > 0 && flowAvailable > 0.0001) {
+                distributing = false;
+                const share = flowAvailable / activeRequests.length;
 
-                            // 3. Water-filling for Auto Edges
-                            let flowAvailable = Math.max(0, totalSourceOutput - flowUsed);
+                // Identify constrained requests (Cap < Share)
+                const constrained = activeRequests.filter(r => r.cap < share);
 
-                            // Calculate capacity constraints for each edge
-                            interface FlowRequest {
-                                edge: PlannerEdge;
-                                cap: number;
-                                assigned: number;
-                            }
+                if (constrained.length > 0) {
+                    // Lock constrained requests
+                    constrained.forEach(r => {
+                        r.assigned = r.cap;
+                        flowAvailable -= r.assigned;
+                    });
+                    // Remove from active pool
+                    activeRequests = activeRequests.filter(r => r.cap >= share);
+                    distributing = true; // Need to redistribute surplus
+                } else {
+                    // No constraints, everyone takes the share
+                    activeRequests.forEach(r => {
+                        r.assigned = share;
+                    });
+                    flowAvailable = 0;
+                    activeRequests = [];
+                }
+            }
 
-                            const allRequests: FlowRequest[] = autoEdges.map(edge => {
-                                let cap = Number.MAX_VALUE;
-                                const target = nodeMap.get(edge.target);
-
-                                if (target && target.data.recipeId && recipes[target.data.recipeId]) {
-                                    const recipe = recipes[target.data.recipeId];
-                                    const ingredient = recipe.ingredients.find((ing: any) => ing.item === handleId);
-                                    if (ingredient) {
-                                        const targetEfficiency = (target.data.efficiency as number) || 100;
-                                        const targetMachineCount = (target.data.machineCount as number) || 1;
-                                        const maxIntake = (ingredient.amount / recipe.time) * 60 * (targetEfficiency / 100) * targetMachineCount;
-
-                                        const alreadyReceived = ((target.data.inputs || {}) as Record<string, number>)[handleId] || 0;
-                                        // Allow small epsilon for floating point issues
-                                        cap = Math.max(0, maxIntake - alreadyReceived + 0.0001);
-                                    }
-                                }
-                                return { edge, cap, assigned: 0 };
-                            });
+            // 4. Apply flows
+            allRequests.forEach(req => {
+                const oldFlow = req.edge.data?.actualFlow || 0;
+                if (Math.abs(oldFlow - req.assigned) > 0.0001) changed = true;
+                req.edge.data = { ...req.edge.data, actualFlow: req.assigned };
 
-                            let activeRequests = [...allRequests];
-
-                            // Iterative distribution
-                            let distributing = true;
-                            while (distributing && activeRequests.length > 0 && flowAvailable > 0.0001) {
-                                distributing = false;
-                                const share = flowAvailable / activeRequests.length;
-
-                                // Identify constrained requests (Cap < Share)
-                                const constrained = activeRequests.filter(r => r.cap < share);
-
-                                if (constrained.length > 0) {
-                                    // Lock constrained requests
-                                    constrained.forEach(r => {
-                                        r.assigned = r.cap;
-                                        flowAvailable -= r.assigned;
-                                    });
-                                    // Remove from active pool
-                                    activeRequests = activeRequests.filter(r => r.cap >= share);
-                                    distributing = true; // Need to redistribute surplus
-                                } else {
-                                    // No constraints, everyone takes the share
-                                    activeRequests.forEach(r => {
-                                        r.assigned = share;
-                                    });
-                                    flowAvailable = 0;
-                                    activeRequests = [];
-                                }
-                            }
+                const target = nodeMap.get(req.edge.target);
+                if (target) {
+                    const targetInputs = (target.data.inputs || {}) as Record<string, number>;
+                    targetInputs[handleId] = (targetInputs[handleId] || 0) + req.assigned;
+                }
+            });
+        });
 
-                            // 4. Apply flows
-                            allRequests.forEach(req => {
-                                const oldFlow = req.edge.data?.actualFlow || 0;
-                                if (Math.abs(oldFlow - req.assigned) > 0.0001) changed = true;
-                                req.edge.data = { ...req.edge.data, actualFlow: req.assigned };
+        // Calculate outputs based on inputs and recipes
+        nodeMap.forEach(node => {
+            if (node.data.isResource || !node.data.recipeId) return;
 
-                                const target = nodeMap.get(req.edge.target);
-                                if (target) {
-                                    const targetInputs = (target.data.inputs || {}) as Record<string, number>;
-                                    targetInputs[handleId] = (targetInputs[handleId] || 0) + req.assigned;
-                                }
-                            });
-                        });
+            const recipe = recipes[node.data.recipeId];
+            if (!recipe) return;
 
-                        // Calculate outputs based on inputs and recipes
-                        nodeMap.forEach(node => {
-                            if (node.data.isResource || !node.data.recipeId) return;
+            const nodeEfficiency = (node.data.efficiency as number) || 100;
+            const nodeMachineCount = (node.data.machineCount as number) || 1;
 
-                            const recipe = recipes[node.data.recipeId];
-                            if (!recipe) return;
+            let throughput = 1.0;
+            const bottlenecks: string[] = [];
+            const theoreticalOutputs: Record<string, number> = {};
 
-                            const nodeEfficiency = (node.data.efficiency as number) || 100;
-                            const nodeMachineCount = (node.data.machineCount as number) || 1;
+            recipe.ingredients.forEach((ing: any) => {
+                const required = (ing.amount / recipe.time) * 60 * (nodeEfficiency / 100) * nodeMachineCount;
+                const nodeInputs = (node.data.inputs || {}) as Record<string, number>;
+                const available = nodeInputs[ing.item] || 0;
 
-                            let throughput = 1.0;
-                            const bottlenecks: string[] = [];
-                            const theoreticalOutputs: Record<string, number> = {};
+                if (required > 0) {
+                    const factor = available / required;
+                    if (factor < throughput - 0.0001) { // Small epsilon for float stable
+                        throughput = factor;
+                        bottlenecks.push(ing.item);
+                    }
+                }
+            });
 
-                            recipe.ingredients.forEach((ing: any) => {
-                                const required = (ing.amount / recipe.time) * 60 * (nodeEfficiency / 100) * nodeMachineCount;
-                                const nodeInputs = (node.data.inputs || {}) as Record<string, number>;
-                                const available = nodeInputs[ing.item] || 0;
+            // Important: Throughput cannot exceed 1.0 (machine capacity limit)
+            throughput = Math.min(1.0, throughput);
 
-                                if (required > 0) {
-                                    const factor = available / required;
-                                    if (factor < throughput - 0.0001) { // Small epsilon for float stable
-                                        throughput = factor;
-                                        bottlenecks.push(ing.item);
-                                    }
-                                }
-                            });
+            node.data.bottlenecks = bottlenecks;
 
-                            // Important: Throughput cannot exceed 1.0 (machine capacity limit)
-                            throughput = Math.min(1.0, throughput);
+            const newOutputs: Record<string, number> = {};
+            recipe.products.forEach((prod: any) => {
+                const baseRate = (prod.amount / recipe.time) * 60 * (nodeEfficiency / 100) * nodeMachineCount;
+                theoreticalOutputs[prod.item] = baseRate;
+                newOutputs[prod.item] = baseRate * throughput;
+            });
 
-                            node.data.bottlenecks = bottlenecks;
+            node.data.theoreticalOutputs = theoreticalOutputs;
+            const oldOutputsJSON = JSON.stringify(node.data.outputs);
+            node.data.outputs = newOutputs;
+            if (JSON.stringify(newOutputs) !== oldOutputsJSON) changed = true;
+        });
 
-                            const newOutputs: Record<string, number> = {};
-                            recipe.products.forEach((prod: any) => {
-                                const baseRate = (prod.amount / recipe.time) * 60 * (nodeEfficiency / 100) * nodeMachineCount;
-                                theoreticalOutputs[prod.item] = baseRate;
-                                newOutputs[prod.item] = baseRate * throughput;
-                            });
+        if (!changed) break;
+    }
 
-                            node.data.theoreticalOutputs = theoreticalOutputs;
-                            const oldOutputsJSON = JSON.stringify(node.data.outputs);
-                            node.data.outputs = newOutputs;
-                            if (JSON.stringify(newOutputs) !== oldOutputsJSON) changed = true;
-                        });
+    return {
+        nodes: Array.from(nodeMap.values()),
+        edges: Array.from(edgeMap.values())
+    };
+}
 
-                        if (!changed) break;
-                    }
+/**
+ * Copy the server's flow result onto the current nodes and edges.
+ * Nodes the server did not report keep their data.
+ */
+function applyServerFlows(
+    nodes: PlannerNode[],
+    edges: PlannerEdge[],
+    result: PlannerFlowsResponse
+): { nodes: PlannerNode[]; edges: PlannerEdge[] } {
+    return {
+        nodes: nodes.map(n => {
+            const flows = result.nodes[n.id];
+            if (!flows) return n;
+            return {
+                ...n,
+                data: {
+                    ...n.data,
+                    inputs: flows.inputs,
+                    outputs: flows.outputs,
+                    theoreticalOutputs: flows.theoretical_outputs,
+                    bottlenecks: flows.bottlenecks
+                }
+            };
+        }),
+        edges: edges.map(e => ({ ...e, data: { ...e.data, actualFlow: result.edges[e.id] ?? 0 } }))
+    };
+}
 
-                    set({
-                        nodes: Array.from(nodeMap.values()),
-                        edges: Array.from(edgeMap.values())
-                    });
+export const usePlannerStore = create<PlannerState>()(
+    temporal(
+        persist(
+            (set, get) => ({
+                nodes: [],
+                edges: [],
+                isSidebarVisible: true,
+                toggleSidebar: () => set((state) => ({ isSidebarVisible: !state.isSidebarVisible })),
+
+                calculateFlows: (recipes) => {
+                    // Invalidate any request in flight; only the latest graph's flows are applied
+                    const seq = ++flowRequestSeq;
+                    if (flowCalcTimer) clearTimeout(flowCalcTimer);
+                    flowCalcTimer = setTimeout(async () => {
+                        const { nodes, edges } = get();
+                        if (nodes.length === 0) return;
+                        try {
+                            const result = await api.simulatePlannerFlows(nodes, edges);
+                            if (seq !== flowRequestSeq) return;
+                            set(applyServerFlows(get().nodes, get().edges, result));
+                        } catch (err) {
+                            if (seq !== flowRequestSeq) return;
+                            // Offline or server error: fall back to the in-browser simulation
+                            console.warn('Planner flow request failed, computing locally:', err);
+                            set(simulateFlowsLocally(get().nodes, get().edges, recipes));
+                        }
+                    }, FLOW_CALC_DEBOUNCE_MS);
                 },
 
                 onNodesChange: (changes, recipes) => {
@@ -420,11 +477,8 @@ export const usePlannerStore = create<PlannerState>()(
                         };
                     });
 
-                    // PERF: Debounce flow calculation for rapid updates (e.g., typing in inputs)
-                    if (flowCalcTimer) clearTimeout(flowCalcTimer);
-                    flowCalcTimer = setTimeout(() => {
-                        get().calculateFlows(recipes);
-                    }, FLOW_CALC_DEBOUNCE_MS);
+                    // calculateFlows debounces rapid updates (e.g., typing in inputs)
+                    get().calculateFlows(recipes);
                 },
 
                 updateEdgeData: (edgeId, data, recipes) => {
@@ -437,11 +491,8 @@ export const usePlannerStore = create<PlannerState>()(
                         }),
                     }));
 
-                    // PERF: Debounce flow calculation
-                    if (flowCalcTimer) clearTimeout(flowCalcTimer);
-                    flowCalcTimer = setTimeout(() => {
-                        get().calculateFlows(recipes);
-                    }, FLOW_CALC_DEBOUNCE_MS);
+                    // calculateFlows debounces rapid updates (e.g., typing in inputs)
+                    get().calculateFlows(recipes);
                 },
 
                 clearPlanner: () => {
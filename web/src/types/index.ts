@@ -52,6 +52,7 @@ export interface CalculateResponse {
 
 export interface ProductionGraph {
     recipe_nodes: Record<string, RecipeNode>;
+    edges?: FlowEdge[];
     targets?: Target[];
     target_item: string | null;
     target_amount: number | null;
@@ -60,6 +61,13 @@ export interface ProductionGraph {
     proven_optimal: boolean;
 }
 
+export interface FlowEdge {
+    source: string;
+    target: string;   // node id, or a `target_<item>` / `surplus_<item>` sink
+    item: string;
+    rate: number;
+}
+
 export interface RecipeNode {
     node_id: string;
     recipe_id: string;
@@ -84,6 +92,21 @@ export interface RecipeNode {
     target_amount?: number;
 }
 
+export interface PlannerNodeFlows {
+    inputs: Record<string, number>;
+    outputs: Record<string, number>;
+    theoretical_outputs: Record<string, number>;
+    throughput: number;
+    bottlenecks: string[];
+}
+
+export interface PlannerFlowsResponse {
+    nodes: Record<string, PlannerNodeFlows>;
+    edges: Record<string, number>;
+    converged: boolean;
+    loop_iterations: number;
+}
+
 export interface ProductionSummary {
     total_machines: number;
     total_actual_machines: number;